@@ -6,16 +6,24 @@ from sqlalchemy import select
 from app.database import get_db
 from app.services.ai import GeminiService
 from app.models.project import Project
+from app.services.transcript_index import get_transcript_index, format_timestamp
+import asyncio
 
 router = APIRouter()
 
+DIRECT_TRANSCRIPT_CHARS = 24000  # Shorter transcripts are sent whole
+ASK_WINDOWS = 8
+SUMMARY_SECTION_CHARS = 24000
+
 class SummarizeRequest(BaseModel):
     project_id: str
     style: str = "detailed"
+    regenerate: bool = False  # Skip the LLM response cache
 
 class AskRequest(BaseModel):
     project_id: str
     question: str
+    regenerate: bool = False
 
 class ScriptRequest(BaseModel):
     project_id: str
@@ -26,6 +34,7 @@ class YoutubeInfoRequest(BaseModel):
     project_id: str
     script: str = ""
     language: str = "English"
+    regenerate: bool = False
 
 class SuggestProjectRequest(BaseModel):
     video_style: str = "dialogue"
@@ -41,7 +50,11 @@ async def summarize(request: SummarizeRequest, db: AsyncSession = Depends(get_db
     
     service = GeminiService()
     transcript_text = " ".join([t["text"] for t in project.transcript])
-    result = await service.summarize(transcript_text, request.style)
+    sections = None
+    if len(transcript_text) > DIRECT_TRANSCRIPT_CHARS:
+        index = await asyncio.to_thread(get_transcript_index, project.id, project.transcript)
+        sections = index.sections(SUMMARY_SECTION_CHARS)
+    result = await service.summarize(transcript_text, request.style, use_cache=not request.regenerate, sections=sections)
     
     project.summary = result["summary"]
     await db.commit()
@@ -56,7 +69,11 @@ async def ask(request: AskRequest, db: AsyncSession = Depends(get_db)):
     
     service = GeminiService()
     transcript_text = " ".join([t["text"] for t in project.transcript])
-    answer = await service.ask(transcript_text, request.question)
+    if len(transcript_text) > DIRECT_TRANSCRIPT_CHARS:
+        index = await asyncio.to_thread(get_transcript_index, project.id, project.transcript)
+        windows = index.search(request.question, ASK_WINDOWS)
+        transcript_text = "\n".join(f"[{format_timestamp(w['start'])}] {w['text']}" for w in windows)
+    answer = await service.ask(transcript_text, request.question, use_cache=not request.regenerate)
     
     return {"question": request.question, "answer": answer}
 
@@ -111,7 +128,7 @@ async def generate_youtube_info(request: YoutubeInfoRequest, db: AsyncSession =
         raise HTTPException(status_code=404, detail="Project not found")
     
     service = GeminiService()
-    result = await service.generate_youtube_info(project.title, request.script or project.script or "", request.language)
+    result = await service.generate_youtube_info(project.title, request.script or project.script or "", request.language, use_cache=not request.regenerate)
     
     # Save to file for persistence
     project_dir = f"./storage/{request.project_id}"
@@ -123,11 +140,7 @@ async def generate_youtube_info(request: YoutubeInfoRequest, db: AsyncSession =
 
 @router.post("/suggest-project")
 async def suggest_project(request: SuggestProjectRequest):
-    import google.generativeai as genai
-    from app.config import get_settings
-    
-    settings = get_settings()
-    genai.configure(api_key=settings.gemini_api_key)
+    from app.services.ai.llm import get_llm_client
     
     style_context = {
         "dialogue": "educational two-person conversation",
@@ -156,13 +169,12 @@ Return ONLY a JSON array:
   ...
 ]"""
     
-    model = genai.GenerativeModel("gemini-2.5-flash")
-    response = model.generate_content(prompt)
+    text = await get_llm_client().generate(prompt, model="gemini-2.5-flash", label="suggest_project")
     
     import re
     import json as json_lib
     try:
-        json_match = re.search(r'\[[\s\S]*\]', response.text)
+        json_match = re.search(r'\[[\s\S]*\]', text)
         if json_match:
             suggestions = json_lib.loads(json_match.group())
             return {"suggestions": suggestions[:4]}
@@ -1,9 +1,12 @@
+import asyncio
 from fastapi import APIRouter, HTTPException, Depends
 from pydantic import BaseModel
+from sqlalchemy import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.database import get_db
 from app.services.video import VideoService
 from app.services.youtube import YouTubeService
+from app.services.video.boundaries import snap_range, EXTRACT_SNAP_SHIFT
 from app.models.project import Project, VideoClip
 
 router = APIRouter()
@@ -15,6 +18,8 @@ class ClipData(BaseModel):
 class ExtractClipsRequest(BaseModel):
     project_id: str
     clips: list[ClipData]
+    smart_cut: bool = False
+    snap: bool = False  # Move cuts onto nearby scene changes / pauses
 
 @router.post("/extract")
 async def extract_clips(request: ExtractClipsRequest, db: AsyncSession = Depends(get_db)):
@@ -22,27 +27,26 @@ async def extract_clips(request: ExtractClipsRequest, db: AsyncSession = Depends
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
     
-    youtube_service = YouTubeService()
     video_service = VideoService()
-    
     video_path = f"./storage/{project.id}/source.mp4"
-    youtube_service.download_video(project.youtube_url, video_path)
     
+    if not await asyncio.to_thread(video_service.is_valid_video, video_path):
+        youtube_service = YouTubeService()
+        await asyncio.to_thread(youtube_service.download_video, project.youtube_url, video_path)
+    
+    if request.snap:
+        for clip in request.clips:
+            clip.start, clip.end = await asyncio.to_thread(snap_range, video_path, clip.start, clip.end, EXTRACT_SNAP_SHIFT)
     clips_data = [{"start": c.start, "end": c.end} for c in request.clips]
-    clip_paths = video_service.extract_clips(project.id, video_path, clips_data)
+    clip_paths = await asyncio.to_thread(video_service.extract_clips, project.id, video_path, clips_data, request.smart_cut)
     
-    for i, (clip, path) in enumerate(zip(request.clips, clip_paths)):
-        db_clip = VideoClip(
-            project_id=project.id,
-            start_time=int(clip.start),
-            end_time=int(clip.end),
-            file_path=path,
-            order=i
-        )
-        db.add(db_clip)
+    if clip_paths:
+        await db.execute(insert(VideoClip), [
+            {"project_id": project.id, "start_time": int(clip.start), "end_time": int(clip.end), "file_path": path, "order": i}
+            for i, (clip, path) in enumerate(zip(request.clips, clip_paths))
+        ])
     
     project.status = "clips_extracted"
     await db.commit()
     
-    return {"clips": [{"path": p, "order": i} for i, p in enumerate(clip_paths)]}
-
+    return {"clips": [{"path": p, "order": i, "start": c.start, "end": c.end} for i, (p, c) in enumerate(zip(clip_paths, request.clips))]}
@@ -7,6 +7,8 @@ import os
 from app.database import get_db
 from app.models.project import Project
 from app.services.youtube import YouTubeService
+from app.services.ytdlp_pool import cached_entries
+from app.services.http import shared_client
 
 router = APIRouter()
 
@@ -23,6 +25,8 @@ class SearchRequest(BaseModel):
 class AnalyzeRequest(BaseModel):
     min_duration: int = 15
     max_duration: int = 90
+    mode: str = "ai"  # "ai" | "local" | "hybrid"
+    regenerate: bool = False  # Skip the LLM response cache
 
 
 class EffectsConfig(BaseModel):
@@ -40,6 +44,8 @@ class OptionsConfig(BaseModel):
     keepAudio: bool = True
     aspectRatio: str = "9:16"
     antiCopyright: bool = True  # Pitch shift audio to avoid detection
+    partialDownload: bool = True  # Fetch only the selected range (+padding) when no full source exists
+    smartCut: bool = False  # Stream-copy the keyframe-aligned interior instead of re-encoding it all
 
 
 class GenerateRequest(BaseModel):
@@ -53,7 +59,7 @@ class GenerateRequest(BaseModel):
 async def create_inshorts(request: CreateRequest, db: AsyncSession = Depends(get_db)):
     try:
         service = YouTubeService()
-        info = service.get_video_info(request.url)
+        info = await service.get_video_info(request.url)
         
         project = Project(
             project_type="inshorts",
@@ -93,23 +99,14 @@ async def create_inshorts(request: CreateRequest, db: AsyncSession = Depends(get
 
 @router.post("/search")
 async def search_videos(request: SearchRequest):
-    import subprocess
-    import json
-    
     try:
-        result = subprocess.run(
-            ["yt-dlp", "--cookies", "www.youtube.com_cookies.txt", "-j", "--flat-playlist",
-             "--playlist-end", str(request.max_results), f"ytsearch{request.max_results}:{request.query}"],
-            capture_output=True, text=True, timeout=30,
-            cwd="/Users/alomgir/workspace/goinsights/backend"
+        entries = await cached_entries(
+            "search", f"ytsearch{request.max_results}:{request.query}", limit=request.max_results, timeout=30
         )
         
         videos = []
-        for line in result.stdout.strip().split('\n'):
-            if not line:
-                continue
+        for item in entries:
             try:
-                item = json.loads(line)
                 video_id = item.get("id", "")
                 if not video_id:
                     continue
@@ -124,7 +121,7 @@ async def search_videos(request: SearchRequest):
                     "channel": item.get("channel", "") or item.get("uploader", ""),
                     "views": item.get("view_count", 0)
                 })
-            except json.JSONDecodeError:
+            except (TypeError, ValueError):
                 continue
         
         return {"videos": videos}
@@ -134,17 +131,22 @@ async def search_videos(request: SearchRequest):
 
 @router.post("/{project_id}/analyze")
 async def analyze_video(project_id: str, request: AnalyzeRequest, db: AsyncSession = Depends(get_db)):
-    from app.services.inshorts.analyzer import analyze_for_shorts
+    from app.services.inshorts.analyzer import analyze_for_shorts, ANALYSIS_MODES
     
     project = await db.get(Project, project_id)
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
+    if request.mode not in ANALYSIS_MODES:
+        raise HTTPException(status_code=400, detail=f"mode must be one of {', '.join(ANALYSIS_MODES)}")
     
     segments = await analyze_for_shorts(
         transcript=project.transcript or [],
         duration=project.duration,
         min_duration=request.min_duration,
-        max_duration=request.max_duration
+        max_duration=request.max_duration,
+        mode=request.mode,
+        use_cache=not request.regenerate,
+        source_path=f"./storage/{project_id}/source.mp4"
     )
     
     project.inshorts_segments = segments
@@ -303,18 +305,15 @@ class BatchGenerateRequest(BaseModel):
 @router.post("/{project_id}/batch/suggest")
 async def suggest_batch_shorts(project_id: str, request: BatchSuggestRequest, db: AsyncSession = Depends(get_db)):
     """AI suggests multiple segments with titles and descriptions"""
-    import google.generativeai as genai
     import json
     import uuid
-    from app.config import get_settings
+    from app.services.ai.llm import get_llm_client
+    from app.services.inshorts.analyzer import snap_segments
     
     project = await db.get(Project, project_id)
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
     
-    settings = get_settings()
-    genai.configure(api_key=settings.gemini_api_key)
-    
     transcript = project.transcript or []
     duration = project.duration or 300
     title = project.title or "Video"
@@ -338,24 +337,25 @@ Return ONLY valid JSON array:
 
 Make clips interesting, avoid overlapping times, spread across the video."""
 
+    source_path = f"./storage/{project_id}/source.mp4"
     try:
-        model = genai.GenerativeModel("gemini-2.5-flash")
-        response = model.generate_content(prompt)
-        text = response.text.strip()
+        text = (await get_llm_client().generate(prompt, model="gemini-2.5-flash", label="batch suggest")).strip()
         
         if "```json" in text:
             text = text.split("```json")[1].split("```")[0]
         elif "```" in text:
             text = text.split("```")[1].split("```")[0]
         
-        suggestions = json.loads(text)
+        suggestions = [{**s, "end": s.get("end", 30)} for s in json.loads(text)[:request.count]]
+        suggestions = await snap_segments(suggestions, duration, source_path)
         
         shorts = []
-        for s in suggestions[:request.count]:
+        for s in suggestions:
+            start, end = round(s["start"], 1), round(s["end"], 1)
             shorts.append({
                 "id": str(uuid.uuid4())[:8],
-                "start": max(0, s.get("start", 0)),
-                "end": min(duration, s.get("end", 30)),
+                "start": start,
+                "end": end,
                 "title": s.get("title", "Short clip")[:60],
                 "description": s.get("description", "")[:150],
                 "tags": s.get("tags", ""),
@@ -480,7 +480,7 @@ async def upload_short_to_youtube(project_id: str, request: UploadShortRequest,
     }
     
     try:
-        async with httpx.AsyncClient(timeout=300.0) as client:
+        async with shared_client("google_upload") as client:
             init_resp = await client.post(
                 "https://www.googleapis.com/upload/youtube/v3/videos",
                 params={"uploadType": "resumable", "part": "snippet,status"},
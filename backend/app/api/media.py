@@ -1,9 +1,9 @@
-from fastapi import APIRouter, HTTPException, Depends, UploadFile, File, Form
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, HTTPException, Depends, UploadFile, File, Form, Request
+from fastapi.responses import FileResponse, Response, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, func
 from sqlalchemy.orm.attributes import flag_modified
-from app.database import get_db
+from app.database import get_db, async_session
 from app.models.project import Project, MediaAsset
 from app.config import get_settings
 from app.constants.media import IMAGE_STYLES, ASPECT_RATIOS, PROMPT_LANGUAGES
@@ -13,9 +13,13 @@ from app.schemas.media import (
     UpdateMediaOrderRequest, StockDownloadRequest, GeneratePromptsRequest
 )
 import os
+import json
 import uuid
+import asyncio
+import mimetypes
 import subprocess
-import httpx
+from app.services.http import shared_client
+from app.services import derivatives
 from PIL import Image
 
 router = APIRouter()
@@ -53,7 +57,7 @@ async def search_stock_media(query: str, media_type: str = "photos", per_page: i
     if orientation:
         params["orientation"] = orientation
     
-    async with httpx.AsyncClient() as client:
+    async with shared_client("pexels") as client:
         url = "https://api.pexels.com/videos/search" if media_type == "videos" else "https://api.pexels.com/v1/search"
         response = await client.get(url, headers=headers, params=params)
         if response.status_code != 200:
@@ -90,7 +94,7 @@ async def download_stock_media(request: StockDownloadRequest, db: AsyncSession =
     ext = ".mp4" if request.media_type == "video" else ".jpg"
     file_path = f"{project_dir}/{media_id}{ext}"
     
-    async with httpx.AsyncClient(timeout=60.0) as client:
+    async with shared_client("pexels") as client:
         response = await client.get(request.url)
         if response.status_code != 200:
             raise HTTPException(status_code=500, detail="Failed to download media")
@@ -115,6 +119,7 @@ async def download_stock_media(request: StockDownloadRequest, db: AsyncSession =
     asset = MediaAsset(id=media_id, project_id=request.project_id, media_type=request.media_type, source=f"stock_{request.source}", file_path=file_path, duration=duration, width=width, height=height, order=order)
     db.add(asset)
     await db.commit()
+    derivatives.schedule_derivatives(file_path, request.media_type)
     return {"id": media_id, "type": request.media_type, "source": f"stock_{request.source}", "path": file_path, "duration": duration, "width": width, "height": height, "order": order}
 
 
@@ -159,6 +164,7 @@ async def upload_media(project_id: str = Form(...), file: UploadFile = File(...)
     asset = MediaAsset(id=media_id, project_id=project_id, media_type=media_type, source="upload", file_path=file_path, original_filename=file.filename, duration=duration, width=width, height=height, order=order)
     db.add(asset)
     await db.commit()
+    derivatives.schedule_derivatives(file_path, media_type)
     return {"id": media_id, "type": media_type, "source": "upload", "path": file_path, "duration": duration, "width": width, "height": height, "order": order}
 
 
@@ -191,6 +197,7 @@ async def generate_image(request: GenerateImageRequest, db: AsyncSession = Depen
     asset = MediaAsset(id=media_id, project_id=request.project_id, media_type="image", source="ai_generated", file_path=file_path, prompt=request.prompt, width=width, height=height, order=order)
     db.add(asset)
     await db.commit()
+    derivatives.schedule_derivatives(file_path, "image")
     return {"id": media_id, "type": "image", "source": "ai_generated", "path": file_path, "prompt": request.prompt, "order": order}
 
 
@@ -212,7 +219,7 @@ async def regenerate_image(request: RegenerateImageRequest, db: AsyncSession = D
         raise HTTPException(status_code=400, detail="No prompt available for regeneration")
     
     image_style = request.image_style or project.image_style or "cartoon"
-    await service.generate_segment_image(prompt, asset.file_path, request.model, project.character_sheet, image_style, request.aspect_ratio or "16:9")
+    await service.generate_segment_image(prompt, asset.file_path, request.model, project.character_sheet, image_style, request.aspect_ratio or "16:9", use_cache=False)
     
     width, height = None, None
     if os.path.exists(asset.file_path):
@@ -221,6 +228,8 @@ async def regenerate_image(request: RegenerateImageRequest, db: AsyncSession = D
     
     asset.width, asset.height, asset.prompt = width, height, prompt
     await db.commit()
+    derivatives.remove_derivatives(asset.file_path)
+    derivatives.schedule_derivatives(asset.file_path, "image")
     return {"id": asset.id, "type": "image", "source": "ai_generated", "path": asset.file_path, "prompt": prompt, "width": width, "height": height, "regenerated": True}
 
 
@@ -273,52 +282,101 @@ async def generate_prompts_only(request: GeneratePromptsRequest, db: AsyncSessio
     return {"prompts": prompts, "character_sheet": character_sheet}
 
 
-@router.post("/generate-batch")
-async def generate_batch_images(request: BatchGenerateRequest, db: AsyncSession = Depends(get_db)):
-    project = await db.get(Project, request.project_id)
-    if not project:
-        raise HTTPException(status_code=404, detail="Project not found")
+async def _batch_generation_events(request: BatchGenerateRequest):
+    """Generate a batch of images, yielding progress events; the last one is "done".
     
+    Uses its own session so it can outlive the request scope when streamed.
+    """
     from app.services.ai import GeminiService
+    from app.services.ai.image_batch import generate_images
     service = GeminiService()
     settings = get_settings()
     
-    video_style = project.video_style or "dialogue"
-    image_style = request.image_style or project.image_style or "cartoon"
-    
-    character_sheet = project.character_sheet
-    if not character_sheet or request.regenerate_characters:
-        character_sheet = await service.generate_character_sheet(request.segments, project.script or "", video_style, image_style)
-        project.character_sheet = character_sheet
-        project.image_style = image_style
-        flag_modified(project, "character_sheet")
-        await db.commit()
-    
-    prompts = await service.generate_batch_prompts(request.segments, request.count, character_sheet, project.script or "", request.language, video_style=video_style, image_style=image_style, aspect_ratio=request.aspect_ratio, prompt_language=request.prompt_language)
-    
-    project_dir = f"{settings.storage_path}/{request.project_id}/media"
-    os.makedirs(project_dir, exist_ok=True)
-    
-    generated = []
-    for p in prompts:
-        media_id = str(uuid.uuid4())
-        file_path = f"{project_dir}/{media_id}.png"
-        await service.generate_segment_image(p["prompt"], file_path, request.model, character_sheet, image_style, request.aspect_ratio)
+    async with async_session() as db:
+        project = await db.get(Project, request.project_id)
+        video_style = project.video_style or "dialogue"
+        image_style = request.image_style or project.image_style or "cartoon"
         
-        width, height = None, None
-        if os.path.exists(file_path):
-            with Image.open(file_path) as img:
-                width, height = img.size
+        character_sheet = project.character_sheet
+        if not character_sheet or request.regenerate_characters:
+            character_sheet = await service.generate_character_sheet(request.segments, project.script or "", video_style, image_style, use_cache=not request.regenerate_characters)
+            project.character_sheet = character_sheet
+            project.image_style = image_style
+            flag_modified(project, "character_sheet")
+            await db.commit()
         
-        result = await db.execute(select(MediaAsset).where(MediaAsset.project_id == request.project_id))
-        order = len(result.scalars().all())
+        if request.prompts:
+            prompts = [{"prompt": p} for p in request.prompts]
+        else:
+            prompts = await service.generate_batch_prompts(request.segments, request.count, character_sheet, project.script or "", request.language, video_style=video_style, image_style=image_style, aspect_ratio=request.aspect_ratio, prompt_language=request.prompt_language)
+        yield {"event": "prompts", "total": len(prompts), "character_sheet": character_sheet}
         
-        asset = MediaAsset(id=media_id, project_id=request.project_id, media_type="image", source="ai_generated", file_path=file_path, prompt=p["prompt"], width=width, height=height, order=order)
-        db.add(asset)
-        await db.commit()
-        generated.append({"id": media_id, "type": "image", "source": "ai_generated", "prompt": p["prompt"], "order": order, "timestamp": p.get("timestamp", 0), "path": file_path})
+        project_dir = f"{settings.storage_path}/{request.project_id}/media"
+        os.makedirs(project_dir, exist_ok=True)
+        
+        result = await db.execute(select(func.count()).select_from(MediaAsset).where(MediaAsset.project_id == request.project_id))
+        base_order = result.scalar() or 0
+        
+        jobs = []
+        for p in prompts:
+            media_id = str(uuid.uuid4())
+            jobs.append({"id": media_id, "prompt": p["prompt"], "timestamp": p.get("timestamp", 0), "path": f"{project_dir}/{media_id}.png"})
+        
+        generated = [None] * len(jobs)
+        failed = []
+        # Workers only generate files; rows are written here, one at a time, as images land
+        async for index, error in generate_images(service, jobs, request.model, character_sheet, image_style, request.aspect_ratio):
+            job = jobs[index]
+            if error:
+                failed.append({"index": index, "prompt": job["prompt"], "error": error})
+                yield {"event": "failed", "index": index, "total": len(jobs), "error": error}
+                continue
+            
+            width, height = None, None
+            if os.path.exists(job["path"]):
+                with Image.open(job["path"]) as img:
+                    width, height = img.size
+            
+            # Order follows the prompt sequence, not completion order
+            order = base_order + index
+            db.add(MediaAsset(id=job["id"], project_id=request.project_id, media_type="image", source="ai_generated", file_path=job["path"], prompt=job["prompt"], width=width, height=height, order=order))
+            await db.commit()
+            derivatives.schedule_derivatives(job["path"], "image")
+            
+            generated[index] = {"id": job["id"], "type": "image", "source": "ai_generated", "prompt": job["prompt"], "order": order, "timestamp": job["timestamp"], "path": job["path"]}
+            yield {"event": "image", "index": index, "total": len(jobs), "image": generated[index]}
+        
+        images = [g for g in generated if g]
+        yield {"event": "done", "images": images, "count": len(images), "failed": failed, "character_sheet": character_sheet}
+
+
+@router.post("/generate-batch")
+async def generate_batch_images(request: BatchGenerateRequest, db: AsyncSession = Depends(get_db)):
+    project = await db.get(Project, request.project_id)
+    if not project:
+        raise HTTPException(status_code=404, detail="Project not found")
     
-    return {"images": generated, "count": len(generated), "character_sheet": character_sheet}
+    final = {}
+    async for event in _batch_generation_events(request):
+        final = event
+    return {"images": final.get("images", []), "count": final.get("count", 0), "failed": final.get("failed", []), "character_sheet": final.get("character_sheet")}
+
+
+@router.post("/generate-batch-stream")
+async def generate_batch_images_stream(request: BatchGenerateRequest, db: AsyncSession = Depends(get_db)):
+    """Same as /generate-batch, streamed as server-sent events per finished image."""
+    project = await db.get(Project, request.project_id)
+    if not project:
+        raise HTTPException(status_code=404, detail="Project not found")
+    
+    async def stream():
+        try:
+            async for event in _batch_generation_events(request):
+                yield f"event: {event['event']}\ndata: {json.dumps(event)}\n\n"
+        except Exception as e:
+            yield f"event: error\ndata: {json.dumps({'event': 'error', 'error': str(e)})}\n\n"
+    
+    return StreamingResponse(stream(), media_type="text/event-stream", headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
 
 
 @router.post("/image-to-video")
@@ -340,12 +398,40 @@ async def list_media(project_id: str, db: AsyncSession = Depends(get_db)):
     return [{"id": a.id, "type": a.media_type, "source": a.source, "path": a.file_path, "duration": a.duration, "width": a.width, "height": a.height, "prompt": a.prompt, "order": a.order} for a in result.scalars().all()]
 
 
+def _file_etag(path: str) -> str:
+    stat = os.stat(path)
+    return f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+
+
 @router.get("/file/{media_id}")
-async def get_media_file(media_id: str, db: AsyncSession = Depends(get_db)):
+async def get_media_file(media_id: str, request: Request, size: str = "", fmt: str = derivatives.DEFAULT_FORMAT, v: str = "", db: AsyncSession = Depends(get_db)):
+    """Original file, or a resized preview with ?size=thumb|medium (&fmt=webp|jpeg).
+    
+    Files are served with ETags; pass ?v=<version> for immutable long-lived caching.
+    """
     asset = await db.get(MediaAsset, media_id)
     if not asset or not os.path.exists(asset.file_path):
         raise HTTPException(status_code=404, detail="Media not found")
-    return FileResponse(asset.file_path, media_type="image/png" if asset.media_type == "image" else "video/mp4")
+    
+    path = asset.file_path
+    media_type = mimetypes.guess_type(path)[0] or ("image/png" if asset.media_type == "image" else "video/mp4")
+    if size:
+        if size not in derivatives.SIZES or fmt not in derivatives.FORMATS:
+            raise HTTPException(status_code=400, detail="Unsupported size or format")
+        try:
+            path = await asyncio.to_thread(derivatives.get_derivative, asset.file_path, asset.media_type, size, fmt)
+            media_type = derivatives.FORMATS[fmt][1]
+        except Exception as e:
+            print(f"[DERIVATIVES] Falling back to original for {media_id}: {e}")
+    
+    etag = _file_etag(path)
+    headers = {
+        "ETag": etag,
+        "Cache-Control": "public, max-age=31536000, immutable" if v else "public, no-cache",
+    }
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return FileResponse(path, media_type=media_type, headers=headers)
 
 
 @router.delete("/{media_id}")
@@ -355,6 +441,7 @@ async def delete_media(media_id: str, db: AsyncSession = Depends(get_db)):
         raise HTTPException(status_code=404, detail="Media not found")
     if os.path.exists(asset.file_path):
         os.remove(asset.file_path)
+    derivatives.remove_derivatives(asset.file_path)
     await db.delete(asset)
     await db.commit()
     return {"status": "deleted"}
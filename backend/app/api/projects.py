@@ -1,14 +1,21 @@
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Query, Response
 from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm.attributes import flag_modified
-from sqlalchemy import select
+from sqlalchemy import select, tuple_
+from datetime import datetime
 from app.database import get_db
 from app.models.project import Project, MediaAsset
+from app.services.transcript_index import remove_transcript_index
 import os
+import time
+import base64
 
 router = APIRouter()
 
+THUMBNAIL_CHECK_TTL = 30  # Seconds a thumbnail existence check is reused
+_thumbnail_checks: dict[str, tuple[float, bool]] = {}
+
 class CustomProjectRequest(BaseModel):
     title: str
     prompt: str = ""
@@ -16,18 +23,50 @@ class CustomProjectRequest(BaseModel):
     video_style: str = "dialogue"
     language: str = "English"
 
+def _has_thumbnail_file(project_id: str) -> bool:
+    now = time.monotonic()
+    checked = _thumbnail_checks.get(project_id)
+    if checked and now - checked[0] < THUMBNAIL_CHECK_TTL:
+        return checked[1]
+    exists = os.path.exists(f"./storage/{project_id}/thumbnail.png")
+    _thumbnail_checks[project_id] = (now, exists)
+    return exists
+
+
 def get_project_thumbnail(project_id: str, thumbnail_url: str) -> str | None:
     if thumbnail_url:
         return thumbnail_url
-    if os.path.exists(f"./storage/{project_id}/thumbnail.png"):
+    if _has_thumbnail_file(project_id):
         return f"/api/video/thumbnail/{project_id}"
     return None
 
 
+def _encode_cursor(created_at: datetime, project_id: str) -> str:
+    return base64.urlsafe_b64encode(f"{created_at.isoformat()}|{project_id}".encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> tuple[datetime, str]:
+    try:
+        created_at, project_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|", 1)
+        return datetime.fromisoformat(created_at), project_id
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
 @router.get("")
-async def list_projects(db: AsyncSession = Depends(get_db)):
-    result = await db.execute(select(Project).order_by(Project.created_at.desc()))
-    projects = result.scalars().all()
+async def list_projects(response: Response, limit: int = Query(100, ge=1, le=500), cursor: str = None, db: AsyncSession = Depends(get_db)):
+    """Newest projects first, `limit` per page; the next page's cursor is in X-Next-Cursor."""
+    query = select(
+        Project.id, Project.title, Project.thumbnail_url, Project.status, Project.project_type, Project.created_at
+    ).order_by(Project.created_at.desc(), Project.id.desc()).limit(limit + 1)
+    if cursor:
+        query = query.where(tuple_(Project.created_at, Project.id) < _decode_cursor(cursor))
+    
+    rows = (await db.execute(query)).all()
+    if len(rows) > limit:
+        rows = rows[:limit]
+        response.headers["X-Next-Cursor"] = _encode_cursor(rows[-1].created_at, rows[-1].id)
+    
     return [
         {
             "id": p.id,
@@ -37,7 +76,7 @@ async def list_projects(db: AsyncSession = Depends(get_db)):
             "project_type": p.project_type or "youtube",
             "created_at": p.created_at.isoformat()
         }
-        for p in projects
+        for p in rows
     ]
 
 @router.post("/custom")
@@ -188,5 +227,6 @@ async def delete_project(project_id: str, db: AsyncSession = Depends(get_db)):
     
     await db.delete(project)
     await db.commit()
+    remove_transcript_index(project_id)
     return {"status": "deleted"}
 
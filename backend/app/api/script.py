@@ -1,11 +1,13 @@
 from fastapi import APIRouter, HTTPException, Depends
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm.attributes import flag_modified
 from sqlalchemy import select
-from app.database import get_db
+from app.database import get_db, async_session
 from app.models.project import Project, MediaAsset
 from typing import List
+import json
 
 router = APIRouter()
 
@@ -47,6 +49,59 @@ async def generate_script_from_prompt(request: GenerateScriptRequest, db: AsyncS
     print(f"Generated {len(result.get('segments', []))} segments for project {request.project_id}")
     return result
 
+@router.post("/generate-stream")
+async def generate_script_stream(request: GenerateScriptRequest, db: AsyncSession = Depends(get_db)):
+    """Same as /generate, streamed as server-sent events: one "segment" event per
+    segment as soon as the model has written it, then "done" once it is saved.
+    If the model fails part-way the segments received so far are still saved
+    and reported in the "error" event."""
+    project = await db.get(Project, request.project_id)
+    if not project:
+        raise HTTPException(status_code=404, detail="Project not found")
+    
+    from app.services.ai import GeminiService
+    service = GeminiService()
+    num_segments = request.num_segments or max(3, request.duration_seconds // 10)
+    
+    async def save(segments: list) -> str:
+        script = "\n".join([s["display_text"] for s in segments])
+        # Own session: the request-scoped one is closed before a streamed body finishes
+        async with async_session() as session:
+            project = await session.get(Project, request.project_id)
+            project.script = script
+            project.segments_data = segments
+            project.prompt = request.prompt
+            project.duration = request.duration_seconds
+            flag_modified(project, "segments_data")
+            await session.commit()
+        return script
+    
+    async def stream():
+        segments = []
+        try:
+            async for segment in service.stream_script_from_prompt(request.prompt, request.duration_seconds, request.language, num_segments, request.video_style):
+                segments.append(segment)
+                event = {"event": "segment", "index": len(segments) - 1, "segment": segment}
+                yield f"event: segment\ndata: {json.dumps(event)}\n\n"
+            
+            if not segments:
+                raise Exception("No segments could be parsed from the model output")
+            
+            script = await save(segments)
+            print(f"Streamed {len(segments)} segments for project {request.project_id}")
+            done = {"event": "done", "script": script, "segments": segments}
+            yield f"event: done\ndata: {json.dumps(done)}\n\n"
+        except Exception as e:
+            print(f"Script stream failed after {len(segments)} segments: {e}")
+            if segments:
+                try:
+                    await save(segments)
+                except Exception as save_error:
+                    print(f"Could not save partial script: {save_error}")
+            yield f"event: error\ndata: {json.dumps({'event': 'error', 'error': str(e), 'segments': len(segments)})}\n\n"
+    
+    return StreamingResponse(stream(), media_type="text/event-stream", headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
 class GenerateWikiScriptRequest(BaseModel):
     project_id: str
     duration_seconds: int = 60
@@ -4,6 +4,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from app.database import get_db
 from app.services.video import VideoService
+from app.services.video.boundaries import snap_range, EXTRACT_SNAP_SHIFT
 from app.services.youtube import YouTubeService
 from app.services.music import MusicService, search_youtube_music, download_youtube_audio
 from app.services.thumbnail import ThumbnailService
@@ -17,6 +18,7 @@ from app.schemas.video import (
 )
 import os
 import io
+import asyncio
 from PIL import Image
 
 router = APIRouter()
@@ -49,9 +51,12 @@ async def extract_clip(request: ExtractClipRequest, db: AsyncSession = Depends(g
     
     video_service = VideoService()
     clip_path = f"./storage/{project.id}/clip_{request.index}.mp4"
-    video_service.extract_clip(source_path, request.start, request.end, clip_path)
+    start, end = request.start, request.end
+    if request.snap:
+        start, end = snap_range(source_path, start, end, EXTRACT_SNAP_SHIFT)
+    video_service.extract_clip(source_path, start, end, clip_path, request.smart_cut)
     
-    return {"clip_path": clip_path, "index": request.index}
+    return {"clip_path": clip_path, "index": request.index, "start": start, "end": end}
 
 
 @router.post("/merge")
@@ -91,7 +96,7 @@ async def generate_thumbnail(request: ThumbnailRequest, db: AsyncSession = Depen
     ai_service = GeminiService()
     
     script_text = request.script or project.script or project.title
-    prompt_data = await ai_service.generate_thumbnail_prompt(script_text, project.title, request.language)
+    prompt_data = await ai_service.generate_thumbnail_prompt(script_text, project.title, request.language, use_cache=not request.regenerate)
     title_text = prompt_data.get("title", "WATCH NOW")
     image_prompt = prompt_data.get("image", f"dramatic scene about {project.title}")
     
@@ -118,7 +123,7 @@ async def generate_thumbnail_prompt(request: ThumbnailPromptRequest, db: AsyncSe
     ai_service = GeminiService()
     
     script_text = request.script or project.script or project.title
-    prompt_data = await ai_service.generate_thumbnail_prompt(script_text, project.title, request.language, request.image_style, request.video_type)
+    prompt_data = await ai_service.generate_thumbnail_prompt(script_text, project.title, request.language, request.image_style, request.video_type, use_cache=not request.regenerate)
     return {"prompt": prompt_data.get("image", f"dramatic scene about {project.title}"), "title": prompt_data.get("title", "")}
 
 
@@ -241,7 +246,7 @@ async def get_music_preview(preset_id: str):
 async def search_music(q: str):
     if not q or len(q) < 2:
         return {"results": []}
-    return {"results": search_youtube_music(q, limit=8)}
+    return {"results": await asyncio.to_thread(search_youtube_music, q, 8)}
 
 
 @router.get("/preview-search-music/{video_id}")
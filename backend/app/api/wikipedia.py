@@ -7,13 +7,21 @@ from app.database import get_db
 from app.models.project import Project, MediaAsset
 from app.services.wikipedia import WikipediaService
 from typing import List
-import httpx
+from app.services.http import shared_client
+from app.services.derivatives import schedule_derivatives
 import os
+import json
 import uuid
+import asyncio
+import subprocess
+from PIL import ImageFile
 
 router = APIRouter()
 wiki_service = WikipediaService()
 
+COLLECT_CONCURRENCY = 4
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
 @router.get("/on-this-day")
 async def get_on_this_day(lang: str = "en"):
     events = await wiki_service.get_on_this_day(lang=lang)
@@ -81,6 +89,66 @@ class CollectMediaRequest(BaseModel):
     media: List[dict] = []
     images: List[dict] = []
 
+def _media_extension(url: str, media_type: str) -> str:
+    ext = url.split(".")[-1].split("?")[0][:5].lower()
+    if media_type == "video":
+        return ext if ext in ["ogv", "webm", "mp4"] else "mp4"
+    return ext if ext in ["jpg", "jpeg", "png", "gif", "webp"] else "jpg"
+
+
+def _probe_video(file_path: str) -> tuple:
+    result = subprocess.run(["ffprobe", "-v", "error", "-select_streams", "v:0", "-show_entries", "stream=width,height:format=duration", "-of", "json", file_path], capture_output=True, text=True)
+    if result.returncode != 0:
+        return None, None, None
+    data = json.loads(result.stdout or "{}")
+    stream = (data.get("streams") or [{}])[0]
+    duration = data.get("format", {}).get("duration")
+    return stream.get("width"), stream.get("height"), float(duration) if duration else None
+
+
+async def _download_media(client, semaphore: asyncio.Semaphore, item: dict, project_dir: str, total: int, index: int) -> dict:
+    """Stream one Commons file to disk, reading image dimensions from the first chunks."""
+    media_type = item.get("type", "image")
+    media_id = str(uuid.uuid4())
+    url = item.get("url")
+    result = {"index": index, "id": media_id, "title": item.get("title"), "type": media_type, "path": None,
+              "width": None, "height": None, "duration": None}
+    if not url:
+        return {**result, "status": "failed", "error": "Missing url"}
+    file_path = result["path"] = f"{project_dir}/{media_id}.{_media_extension(url, media_type)}"
+    
+    async with semaphore:
+        try:
+            async with client.stream("GET", url, timeout=60.0) as response:
+                if response.status_code != 200:
+                    print(f"[WIKI] Failed to download {url}: {response.status_code}")
+                    return {**result, "status": "failed", "error": f"HTTP {response.status_code}"}
+                
+                parser = ImageFile.Parser() if media_type == "image" else None
+                with open(file_path, "wb") as f:
+                    async for chunk in response.aiter_bytes(DOWNLOAD_CHUNK_SIZE):
+                        f.write(chunk)
+                        if parser is not None:
+                            try:
+                                parser.feed(chunk)
+                            except Exception:
+                                parser = None
+                            if parser is not None and parser.image:
+                                result["width"], result["height"] = parser.image.size
+                                parser = None
+            
+            if media_type == "video":
+                result["width"], result["height"], result["duration"] = await asyncio.to_thread(_probe_video, file_path)
+        except Exception as e:
+            if os.path.exists(file_path):
+                os.remove(file_path)
+            print(f"[WIKI] Failed to download {url}: {e}")
+            return {**result, "status": "failed", "error": str(e)}
+    
+    print(f"[WIKI] Collected {index + 1}/{total}: {item.get('title', '')}")
+    return {**result, "status": "collected"}
+
+
 @router.post("/collect-media")
 async def collect_media(request: CollectMediaRequest, db: AsyncSession = Depends(get_db)):
     project = await db.get(Project, request.project_id)
@@ -92,57 +160,36 @@ async def collect_media(request: CollectMediaRequest, db: AsyncSession = Depends
     
     items = request.media if request.media else request.images
     
-    collected = []
-    headers = {
-        "User-Agent": "GoInsights/1.0 (https://goinsights.app; video generation tool) Python/httpx",
-        "Referer": "https://commons.wikimedia.org/",
-        "Accept": "image/webp,image/apng,image/*,*/*;q=0.8"
-    }
-    async with httpx.AsyncClient(headers=headers, follow_redirects=True) as client:
-        for i, item in enumerate(items):
-            try:
-                response = await client.get(item["url"], timeout=60.0)
-                if response.status_code != 200:
-                    print(f"[WIKI] Failed to download {item['url']}: {response.status_code}")
-                    continue
-                
-                media_type = item.get("type", "image")
-                url = item["url"]
-                ext = url.split(".")[-1].split("?")[0][:5].lower()
-                
-                if media_type == "video":
-                    if ext not in ["ogv", "webm", "mp4"]:
-                        ext = "mp4"
-                else:
-                    if ext not in ["jpg", "jpeg", "png", "gif", "webp"]:
-                        ext = "jpg"
-                
-                media_id = str(uuid.uuid4())
-                file_path = f"{project_dir}/{media_id}.{ext}"
-                
-                with open(file_path, "wb") as f:
-                    f.write(response.content)
-                
-                asset = MediaAsset(
-                    id=media_id,
-                    project_id=project.id,
-                    file_path=file_path,
-                    media_type=media_type,
-                    source="wikipedia",
-                    original_filename=item.get("title", ""),
-                    prompt=item.get("description", item.get("title", "")),
-                    order=i
-                )
-                db.add(asset)
-                collected.append({
-                    "id": media_id,
-                    "title": item.get("title"),
-                    "type": media_type,
-                    "path": file_path
-                })
-            except Exception:
-                continue
+    semaphore = asyncio.Semaphore(COLLECT_CONCURRENCY)
+    async with shared_client("commons_media") as client:
+        results = await asyncio.gather(*[
+            _download_media(client, semaphore, item, project_dir, len(items), i) for i, item in enumerate(items)
+        ])
     
+    collected = [r for r in results if r["status"] == "collected"]
+    db.add_all([
+        MediaAsset(
+            id=r["id"],
+            project_id=project.id,
+            file_path=r["path"],
+            media_type=r["type"],
+            source="wikipedia",
+            original_filename=items[r["index"]].get("title", ""),
+            prompt=items[r["index"]].get("description", items[r["index"]].get("title", "")),
+            width=r["width"],
+            height=r["height"],
+            duration=r["duration"],
+            order=r["index"]
+        )
+        for r in collected
+    ])
     await db.commit()
-    return {"collected": len(collected), "media": collected}
+    for r in collected:
+        schedule_derivatives(r["path"], r["type"])
+    
+    return {
+        "collected": len(collected),
+        "media": [{"id": r["id"], "title": r["title"], "type": r["type"], "path": r["path"]} for r in collected],
+        "items": [{"index": r["index"], "title": r["title"], "status": r["status"], "error": r.get("error")} for r in results]
+    }
 
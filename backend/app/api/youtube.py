@@ -1,14 +1,22 @@
-from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks
+from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks, Header
 from pydantic import BaseModel
 from typing import Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 import os
+import asyncio
 from app.database import get_db
 from app.services.youtube import YouTubeService
+from app.services.ytdlp_pool import cached_entries
+from app.services.http import shared_client
+from app.services.transcription_jobs import get_transcription_jobs
+from app.config import get_settings
 from app.models.project import Project
 
 router = APIRouter()
 
+SUGGESTION_LIMIT = 24
+SUGGESTION_QUERY_TIMEOUT = 20  # Per-search deadline so one slow query can't stall the page
+
 class ExtractRequest(BaseModel):
     url: str
 
@@ -34,7 +42,7 @@ async def extract_video(request: ExtractRequest, db: AsyncSession = Depends(get_
     """Extract basic video info and quick transcript"""
     try:
         service = YouTubeService()
-        info = service.get_video_info(request.url)
+        info = await service.get_video_info(request.url)
         
         project = Project(
             youtube_url=request.url,
@@ -71,7 +79,10 @@ async def extract_video(request: ExtractRequest, db: AsyncSession = Depends(get_
 
 @router.post("/transcribe/{project_id}", response_model=TranscriptionResponse)
 async def transcribe_video(project_id: str, db: AsyncSession = Depends(get_db)):
-    """Get detailed transcription with AssemblyAI (speaker diarization, chapters, etc.)"""
+    """Start a detailed AssemblyAI transcription (speaker diarization, chapters, etc.)
+    
+    Returns immediately; poll /transcription-status or re-call this endpoint for the result.
+    """
     try:
         # Get project
         project = await db.get(Project, project_id)
@@ -86,27 +97,29 @@ async def transcribe_video(project_id: str, db: AsyncSession = Depends(get_db)):
                 transcription=project.detailed_transcription
             )
         
-        # Update status
-        project.status = "transcribing"
-        await db.commit()
-        
-        # Get detailed transcription
-        service = YouTubeService()
-        result = await service.get_detailed_transcription(project.youtube_url)
-        
-        # Update project with transcription
-        project.detailed_transcription = result.get("transcription")
-        project.status = "transcribed"
-        await db.commit()
+        if not project.transcription_job_id:
+            await get_transcription_jobs().submit(project_id, project.youtube_url)
         
-        return TranscriptionResponse(
-            project_id=project_id,
-            status="completed",
-            transcription=project.detailed_transcription
-        )
+        return TranscriptionResponse(project_id=project_id, status="processing")
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Transcription failed: {str(e)}")
 
+@router.post("/transcription-webhook")
+async def transcription_webhook(payload: dict, x_webhook_secret: Optional[str] = Header(None)):
+    """AssemblyAI completion callback: {"transcript_id": ..., "status": ...}"""
+    secret = get_settings().assemblyai_webhook_secret
+    if secret and x_webhook_secret != secret:
+        raise HTTPException(status_code=401, detail="Invalid webhook secret")
+    
+    transcript_id = payload.get("transcript_id")
+    if not transcript_id:
+        raise HTTPException(status_code=400, detail="Missing transcript_id")
+    
+    status = await get_transcription_jobs().complete(transcript_id)
+    return {"transcript_id": transcript_id, "status": status}
+
 @router.get("/transcription-status/{project_id}")
 async def get_transcription_status(project_id: str, db: AsyncSession = Depends(get_db)):
     """Check transcription status"""
@@ -117,7 +130,9 @@ async def get_transcription_status(project_id: str, db: AsyncSession = Depends(g
     return {
         "project_id": project_id,
         "status": project.status,
-        "has_transcription": project.detailed_transcription is not None
+        "has_transcription": project.detailed_transcription is not None,
+        "job_id": project.transcription_job_id,
+        "error": project.transcription_error
     }
 
 @router.get("/auth-url")
@@ -149,11 +164,10 @@ class AuthCallbackRequest(BaseModel):
 @router.post("/auth-callback")
 async def auth_callback(request: AuthCallbackRequest):
     """Handle OAuth callback and exchange code for token"""
-    import httpx
     from app.config import get_settings
     settings = get_settings()
     
-    async with httpx.AsyncClient() as client:
+    async with shared_client("google") as client:
         resp = await client.post("https://oauth2.googleapis.com/token", data={
             "code": request.code,
             "client_id": settings.google_client_id,
@@ -177,8 +191,6 @@ async def get_channel_videos():
 @router.get("/trending-topics")
 async def get_trending_topics(style: str = "dialogue", topic: str = ""):
     """Get trending topics based on video style and optional topic keyword"""
-    import subprocess
-    import json
     import random
     from datetime import datetime
     
@@ -201,18 +213,11 @@ async def get_trending_topics(style: str = "dialogue", topic: str = ""):
     search_query = f"{topic} {base_query} {time_filter}".strip() if topic else f"{base_query} {time_filter}"
     
     try:
-        result = subprocess.run(
-            ["yt-dlp", "--cookies", "www.youtube.com_cookies.txt", "-j", "--flat-playlist",
-             "--playlist-end", "15", f"ytsearch15:{search_query}"],
-            capture_output=True, text=True, timeout=30,
-            cwd="/Users/alomgir/workspace/goinsights/backend"
-        )
+        entries = await cached_entries("trending", f"ytsearch15:{search_query}", limit=15, timeout=30)
         
         topics = []
-        for line in result.stdout.strip().split('\n'):
-            if not line: continue
+        for item in entries:
             try:
-                item = json.loads(line)
                 title = item.get("title", "")
                 if title and len(title) > 10:
                     topics.append({
@@ -232,9 +237,6 @@ async def get_trending_topics(style: str = "dialogue", topic: str = ""):
 @router.get("/suggestions")
 async def get_video_suggestions():
     """Get trending/popular English videos using yt-dlp (no API quota)"""
-    import subprocess
-    import json
-    
     try:
         # English-focused searches - documentaries, educational, viral
         searches = [
@@ -243,67 +245,67 @@ async def get_video_suggestions():
             "ytsearch15:viral trending english",
         ]
         
+        async def run_search(search_url: str) -> list:
+            try:
+                return await asyncio.wait_for(
+                    cached_entries("suggestions", search_url, limit=20, lang="en", timeout=SUGGESTION_QUERY_TIMEOUT),
+                    SUGGESTION_QUERY_TIMEOUT,
+                )
+            except Exception as e:
+                print(f"Suggestion search '{search_url}' skipped: {e}")
+                return []
+        
         all_videos = []
         seen_ids = set()
         
-        for search_url in searches:
-            if len(all_videos) >= 24:
-                break
-                
-            result = subprocess.run(
-                [
-                    "yt-dlp",
-                    "--cookies", "www.youtube.com_cookies.txt",
-                    "-j",
-                    "--flat-playlist",
-                    "--playlist-end", "20",
-                    "--extractor-args", "youtube:lang=en",
-                    search_url
-                ],
-                capture_output=True,
-                text=True,
-                timeout=45,
-                cwd="/Users/alomgir/workspace/goinsights/backend"
-            )
-            
-            for line in result.stdout.strip().split('\n'):
-                if not line or len(all_videos) >= 24:
-                    continue
-                try:
-                    item = json.loads(line)
-                    video_id = item.get("id", "")
-                    title = item.get("title", "")
-                    
-                    # Skip if already seen or no ID
-                    if not video_id or video_id in seen_ids:
-                        continue
-                    
-                    # Skip non-English looking titles (basic filter)
-                    if not any(c.isascii() for c in title[:20]):
+        # Searches run concurrently and are merged as each one lands
+        tasks = [asyncio.create_task(run_search(url)) for url in searches]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                entries = await next_done
+                for item in entries:
+                    if len(all_videos) >= SUGGESTION_LIMIT:
+                        break
+                    try:
+                        video_id = item.get("id", "")
+                        title = item.get("title", "")
+                        
+                        # Skip if already seen or no ID
+                        if not video_id or video_id in seen_ids:
+                            continue
+                        
+                        # Skip non-English looking titles (basic filter)
+                        if not any(c.isascii() for c in title[:20]):
+                            continue
+                        
+                        seen_ids.add(video_id)
+                        
+                        duration_secs = item.get("duration", 0) or 0
+                        duration = f"{int(duration_secs // 60)}:{int(duration_secs % 60):02d}" if duration_secs else ""
+                        
+                        views = format_views(item.get("view_count", 0) or 0)
+                        description = (item.get("description", "") or "")[:200]
+                        
+                        all_videos.append({
+                            "id": video_id,
+                            "title": title,
+                            "description": description,
+                            "thumbnail": f"https://img.youtube.com/vi/{video_id}/maxresdefault.jpg",
+                            "duration": duration,
+                            "views": views,
+                            "likes": format_views(item.get("like_count", 0) or 0),
+                            "channel": item.get("channel", "") or item.get("uploader", ""),
+                            "channelId": item.get("channel_id", ""),
+                            "publishedAt": item.get("upload_date", ""),
+                        })
+                    except (TypeError, ValueError):
                         continue
-                    
-                    seen_ids.add(video_id)
-                    
-                    duration_secs = item.get("duration", 0) or 0
-                    duration = f"{int(duration_secs // 60)}:{int(duration_secs % 60):02d}" if duration_secs else ""
-                    
-                    views = format_views(item.get("view_count", 0) or 0)
-                    description = (item.get("description", "") or "")[:200]
-                    
-                    all_videos.append({
-                        "id": video_id,
-                        "title": title,
-                        "description": description,
-                        "thumbnail": f"https://img.youtube.com/vi/{video_id}/maxresdefault.jpg",
-                        "duration": duration,
-                        "views": views,
-                        "likes": format_views(item.get("like_count", 0) or 0),
-                        "channel": item.get("channel", "") or item.get("uploader", ""),
-                        "channelId": item.get("channel_id", ""),
-                        "publishedAt": item.get("upload_date", ""),
-                    })
-                except json.JSONDecodeError:
-                    continue
+                
+                if len(all_videos) >= SUGGESTION_LIMIT:
+                    break
+        finally:
+            for task in tasks:
+                task.cancel()
         
         return {"videos": all_videos}
         
@@ -315,34 +317,15 @@ async def get_video_suggestions():
 @router.get("/channel/{channel_id}/videos")
 async def get_channel_videos_by_id(channel_id: str):
     """Get videos from a specific channel using yt-dlp"""
-    import subprocess
-    import json
-    
     try:
         channel_url = f"https://www.youtube.com/channel/{channel_id}/videos"
-        result = subprocess.run(
-            [
-                "yt-dlp",
-                "--cookies", "www.youtube.com_cookies.txt",
-                "-j",
-                "--flat-playlist",
-                "--playlist-end", "20",
-                channel_url
-            ],
-            capture_output=True,
-            text=True,
-            timeout=30,
-            cwd="/Users/alomgir/workspace/goinsights/backend"
-        )
+        entries = await cached_entries("channel_videos", channel_url, limit=20, timeout=30)
         
         videos = []
         channel_info = {}
         
-        for line in result.stdout.strip().split('\n'):
-            if not line:
-                continue
+        for item in entries:
             try:
-                item = json.loads(line)
                 video_id = item.get("id", "")
                 if not video_id:
                     continue
@@ -373,7 +356,7 @@ async def get_channel_videos_by_id(channel_id: str):
                     "channelId": channel_id,
                     "publishedAt": "",
                 })
-            except json.JSONDecodeError:
+            except (TypeError, ValueError):
                 continue
         
         return {"channel": channel_info, "videos": videos}
@@ -386,35 +369,16 @@ async def get_channel_videos_by_id(channel_id: str):
 @router.get("/channel/search")
 async def search_channels(q: str):
     """Search for YouTube channels using yt-dlp"""
-    import subprocess
-    import json
-    
     try:
         # Search for channels
         search_url = f"ytsearchall:{q} channel"
-        result = subprocess.run(
-            [
-                "yt-dlp",
-                "--cookies", "www.youtube.com_cookies.txt",
-                "-j",
-                "--flat-playlist",
-                "--playlist-end", "10",
-                search_url
-            ],
-            capture_output=True,
-            text=True,
-            timeout=30,
-            cwd="/Users/alomgir/workspace/goinsights/backend"
-        )
+        entries = await cached_entries("channel_search", search_url, limit=10, timeout=30)
         
         channels = []
         seen_channels = set()
         
-        for line in result.stdout.strip().split('\n'):
-            if not line:
-                continue
+        for item in entries:
             try:
-                item = json.loads(line)
                 channel_id = item.get("channel_id", "")
                 channel_name = item.get("channel", "") or item.get("uploader", "")
                 
@@ -429,7 +393,7 @@ async def search_channels(q: str):
                     
                 if len(channels) >= 10:
                     break
-            except json.JSONDecodeError:
+            except (TypeError, ValueError):
                 continue
         
         return {"channels": channels}
@@ -477,13 +441,11 @@ class PlaylistsRequest(BaseModel):
 @router.post("/playlists")
 async def get_playlists(request: PlaylistsRequest):
     """Fetch user's YouTube playlists"""
-    import httpx
-    
     if not request.access_token:
         print("No access token provided for playlists")
         return {"playlists": [], "error": "No access token"}
     
-    async with httpx.AsyncClient(timeout=30.0) as client:
+    async with shared_client("google") as client:
         resp = await client.get(
             "https://www.googleapis.com/youtube/v3/playlists",
             params={"part": "snippet", "mine": "true", "maxResults": 50},
@@ -507,34 +469,17 @@ async def get_playlists(request: PlaylistsRequest):
 @router.get("/search")
 async def search_videos(q: str):
     """Search YouTube videos - prioritize English content"""
-    import subprocess
-    import json
-    
     try:
         search_url = f"ytsearch25:{q}"
-        result = subprocess.run(
-            [
-                "yt-dlp",
-                "--cookies", "www.youtube.com_cookies.txt",
-                "-j",
-                "--flat-playlist",
-                "--extractor-args", "youtube:lang=en",
-                search_url
-            ],
-            capture_output=True,
-            text=True,
-            timeout=45,
-            cwd="/Users/alomgir/workspace/goinsights/backend"
-        )
+        entries = await cached_entries("search", search_url, lang="en", timeout=45)
         
         videos = []
         seen_ids = set()
         
-        for line in result.stdout.strip().split('\n'):
-            if not line or len(videos) >= 20:
-                continue
+        for item in entries:
+            if len(videos) >= 20:
+                break
             try:
-                item = json.loads(line)
                 video_id = item.get("id", "")
                 title = item.get("title", "")
                 
@@ -563,7 +508,7 @@ async def search_videos(q: str):
                     "channelId": item.get("channel_id", ""),
                     "publishedAt": item.get("upload_date", ""),
                 })
-            except json.JSONDecodeError:
+            except (TypeError, ValueError):
                 continue
         
         return {"videos": videos, "query": q}
@@ -653,7 +598,7 @@ async def publish_to_youtube(request: PublishRequest, db: AsyncSession = Depends
     }
     
     try:
-        async with httpx.AsyncClient(timeout=600.0) as client:  # Increased timeout for large files
+        async with shared_client("google_upload") as client:
             # Step 1: Initialize resumable upload
             print("Initializing upload...")
             init_response = await client.post(
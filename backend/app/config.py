@@ -13,6 +13,11 @@ class Settings(BaseSettings):
     google_client_secret: str = ""
     google_redirect_uri: str = "http://localhost:3000/auth/callback"
     storage_path: str = "./storage"
+    public_base_url: str = ""  # Externally reachable API origin, enables AssemblyAI webhooks
+    assemblyai_webhook_secret: str = ""
+    source_cache_max_gb: float = 20.0
+    image_cache_max_gb: float = 2.0
+    llm_cache_ttl_hours: float = 24.0  # 0 disables the LLM response cache
     
     model_config = SettingsConfigDict(env_file=".env", extra="ignore")
 
@@ -3,7 +3,12 @@ from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 import logging
 import time
+from sqlalchemy import text
 from app.database import engine, Base
+from app.services.ytdlp_pool import get_ytdlp_pool
+from app.services.query_cache import get_query_cache
+from app.services.http import get_http_clients
+from app.services.transcription_jobs import get_transcription_jobs
 from app.api import youtube, ai, clips, projects, voice, video, script, media, auth, wikipedia, inshorts
 
 import sys
@@ -14,7 +19,17 @@ logger = logging.getLogger(__name__)
 async def lifespan(app: FastAPI):
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+        # create_all doesn't add columns to existing tables
+        await conn.execute(text("ALTER TABLE projects ADD COLUMN IF NOT EXISTS transcription_job_id VARCHAR"))
+        await conn.execute(text("ALTER TABLE projects ADD COLUMN IF NOT EXISTS transcription_error TEXT"))
+        await conn.execute(text("CREATE INDEX IF NOT EXISTS ix_projects_created_at_id ON projects (created_at, id)"))
+    get_http_clients()
+    await get_transcription_jobs().resume_pending()
     yield
+    await get_transcription_jobs().shutdown()
+    get_ytdlp_pool().shutdown()
+    await get_query_cache().close()
+    await get_http_clients().close()
 
 app = FastAPI(title="ZapClip - AI Video Creator", lifespan=lifespan)
 
@@ -32,6 +47,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 app.include_router(youtube.router, prefix="/api/youtube", tags=["YouTube"])
@@ -51,6 +67,17 @@ async def health_check():
     return {"status": "healthy"}
 
 
+@app.get("/health/http")
+async def http_pool_metrics():
+    return get_http_clients().metrics()
+
+
+@app.get("/health/llm")
+async def llm_metrics():
+    from app.services.ai.llm import get_llm_client
+    return get_llm_client().metrics()
+
+
 @app.get("/")
 async def root():
     return {"message": "Hello World"}
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Text, JSON, DateTime, ForeignKey, Integer, Float
+from sqlalchemy import Column, String, Text, JSON, DateTime, ForeignKey, Integer, Float, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import uuid
@@ -9,6 +9,7 @@ def generate_uuid():
 
 class Project(Base):
     __tablename__ = "projects"
+    __table_args__ = (Index("ix_projects_created_at_id", "created_at", "id"),)  # Keyset pagination of the project list
     
     id = Column(String, primary_key=True, default=generate_uuid)
     project_type = Column(String, default="youtube")  # "youtube" | "custom" | "inshorts"
@@ -34,6 +35,8 @@ class Project(Base):
     # Transcript (YouTube projects)
     transcript = Column(JSON)
     detailed_transcription = Column(JSON)
+    transcription_job_id = Column(String, nullable=True)  # Pending AssemblyAI job
+    transcription_error = Column(Text, nullable=True)
     
     # AI-generated content
     summary = Column(Text)
@@ -31,6 +31,7 @@ class BatchGenerateRequest(BaseModel):
     image_style: str = "cartoon"
     aspect_ratio: str = "16:9"
     prompt_language: str = "en"
+    prompts: list[str] = []  # Ready-made prompts (e.g. edited in the UI); skips prompt generation
 
 
 class ImageToVideoRequest(BaseModel):
@@ -30,6 +30,7 @@ class ThumbnailRequest(BaseModel):
     script: str = ""
     language: str = "English"
     model: str = "gemini-3-pro"
+    regenerate: bool = False  # Skip the LLM response cache
 
 
 class ThumbnailPromptRequest(BaseModel):
@@ -38,6 +39,7 @@ class ThumbnailPromptRequest(BaseModel):
     language: str = "English"
     image_style: str = "cartoon"
     video_type: str = "tutorial"
+    regenerate: bool = False  # Skip the LLM response cache
 
 
 class ThumbnailFromPromptRequest(BaseModel):
@@ -68,6 +70,8 @@ class ExtractClipRequest(BaseModel):
     index: int
     start: int
     end: int
+    smart_cut: bool = False
+    snap: bool = False  # Move cuts onto nearby scene changes / pauses
 
 
 class BubblePosition(BaseModel):
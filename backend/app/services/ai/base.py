@@ -1,6 +1,10 @@
-from openai import OpenAI
+import asyncio
+from openai import OpenAI, AsyncOpenAI
 import google.generativeai as genai
 from app.config import get_settings
+from .llm import get_llm_client
+
+MAP_CONCURRENCY = 4  # Parallel LLM calls when fanning out over chunks/batches
 
 
 class BaseAIService:
@@ -13,11 +17,25 @@ class BaseAIService:
         
         if settings.openai_api_key:
             self.openai = OpenAI(api_key=settings.openai_api_key)
+            self.openai_async = AsyncOpenAI(api_key=settings.openai_api_key)
         else:
             self.openai = None
+            self.openai_async = None
+    
+    async def _generate(self, prompt: str, max_tokens: int = 8192, label: str = "generate", use_cache: bool = False) -> str:
+        return await get_llm_client().generate(prompt, label=label, use_cache=use_cache)
+    
+    async def _stream(self, prompt: str, label: str = "stream"):
+        async for text in get_llm_client().stream(prompt, label=label):
+            yield text
     
-    async def _generate(self, prompt: str, max_tokens: int = 8192) -> str:
-        model = genai.GenerativeModel("gemini-3-pro-preview")
-        response = model.generate_content(prompt)
-        return response.text
+    async def _gather_bounded(self, coros: list, limit: int = MAP_CONCURRENCY) -> list:
+        """Run coroutines with at most `limit` in flight; results keep input order."""
+        semaphore = asyncio.Semaphore(limit)
+        
+        async def run(coro):
+            async with semaphore:
+                return await coro
+        
+        return await asyncio.gather(*(run(c) for c in coros))
 
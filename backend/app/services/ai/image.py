@@ -3,7 +3,10 @@ import re
 from pathlib import Path
 from PIL import Image
 import io
+import os
+import asyncio
 from .thumbnail import ThumbnailService
+from .image_cache import get_image_cache
 
 
 VIDEO_STYLE_CONFIGS = {
@@ -104,7 +107,7 @@ class ImageService(ThumbnailService):
         }
         return f"STYLE-SPECIFIC INSTRUCTION: {instructions.get(video_style, instructions['dialogue'])}"
     
-    async def generate_character_sheet(self, segments: list, script: str = "", video_style: str = "dialogue", image_style: str = "cartoon") -> dict:
+    async def generate_character_sheet(self, segments: list, script: str = "", video_style: str = "dialogue", image_style: str = "cartoon", use_cache: bool = True) -> dict:
         """Generate consistent character/element descriptions for the project"""
         style_config = VIDEO_STYLE_CONFIGS.get(video_style, VIDEO_STYLE_CONFIGS["dialogue"])
         img_style = IMAGE_STYLE_CONFIGS.get(image_style, IMAGE_STYLE_CONFIGS["cartoon"])
@@ -161,7 +164,7 @@ RULES:
 
 Return ONLY valid JSON:"""
 
-        result = await self._generate(prompt, max_tokens=2048)
+        result = await self._generate(prompt, max_tokens=2048, label="character_sheet", use_cache=use_cache)
         
         try:
             json_match = re.search(r'\{[\s\S]*\}', result)
@@ -176,7 +179,12 @@ Return ONLY valid JSON:"""
             "setting": {"location": "cozy indoor setting", "colors": "warm tones", "mood": "friendly and inviting"}
         }
 
-    async def generate_segment_image(self, prompt: str, output_path: str, model: str = "gemini-2.5-flash", character_sheet: dict = None, image_style: str = "cartoon", aspect_ratio: str = "16:9") -> str:
+    async def generate_segment_image(self, prompt: str, output_path: str, model: str = "gemini-2.5-flash", character_sheet: dict = None, image_style: str = "cartoon", aspect_ratio: str = "16:9", use_cache: bool = True) -> str:
+        """Render the full prompt and generate an image into output_path.
+        
+        Identical renders (prompt, model, aspect ratio) are served from the image cache
+        unless use_cache is False, which always generates and refreshes the cache.
+        """
         Path(output_path).parent.mkdir(parents=True, exist_ok=True)
         
         img_style = IMAGE_STYLE_CONFIGS.get(image_style, IMAGE_STYLE_CONFIGS["cartoon"])
@@ -205,14 +213,31 @@ STYLE RULES:
 - Clean composition with GENEROUS SPACING between characters
 - Professional quality"""
         
-        if model == "dall-e-3":
-            img_bytes = await self._generate_dalle(full_prompt, ratio_config['size'])
-        else:
-            img_bytes = await self._generate_gemini(full_prompt, model)
-        
-        img = Image.open(io.BytesIO(img_bytes)).convert("RGB")
-        img.save(output_path, "PNG", quality=95)
+        cache = get_image_cache()
+        cache_key = cache.key(full_prompt, model, aspect_ratio)
+        async with cache.lock(cache_key):
+            if use_cache and await asyncio.to_thread(cache.fetch, cache_key, output_path):
+                print(f"[IMAGE CACHE] Hit {cache_key[:12]}")
+                return output_path
+            
+            if model == "dall-e-3":
+                img_bytes = await self._generate_dalle(full_prompt, ratio_config['size'])
+            else:
+                img_bytes = await self._generate_gemini(full_prompt, model)
+            
+            await asyncio.to_thread(self._save_png, img_bytes, output_path)
+            try:
+                await asyncio.to_thread(cache.store, cache_key, output_path)
+            except OSError as e:
+                print(f"[IMAGE CACHE] Could not store {cache_key[:12]}: {e}")
         return output_path
+    
+    def _save_png(self, img_bytes: bytes, output_path: str):
+        # Written to a new inode so hard links shared with the image cache are never modified
+        img = Image.open(io.BytesIO(img_bytes)).convert("RGB")
+        tmp_path = f"{output_path}.tmp"
+        img.save(tmp_path, "PNG", quality=95)
+        os.replace(tmp_path, output_path)
 
     async def generate_image_prompt(self, segments: list, script: str, character_sheet: dict = None, video_style: str = "dialogue", image_style: str = "cartoon", aspect_ratio: str = "16:9", prompt_language: str = "en") -> str:
         style_config = VIDEO_STYLE_CONFIGS.get(video_style, VIDEO_STYLE_CONFIGS["dialogue"])
@@ -0,0 +1,60 @@
+"""Concurrent image generation with per-provider limits and retries."""
+
+import random
+import asyncio
+from typing import AsyncIterator, Optional
+
+PROVIDER_CONCURRENCY = {"openai": 2, "gemini": 4}
+MAX_ATTEMPTS = 3
+RETRY_BASE_DELAY = 2.0
+
+_provider_semaphores: dict[str, asyncio.Semaphore] = {}
+
+
+def provider_for(model: str) -> str:
+    return "openai" if model == "dall-e-3" else "gemini"
+
+
+def _provider_semaphore(provider: str) -> asyncio.Semaphore:
+    # Shared across requests so concurrent batches still respect provider limits
+    if provider not in _provider_semaphores:
+        _provider_semaphores[provider] = asyncio.Semaphore(PROVIDER_CONCURRENCY[provider])
+    return _provider_semaphores[provider]
+
+
+async def generate_image_with_retry(service, prompt: str, output_path: str, model: str, character_sheet: Optional[dict], image_style: str, aspect_ratio: str) -> str:
+    semaphore = _provider_semaphore(provider_for(model))
+    for attempt in range(1, MAX_ATTEMPTS + 1):
+        try:
+            async with semaphore:
+                return await service.generate_segment_image(prompt, output_path, model, character_sheet, image_style, aspect_ratio)
+        except Exception as e:
+            if attempt == MAX_ATTEMPTS:
+                raise
+            delay = RETRY_BASE_DELAY * 2 ** (attempt - 1) * (0.5 + random.random())
+            print(f"[IMAGE BATCH] Attempt {attempt} failed ({e}), retrying in {delay:.1f}s")
+            await asyncio.sleep(delay)
+
+
+async def generate_images(service, jobs: list[dict], model: str, character_sheet: Optional[dict], image_style: str, aspect_ratio: str) -> AsyncIterator[tuple[int, Optional[str]]]:
+    """Generate every job ({"prompt", "path"}) concurrently.
+
+    Yields (index, error) in completion order, error being None on success, so the
+    caller can persist each image as soon as it lands.
+    """
+    queue: asyncio.Queue = asyncio.Queue()
+
+    async def worker(index: int, job: dict):
+        try:
+            await generate_image_with_retry(service, job["prompt"], job["path"], model, character_sheet, image_style, aspect_ratio)
+            await queue.put((index, None))
+        except Exception as e:
+            await queue.put((index, str(e)))
+
+    tasks = [asyncio.create_task(worker(i, job)) for i, job in enumerate(jobs)]
+    try:
+        for _ in range(len(jobs)):
+            yield await queue.get()
+    finally:
+        for task in tasks:
+            task.cancel()
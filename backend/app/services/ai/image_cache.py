@@ -0,0 +1,120 @@
+"""Content-addressed cache of generated images, keyed on the fully rendered prompt."""
+
+import os
+import json
+import shutil
+import asyncio
+import hashlib
+import threading
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from app.config import get_settings
+
+EVICT_TO = 0.9  # Eviction frees down to this fraction of max_bytes so it doesn't rerun on every store
+
+
+class ImageCache:
+    def __init__(self, root: str, max_bytes: int):
+        self.root = root
+        self.max_bytes = max_bytes
+        self._locks: dict[str, list] = {}  # key -> [lock, holders + waiters]
+        self._evict_lock = threading.Lock()
+        self._total_bytes = None  # Running size of cached images; measured by a full scan only on first store and on eviction
+        os.makedirs(root, exist_ok=True)
+
+    @staticmethod
+    def key(full_prompt: str, model: str, aspect_ratio: str) -> str:
+        payload = json.dumps({"prompt": full_prompt, "model": model, "aspect_ratio": aspect_ratio}, sort_keys=True)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, key[:2], f"{key}.png")
+
+    def _access_path(self, key: str) -> str:
+        # Last access lives in its own file: the PNG inode is hard-linked into
+        # project media, whose mtime drives ETags and derivative staleness
+        return os.path.join(self.root, key[:2], f"{key}.access")
+
+    def _mark_accessed(self, key: str):
+        with open(self._access_path(key), "w"):
+            pass
+
+    @asynccontextmanager
+    async def lock(self, key: str):
+        """Per-key lock so identical prompts in flight are generated once."""
+        entry = self._locks.setdefault(key, [asyncio.Lock(), 0])
+        entry[1] += 1
+        try:
+            async with entry[0]:
+                yield
+        finally:
+            entry[1] -= 1
+            if entry[1] == 0:
+                del self._locks[key]
+
+    def fetch(self, key: str, dest: str) -> bool:
+        """Place the cached image at dest (hard link, else copy). False on a miss."""
+        path = self._path(key)
+        if not os.path.exists(path):
+            return False
+        if os.path.exists(dest):
+            os.remove(dest)
+        try:
+            os.link(path, dest)
+        except OSError:
+            shutil.copyfile(path, dest)
+        self._mark_accessed(key)
+        return True
+
+    def store(self, key: str, source: str):
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        replaced = os.path.getsize(path) if os.path.exists(path) else 0
+        try:
+            os.link(source, tmp_path)
+        except OSError:
+            shutil.copyfile(source, tmp_path)
+        os.replace(tmp_path, path)
+        self._mark_accessed(key)
+
+        with self._evict_lock:
+            if self._total_bytes is None:
+                self._total_bytes = sum(os.path.getsize(full) for full, _ in self._entries())
+            else:
+                self._total_bytes += os.path.getsize(path) - replaced
+            over = self._total_bytes > self.max_bytes
+        if over:
+            self._evict()
+
+    def _entries(self):
+        for dirpath, _, filenames in os.walk(self.root):
+            for name in filenames:
+                if name.endswith(".png"):
+                    full = os.path.join(dirpath, name)
+                    yield full, full[:-len(".png")] + ".access"
+
+    def _evict(self):
+        """Drop least recently accessed images down to EVICT_TO of the limit; also resyncs the running total."""
+        with self._evict_lock:
+            entries = []
+            for full, access in self._entries():
+                stat = os.stat(full)
+                accessed = os.path.getmtime(access) if os.path.exists(access) else stat.st_mtime
+                entries.append((accessed, stat.st_size, full, access))
+
+            total = sum(size for _, size, _, _ in entries)
+            for _, size, full, access in sorted(entries):
+                if total <= self.max_bytes * EVICT_TO:
+                    break
+                os.remove(full)
+                if os.path.exists(access):
+                    os.remove(access)
+                total -= size
+            self._total_bytes = total
+
+
+@lru_cache
+def get_image_cache() -> ImageCache:
+    settings = get_settings()
+    return ImageCache(os.path.join(settings.storage_path, "image_cache"), int(settings.image_cache_max_gb * 1024 ** 3))
@@ -0,0 +1,73 @@
+"""Incremental parsing of a JSON array of objects as model output streams in."""
+
+import re
+import json
+
+
+class JSONArrayStream:
+    """Feed text chunks; get back each top-level object of the first JSON array
+    as soon as its closing brace arrives.
+
+    Tolerates markdown fences and prose around the array, and trailing commas
+    inside objects. Objects that still fail to parse are skipped.
+    """
+
+    def __init__(self):
+        self._buffer = ""
+        self._pos = 0
+        self._depth = 0  # 1 inside the array, 2 inside one of its objects
+        self._in_string = False
+        self._escaped = False
+        self._object_start = -1
+        self.done = False
+
+    def feed(self, text: str) -> list:
+        self._buffer += text
+        objects = []
+
+        while self._pos < len(self._buffer) and not self.done:
+            char = self._buffer[self._pos]
+
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+            elif self._depth == 0:
+                if char == "[":
+                    self._depth = 1
+            elif char == '"':
+                self._in_string = True
+            elif char in "{[":
+                if self._depth == 1 and char == "{":
+                    self._object_start = self._pos
+                self._depth += 1
+            elif char in "}]":
+                self._depth -= 1
+                if self._depth == 1 and char == "}" and self._object_start >= 0:
+                    obj = self._parse(self._buffer[self._object_start:self._pos + 1])
+                    if obj is not None:
+                        objects.append(obj)
+                    self._object_start = -1
+                elif self._depth == 0:
+                    self.done = True
+
+            self._pos += 1
+
+        # Drop consumed text so long responses don't keep the whole buffer around
+        keep_from = self._object_start if self._object_start >= 0 else self._pos
+        self._buffer = self._buffer[keep_from:]
+        self._pos -= keep_from
+        if self._object_start >= 0:
+            self._object_start = 0
+        return objects
+
+    @staticmethod
+    def _parse(raw: str):
+        try:
+            obj = json.loads(re.sub(r",\s*}", "}", raw), strict=False)
+        except json.JSONDecodeError:
+            return None
+        return obj if isinstance(obj, dict) else None
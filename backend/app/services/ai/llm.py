@@ -0,0 +1,161 @@
+"""Async Gemini text client: concurrency limit, timeouts, retries and streaming."""
+
+import json
+import time
+import random
+import asyncio
+import hashlib
+from functools import lru_cache
+from typing import AsyncIterator, Optional
+import google.generativeai as genai
+from app.config import get_settings
+from app.services.query_cache import get_query_cache
+
+try:
+    from google.api_core import exceptions as api_exceptions
+    RETRYABLE_ERRORS = (
+        asyncio.TimeoutError,
+        api_exceptions.ResourceExhausted,
+        api_exceptions.ServiceUnavailable,
+        api_exceptions.InternalServerError,
+        api_exceptions.DeadlineExceeded,
+    )
+except ImportError:
+    RETRYABLE_ERRORS = (asyncio.TimeoutError,)
+
+TEXT_MODEL = "gemini-3-pro-preview"
+MAX_CONCURRENCY = 8
+REQUEST_TIMEOUT = 180.0
+MAX_ATTEMPTS = 3
+RETRY_BASE_DELAY = 2.0
+CACHE_NAMESPACE = "llm"
+MAX_CACHED_RESPONSE_CHARS = 200_000  # Larger responses aren't worth a Redis round trip
+
+
+class LLMClient:
+    def __init__(self, max_concurrency: int = MAX_CONCURRENCY, timeout: float = REQUEST_TIMEOUT, max_attempts: int = MAX_ATTEMPTS):
+        self.timeout = timeout
+        self.max_attempts = max_attempts
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self.cache_ttl = get_settings().llm_cache_ttl_hours * 3600
+        self._metrics = {"calls": 0, "errors": 0, "retries": 0, "cache_hits": 0, "total_seconds": 0.0, "prompt_tokens": 0, "output_tokens": 0}
+
+    def _record(self, label: str, elapsed: float, response=None):
+        self._metrics["calls"] += 1
+        self._metrics["total_seconds"] += elapsed
+        usage = getattr(response, "usage_metadata", None)
+        prompt_tokens = getattr(usage, "prompt_token_count", 0) or 0
+        output_tokens = getattr(usage, "candidates_token_count", 0) or 0
+        self._metrics["prompt_tokens"] += prompt_tokens
+        self._metrics["output_tokens"] += output_tokens
+        print(f"[LLM] {label}: {elapsed:.1f}s, {prompt_tokens} in / {output_tokens} out tokens")
+
+    async def _backoff(self, attempt: int, label: str, error: Exception):
+        self._metrics["retries"] += 1
+        delay = RETRY_BASE_DELAY * 2 ** (attempt - 1) * (0.5 + random.random())
+        print(f"[LLM] {label} attempt {attempt} failed ({type(error).__name__}: {error}), retrying in {delay:.1f}s")
+        await asyncio.sleep(delay)
+
+    @staticmethod
+    def cache_key(prompt: str, model: str) -> str:
+        # Whitespace-only differences (indentation, trailing spaces) shouldn't miss the cache
+        normalized = "\n".join(line.strip() for line in prompt.strip().splitlines())
+        payload = json.dumps({"model": model, "prompt": normalized}, sort_keys=True)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    async def generate(self, prompt: str, model: str = TEXT_MODEL, label: str = "generate", timeout: Optional[float] = None, use_cache: bool = False) -> str:
+        """Complete a prompt and return the response text.
+
+        With use_cache, identical prompts for the same model are answered from the
+        response cache for `llm_cache_ttl_hours`; only use it for prompts whose answer
+        may be reused (no randomness the caller relies on).
+        """
+        if not use_cache or self.cache_ttl <= 0:
+            return await self._generate(prompt, model, label, timeout)
+
+        generated = None
+
+        async def fetch():
+            nonlocal generated
+            generated = await self._generate(prompt, model, label, timeout)
+            # An empty value is not stored, so oversized responses simply aren't cached
+            return generated if len(generated) <= MAX_CACHED_RESPONSE_CHARS else ""
+
+        text = await get_query_cache().get_or_fetch(CACHE_NAMESPACE, self.cache_key(prompt, model), fetch, ttl=self.cache_ttl)
+        if generated is not None:
+            return generated
+        if not text:  # Shared an in-flight call whose response was too large to cache
+            return await self._generate(prompt, model, label, timeout)
+        self._metrics["cache_hits"] += 1
+        print(f"[LLM] {label}: cache hit")
+        return text
+
+    async def _generate(self, prompt: str, model: str, label: str, timeout: Optional[float]) -> str:
+        for attempt in range(1, self.max_attempts + 1):
+            started = time.monotonic()
+            try:
+                async with self._semaphore:
+                    response = await asyncio.wait_for(
+                        genai.GenerativeModel(model).generate_content_async(prompt),
+                        timeout or self.timeout,
+                    )
+                self._record(label, time.monotonic() - started, response)
+                return response.text
+            except RETRYABLE_ERRORS as e:
+                if attempt == self.max_attempts:
+                    self._metrics["errors"] += 1
+                    raise
+                await self._backoff(attempt, label, e)
+            except Exception:
+                self._metrics["errors"] += 1
+                raise
+
+    async def stream(self, prompt: str, model: str = TEXT_MODEL, label: str = "stream", timeout: Optional[float] = None) -> AsyncIterator[str]:
+        """Yield response text as it is generated. Only the initial request is retried."""
+        chunk_timeout = timeout or self.timeout
+        async with self._semaphore:
+            started = time.monotonic()
+            for attempt in range(1, self.max_attempts + 1):
+                try:
+                    response = await asyncio.wait_for(
+                        genai.GenerativeModel(model).generate_content_async(prompt, stream=True),
+                        chunk_timeout,
+                    )
+                    break
+                except RETRYABLE_ERRORS as e:
+                    if attempt == self.max_attempts:
+                        self._metrics["errors"] += 1
+                        raise
+                    await self._backoff(attempt, label, e)
+
+            chunks = response.__aiter__()
+            last = None
+            try:
+                while True:
+                    try:
+                        last = await asyncio.wait_for(chunks.__anext__(), chunk_timeout)
+                    except StopAsyncIteration:
+                        break
+                    try:
+                        text = last.text
+                    except ValueError:  # Chunk without text parts (e.g. only safety/usage data)
+                        text = ""
+                    if text:
+                        yield text
+            except Exception:
+                self._metrics["errors"] += 1
+                raise
+            finally:
+                self._record(label, time.monotonic() - started, last)
+
+    def metrics(self) -> dict:
+        calls = self._metrics["calls"]
+        return {**self._metrics, "avg_seconds": round(self._metrics["total_seconds"] / calls, 2) if calls else 0}
+
+
+@lru_cache
+def get_llm_client() -> LLMClient:
+    settings = get_settings()
+    if settings.gemini_api_key:
+        genai.configure(api_key=settings.gemini_api_key)
+    return LLMClient()
@@ -1,6 +1,7 @@
 import json
 import re
 from .base import BaseAIService
+from .json_stream import JSONArrayStream
 from .prompts import get_style_prompt
 
 
@@ -20,12 +21,11 @@ class ScriptService(BaseAIService):
         
         points_per_chunk = max(3, (target_segments // len(chunks)) + 1)
         
-        all_points = []
-        for i, chunk in enumerate(chunks):
+        def chunk_prompt(i: int, chunk: str) -> str:
             timestamps = re.findall(r'\[(\d+)s\]', chunk)
             time_range = f"{timestamps[0]}s-{timestamps[-1]}s" if timestamps else f"part {i+1}"
             
-            prompt = f"""From this transcript section, identify {points_per_chunk} key moments.
+            return f"""From this transcript section, identify {points_per_chunk} key moments.
 
 IMPORTANT: Use the EXACT [Xs] timestamps shown in the transcript.
 
@@ -37,9 +37,12 @@ Transcript section ({time_range}):
 {chunk}
 
 List the key moments with their [Xs] timestamps:"""
-            
-            points = await self._generate(prompt)
-            all_points.append(points)
+        
+        # Map step: chunks are independent, so they are summarized concurrently
+        all_points = await self._gather_bounded([
+            self._generate(chunk_prompt(i, chunk), label=f"key points {i + 1}/{len(chunks)}")
+            for i, chunk in enumerate(chunks)
+        ])
         
         return "\n\n".join(all_points)
     
@@ -97,6 +100,7 @@ Return ONLY the JSON array:"""
         num_batches = (total_segments + batch_size - 1) // batch_size
         time_per_batch = duration_seconds // num_batches
         
+        batch_prompts = []
         for batch in range(num_batches):
             start_time = batch * time_per_batch
             end_time = min((batch + 1) * time_per_batch, duration_seconds)
@@ -124,9 +128,15 @@ TRANSCRIPT SECTION:
 {batch_points[:4000]}
 
 Return ONLY JSON:"""
-            
-            result = await self._generate(prompt, max_tokens=8192)
-            
+            batch_prompts.append((prompt, segments_in_batch))
+        
+        # Each batch covers its own slice of key points, so they don't depend on each other
+        results = await self._gather_bounded([
+            self._generate(prompt, max_tokens=8192, label=f"script batch {i + 1}/{num_batches}")
+            for i, (prompt, _) in enumerate(batch_prompts)
+        ])
+        
+        for result, (_, segments_in_batch) in zip(results, batch_prompts):
             try:
                 json_match = re.search(r'\[[\s\S]*\]', result)
                 if json_match:
@@ -341,25 +351,13 @@ Return JSON array only:"""
         
         return {"script": result, "segments": []}
 
-    async def _generate_long_dialogue(self, prompt: str, duration_seconds: int, language: str, total_segments: int, video_style: str = "dialogue") -> dict:
-        all_segments = []
-        batch_size = 25
-        num_batches = (total_segments + batch_size - 1) // batch_size
-        
-        voice_map = {}
-        available_voices = ["aria", "roger", "sarah", "george", "lily", "charlie"]
-        voice_index = 0
+    def _long_dialogue_prompt(self, prompt: str, language: str, batch_num: int, num_batches: int, segments_in_batch: int, previous: list) -> str:
+        context = ""
+        if previous:
+            last_few = previous[-3:]
+            context = "CONTINUE from:\n" + "\n".join([f"{s['speaker']}: {s['text']}" for s in last_few])
         
-        for batch in range(num_batches):
-            segments_in_batch = batch_size if batch < num_batches - 1 else (total_segments - batch * batch_size)
-            batch_num = batch + 1
-            
-            context = ""
-            if all_segments:
-                last_few = all_segments[-3:]
-                context = "CONTINUE from:\n" + "\n".join([f"{s['speaker']}: {s['text']}" for s in last_few])
-            
-            ai_prompt = f"""Generate EDUCATIONAL DIALOGUE for a video (Part {batch_num}/{num_batches}):
+        return f"""Generate EDUCATIONAL DIALOGUE for a video (Part {batch_num}/{num_batches}):
 
 TOPIC: {prompt}
 LANGUAGE: {language}
@@ -377,6 +375,20 @@ OUTPUT: Return ONLY JSON array with {segments_in_batch} segments:
 [{{"speaker": "Nina", "text": "question here", "duration": 6}}, {{"speaker": "Leo", "text": "answer here", "duration": 8}}]
 
 Return ONLY valid JSON array:"""
+
+    async def _generate_long_dialogue(self, prompt: str, duration_seconds: int, language: str, total_segments: int, video_style: str = "dialogue") -> dict:
+        all_segments = []
+        batch_size = 25
+        num_batches = (total_segments + batch_size - 1) // batch_size
+        
+        voice_map = {}
+        available_voices = ["aria", "roger", "sarah", "george", "lily", "charlie"]
+        voice_index = 0
+        
+        for batch in range(num_batches):
+            segments_in_batch = batch_size if batch < num_batches - 1 else (total_segments - batch * batch_size)
+            batch_num = batch + 1
+            ai_prompt = self._long_dialogue_prompt(prompt, language, batch_num, num_batches, segments_in_batch, all_segments)
             
             result = await self._generate(ai_prompt, max_tokens=8192)
             
@@ -416,6 +428,55 @@ Return ONLY valid JSON array:"""
         script = "\n".join([s["display_text"] for s in all_segments])
         return {"script": script, "segments": all_segments}
 
+    async def stream_script_from_prompt(self, prompt: str, duration_seconds: int, language: str, num_segments: int, video_style: str = "dialogue"):
+        """Yield segments (shaped like generate_script_from_prompt's) as the model writes them."""
+        if num_segments > 30:
+            batch_size = 25
+            num_batches = (num_segments + batch_size - 1) // batch_size
+            batches = [(batch_size if b < num_batches - 1 else num_segments - b * batch_size, b + 1, num_batches) for b in range(num_batches)]
+            default_duration = 7
+        else:
+            batches = [(num_segments, 1, 1)]
+            default_duration = duration_seconds // max(num_segments, 1)
+        
+        voice_map = {}
+        available_voices = ["aria", "roger", "sarah", "george", "lily", "charlie"]
+        segments = []
+        current_time = 0
+        
+        for segments_in_batch, batch_num, num_batches in batches:
+            if num_batches > 1:
+                ai_prompt = self._long_dialogue_prompt(prompt, language, batch_num, num_batches, segments_in_batch, segments)
+            else:
+                ai_prompt = get_style_prompt(prompt, duration_seconds, num_segments, language, video_style)
+            
+            parser = JSONArrayStream()
+            batch_count = 0
+            async for text in self._stream(ai_prompt, label=f"script stream {batch_num}/{num_batches}"):
+                for s in parser.feed(text):
+                    if num_batches > 1 and batch_count >= segments_in_batch:
+                        continue
+                    speaker = s.get("speaker", "Narrator")
+                    text_value = s.get("text", "")
+                    dur = s.get("duration", default_duration)
+                    
+                    if speaker not in voice_map:
+                        voice_map[speaker] = available_voices[len(voice_map) % len(available_voices)]
+                    
+                    segment = {
+                        "text": text_value,
+                        "display_text": f"{speaker}: {text_value}" if speaker else text_value,
+                        "speaker": speaker,
+                        "start": current_time,
+                        "end": current_time + dur,
+                        "duration": dur,
+                        "voice_id": voice_map.get(speaker, "aria")
+                    }
+                    current_time += dur
+                    batch_count += 1
+                    segments.append(segment)
+                    yield segment
+
     async def reassign_media_to_segments(self, segments: list, media_list: list) -> list:
         seg_info = []
         for i, s in enumerate(segments):
@@ -3,7 +3,7 @@ import re
 from pathlib import Path
 from PIL import Image
 import io
-import httpx
+from app.services.http import shared_client
 from .base import BaseAIService
 
 
@@ -30,7 +30,7 @@ class ThumbnailService(BaseAIService):
     }
 
     async def generate_thumbnail_prompt(self, script: str, title: str, language: str = "English", 
-                                        image_style: str = "cartoon", video_type: str = "tutorial") -> dict:
+                                        image_style: str = "cartoon", video_type: str = "tutorial", use_cache: bool = True) -> dict:
         lang_note = f"Script is in {language}. Character names may be in {language}." if language != "English" else ""
         style_desc = self.STYLE_MAP.get(image_style, self.STYLE_MAP["cartoon"])
         type_desc = self.VIDEO_TYPE_MAP.get(video_type, self.VIDEO_TYPE_MAP["tutorial"])
@@ -80,7 +80,7 @@ BAD examples (too complex):
 OUTPUT JSON only:
 {{"title": "SHORT TITLE", "image": "simple, minimal thumbnail description"}}"""
         
-        result = await self._generate(prompt)
+        result = await self._generate(prompt, label="thumbnail_prompt", use_cache=use_cache)
         
         parsed_title = ""
         parsed_image = ""
@@ -158,7 +158,7 @@ DO NOT add extra elements, complex backgrounds, or clutter."""
         model_name = model_map.get(model, "gemini-2.5-flash-image")
         
         client = google_genai.Client(api_key=self.settings.gemini_api_key)
-        response = client.models.generate_content(
+        response = await client.aio.models.generate_content(
             model=model_name,
             contents=prompt,
             config=types.GenerateContentConfig(response_modalities=["IMAGE"])
@@ -177,7 +177,7 @@ DO NOT add extra elements, complex backgrounds, or clutter."""
         dalle_sizes = {"1792x1024": "1792x1024", "1024x1792": "1024x1792", "1024x1024": "1024x1024"}
         dalle_size = dalle_sizes.get(size, "1792x1024")
         
-        response = self.openai.images.generate(
+        response = await self.openai_async.images.generate(
             model="dall-e-3",
             prompt=prompt,
             size=dalle_size,
@@ -186,7 +186,7 @@ DO NOT add extra elements, complex backgrounds, or clutter."""
         )
         
         image_url = response.data[0].url
-        async with httpx.AsyncClient() as client:
+        async with shared_client("openai_images") as client:
             img_response = await client.get(image_url)
             return img_response.content
 
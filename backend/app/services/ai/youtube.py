@@ -4,7 +4,7 @@ from .base import BaseAIService
 
 
 class YouTubeService(BaseAIService):
-    async def generate_youtube_info(self, title: str, script: str, language: str = "English") -> dict:
+    async def generate_youtube_info(self, title: str, script: str, language: str = "English", use_cache: bool = True) -> dict:
         prompt = f"""Generate YouTube video metadata for this video.
 
 IMPORTANT: ALL OUTPUT MUST BE IN {language.upper()} LANGUAGE.
@@ -30,7 +30,7 @@ OUTPUT FORMAT (JSON):
 
 Return ONLY the JSON. Everything MUST be in {language}."""
         
-        result = await self._generate(prompt)
+        result = await self._generate(prompt, label="youtube_info", use_cache=use_cache)
         
         try:
             json_match = re.search(r'\{[\s\S]*\}', result)
@@ -46,16 +46,29 @@ Return ONLY the JSON. Everything MUST be in {language}."""
             "tags": "shorts, viral, trending"
         }
 
-    async def summarize(self, transcript_text: str, style: str = "detailed") -> dict:
+    async def summarize(self, transcript_text: str, style: str = "detailed", use_cache: bool = True, sections: list = None) -> dict:
+        """Summarise the transcript; with several `sections`, each is condensed to notes
+        first and the summary is written from those notes."""
+        if sections and len(sections) > 1:
+            notes = await self._gather_bounded([
+                self._generate(
+                    f"Write concise notes (key points, facts, names, numbers) for this part of a video transcript, keeping the timestamps of important moments:\n\n{section}",
+                    label=f"summary section {i + 1}/{len(sections)}",
+                    use_cache=use_cache,
+                )
+                for i, section in enumerate(sections)
+            ])
+            transcript_text = "\n\n".join(f"Part {i + 1}:\n{note}" for i, note in enumerate(notes))
+        
         prompts = {
             "short": f"Create a 30-second summary script. Be concise:\n\n{transcript_text}",
             "detailed": f"Create a 2-3 minute educational summary script with key points:\n\n{transcript_text}",
             "bullets": f"Summarize in bullet points:\n\n{transcript_text}"
         }
-        result = await self._generate(prompts.get(style, prompts["detailed"]))
+        result = await self._generate(prompts.get(style, prompts["detailed"]), label="summarize", use_cache=use_cache)
         return {"summary": result, "style": style}
     
-    async def ask(self, transcript_text: str, question: str) -> str:
+    async def ask(self, transcript_text: str, question: str, use_cache: bool = True) -> str:
         prompt = f"Based on this transcript, answer: {question}\n\nTranscript:\n{transcript_text}"
-        return await self._generate(prompt)
+        return await self._generate(prompt, label="ask", use_cache=use_cache)
 
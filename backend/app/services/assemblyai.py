@@ -1,7 +1,8 @@
-import httpx
-import asyncio
 from typing import Optional
 from app.config import get_settings
+from app.services.http import shared_client
+
+WEBHOOK_AUTH_HEADER = "X-Webhook-Secret"
 
 class AssemblyAIService:
     BASE_URL = "https://api.assemblyai.com/v2"
@@ -11,41 +12,43 @@ class AssemblyAIService:
         self.api_key = settings.assemblyai_api_key
         self.headers = {"authorization": self.api_key}
     
-    async def transcribe_from_url(self, audio_url: str, speaker_labels: bool = True) -> dict:
-        """Transcribe audio/video from URL with speaker diarization"""
-        async with httpx.AsyncClient(timeout=300) as client:
-            # Submit transcription job
-            response = await client.post(
-                f"{self.BASE_URL}/transcript",
-                headers=self.headers,
-                json={
-                    "audio_url": audio_url,
-                    "speaker_labels": speaker_labels,
-                    "auto_chapters": True,
-                    "entity_detection": True,
-                    "sentiment_analysis": True,
-                    "auto_highlights": True,
-                    "punctuate": True,
-                    "format_text": True
-                }
-            )
+    async def submit_transcription(self, audio_url: str, speaker_labels: bool = True, webhook_url: Optional[str] = None, webhook_secret: Optional[str] = None) -> str:
+        """Submit a transcription job and return its AssemblyAI id"""
+        payload = {
+            "audio_url": audio_url,
+            "speaker_labels": speaker_labels,
+            "auto_chapters": True,
+            "entity_detection": True,
+            "sentiment_analysis": True,
+            "auto_highlights": True,
+            "punctuate": True,
+            "format_text": True
+        }
+        if webhook_url:
+            payload["webhook_url"] = webhook_url
+            if webhook_secret:
+                payload["webhook_auth_header_name"] = WEBHOOK_AUTH_HEADER
+                payload["webhook_auth_header_value"] = webhook_secret
+        
+        async with shared_client("assemblyai") as client:
+            response = await client.post(f"{self.BASE_URL}/transcript", headers=self.headers, json=payload)
             result = response.json()
-            transcript_id = result["id"]
-            
-            # Poll for completion
-            while True:
-                response = await client.get(
-                    f"{self.BASE_URL}/transcript/{transcript_id}",
-                    headers=self.headers
-                )
-                result = response.json()
-                
-                if result["status"] == "completed":
-                    return self._format_transcript(result)
-                elif result["status"] == "error":
-                    raise Exception(f"Transcription failed: {result.get('error', 'Unknown error')}")
-                
-                await asyncio.sleep(3)
+            if response.status_code >= 400 or "id" not in result:
+                raise Exception(f"Transcription submit failed: {result.get('error', response.status_code)}")
+            return result["id"]
+    
+    async def get_transcription(self, transcript_id: str) -> dict:
+        """Current job state: {"status": queued|processing|completed|error, "transcription", "error"}"""
+        async with shared_client("assemblyai") as client:
+            response = await client.get(f"{self.BASE_URL}/transcript/{transcript_id}", headers=self.headers)
+            result = response.json()
+        
+        status = result.get("status", "error")
+        return {
+            "status": status,
+            "transcription": self._format_transcript(result) if status == "completed" else None,
+            "error": result.get("error", "Unknown error") if status == "error" else None,
+        }
     
     def _format_transcript(self, result: dict) -> dict:
         """Format AssemblyAI response into structured data"""
@@ -0,0 +1,96 @@
+"""Resized previews of media assets: image thumbnails and video poster frames."""
+
+import io
+import os
+import shutil
+import asyncio
+import threading
+import subprocess
+from PIL import Image
+
+SIZES = {"thumb": 320, "medium": 960}  # Longest edge in pixels
+FORMATS = {"webp": ("WEBP", "image/webp"), "jpeg": ("JPEG", "image/jpeg")}
+DEFAULT_FORMAT = "webp"
+QUALITY = 80
+POSTER_AT = 1.0  # Seconds into the video for the poster frame
+
+
+def _derivative_dir(source_path: str) -> str:
+    return os.path.join(os.path.dirname(source_path), ".derivatives")
+
+
+def derivative_path(source_path: str, size: str, fmt: str = DEFAULT_FORMAT) -> str:
+    stem = os.path.splitext(os.path.basename(source_path))[0]
+    ext = "jpg" if fmt == "jpeg" else fmt
+    return os.path.join(_derivative_dir(source_path), f"{stem}.{size}.{ext}")
+
+
+def _load_source(source_path: str, media_type: str) -> Image.Image:
+    if media_type != "video":
+        return Image.open(source_path)
+
+    for seek in (POSTER_AT, 0):
+        result = subprocess.run(
+            ["ffmpeg", "-v", "error", "-ss", str(seek), "-i", source_path, "-frames:v", "1", "-f", "image2pipe", "-vcodec", "png", "-"],
+            capture_output=True
+        )
+        if result.returncode == 0 and result.stdout:
+            return Image.open(io.BytesIO(result.stdout))
+    raise Exception(f"Could not extract poster frame from {source_path}")
+
+
+def generate(source_path: str, media_type: str, sizes: list = None, fmt: str = DEFAULT_FORMAT) -> list:
+    """Write derivatives for the given sizes (all by default); returns the written paths."""
+    pil_format, _ = FORMATS[fmt]
+    os.makedirs(_derivative_dir(source_path), exist_ok=True)
+    written = []
+
+    with _load_source(source_path, media_type) as source:
+        source.load()
+        for size in sizes or list(SIZES):
+            img = source.copy()
+            img.thumbnail((SIZES[size], SIZES[size]), Image.LANCZOS)
+            if pil_format == "JPEG" and img.mode != "RGB":
+                img = img.convert("RGB")
+            elif img.mode not in ("RGB", "RGBA"):
+                img = img.convert("RGBA")
+
+            path = derivative_path(source_path, size, fmt)
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            img.save(tmp_path, pil_format, quality=QUALITY)
+            os.replace(tmp_path, path)
+            written.append(path)
+    return written
+
+
+def get_derivative(source_path: str, media_type: str, size: str, fmt: str = DEFAULT_FORMAT) -> str:
+    """Path of an up-to-date derivative, generating it lazily if missing or stale."""
+    path = derivative_path(source_path, size, fmt)
+    if not os.path.exists(path) or os.path.getmtime(path) < os.path.getmtime(source_path):
+        generate(source_path, media_type, [size], fmt)
+    return path
+
+
+def remove_derivatives(source_path: str):
+    for size in SIZES:
+        for fmt in FORMATS:
+            path = derivative_path(source_path, size, fmt)
+            if os.path.exists(path):
+                os.remove(path)
+    derivative_dir = _derivative_dir(source_path)
+    if os.path.isdir(derivative_dir) and not os.listdir(derivative_dir):
+        shutil.rmtree(derivative_dir, ignore_errors=True)
+
+
+def _generate_quietly(source_path: str, media_type: str):
+    try:
+        generate(source_path, media_type)
+    except Exception as e:
+        print(f"[DERIVATIVES] Failed for {source_path}: {e}")
+
+
+def schedule_derivatives(source_path: str, media_type: str):
+    """Generate the default derivatives in a worker thread without waiting for them."""
+    if not source_path or not os.path.exists(source_path):
+        return
+    asyncio.get_running_loop().run_in_executor(None, _generate_quietly, source_path, media_type)
@@ -0,0 +1,165 @@
+"""Application-scoped pooled httpx clients, one per upstream service.
+
+Connection limits apply per profile; each profile talks to a single upstream
+host, which is what makes them effectively per-host limits.
+"""
+
+import time
+from contextlib import asynccontextmanager
+from functools import lru_cache
+import httpx
+
+try:
+    import h2  # noqa: F401 - enables HTTP/2 in httpx when installed (httpx[http2])
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# Each profile gets its own pool, so limits act per upstream host
+CLIENT_PROFILES = {
+    "default": {"timeout": 30.0, "max_connections": 20},
+    "assemblyai": {"timeout": 300.0, "max_connections": 10},
+    "wikipedia": {"timeout": 60.0, "max_connections": 20, "headers": {"User-Agent": "GoInsights/1.0"}},
+    "commons_media": {
+        "timeout": 60.0,
+        "max_connections": 10,
+        "follow_redirects": True,
+        "headers": {
+            "User-Agent": "GoInsights/1.0 (https://goinsights.app; video generation tool) Python/httpx",
+            "Referer": "https://commons.wikimedia.org/",
+            "Accept": "image/webp,image/apng,image/*,*/*;q=0.8",
+        },
+    },
+    "pexels": {"timeout": 60.0, "max_connections": 10, "follow_redirects": True},
+    "openai_images": {"timeout": 60.0, "max_connections": 10},
+    "google": {"timeout": 30.0, "max_connections": 10},
+    "google_upload": {"timeout": 600.0, "max_connections": 4},
+    "youtube_subtitles": {"timeout": 30.0, "max_connections": 8},
+}
+KEEPALIVE_EXPIRY = 30.0
+CONNECT_TIMEOUT = 10.0
+
+
+class MeteredStream(httpx.AsyncByteStream):
+    """Response body wrapper that reports back once the body is closed, so streamed
+    downloads stay counted as in flight until they are fully read or abandoned."""
+
+    def __init__(self, stream: httpx.AsyncByteStream, stats: dict, started: float):
+        self._stream = stream
+        self._stats = stats
+        self._started = started
+        self._closed = False
+
+    async def __aiter__(self):
+        try:
+            async for chunk in self._stream:
+                yield chunk
+        except Exception:
+            self._stats["transport_errors"] += 1
+            raise
+
+    async def aclose(self):
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            await self._stream.aclose()
+        finally:
+            self._stats["in_flight"] -= 1
+            self._stats["completed"] += 1
+            self._stats["total_seconds"] += time.monotonic() - self._started
+
+
+class MeteredTransport(httpx.AsyncBaseTransport):
+    """Wraps the pooled transport so every send is counted, including ones that raise."""
+
+    def __init__(self, transport: httpx.AsyncHTTPTransport, stats: dict):
+        self.transport = transport
+        self.stats = stats
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        stats = self.stats
+        started = time.monotonic()
+        stats["requests"] += 1
+        stats["in_flight"] += 1
+        stats["peak_in_flight"] = max(stats["peak_in_flight"], stats["in_flight"])
+        try:
+            response = await self.transport.handle_async_request(request)
+        except BaseException as e:
+            if isinstance(e, Exception):
+                stats["transport_errors"] += 1
+            stats["in_flight"] -= 1
+            raise
+        stats["responses"] += 1
+        if response.status_code >= 400:
+            stats["errors"] += 1
+        response.stream = MeteredStream(response.stream, stats, started)
+        return response
+
+    async def aclose(self):
+        await self.transport.aclose()
+
+
+class HttpClients:
+    """Lazily creates one AsyncClient per profile and keeps simple usage metrics."""
+
+    def __init__(self):
+        self._clients: dict[str, httpx.AsyncClient] = {}
+        self._stats: dict[str, dict] = {}
+
+    def get(self, name: str = "default") -> httpx.AsyncClient:
+        client = self._clients.get(name)
+        if client is None or client.is_closed:
+            profile = CLIENT_PROFILES.get(name, CLIENT_PROFILES["default"])
+            max_connections = profile["max_connections"]
+            stats = self._stats.setdefault(name, {"requests": 0, "responses": 0, "errors": 0, "transport_errors": 0, "in_flight": 0, "peak_in_flight": 0, "completed": 0, "total_seconds": 0.0})
+            transport = MeteredTransport(httpx.AsyncHTTPTransport(
+                limits=httpx.Limits(
+                    max_connections=max_connections,
+                    max_keepalive_connections=max_connections,
+                    keepalive_expiry=KEEPALIVE_EXPIRY,
+                ),
+                http2=HTTP2_AVAILABLE,
+            ), stats)
+            client = httpx.AsyncClient(
+                timeout=httpx.Timeout(profile["timeout"], connect=CONNECT_TIMEOUT),
+                headers=profile.get("headers"),
+                follow_redirects=profile.get("follow_redirects", False),
+                transport=transport,
+            )
+            self._clients[name] = client
+        return client
+
+    def metrics(self) -> dict:
+        result = {}
+        for name, stats in self._stats.items():
+            client = self._clients.get(name)
+            max_connections = CLIENT_PROFILES.get(name, CLIENT_PROFILES["default"])["max_connections"]
+            result[name] = {
+                **stats,
+                "avg_seconds": round(stats["total_seconds"] / stats["completed"], 3) if stats["completed"] else 0,
+                "max_connections": max_connections,
+                "utilization": round(stats["in_flight"] / max_connections, 2),
+                "closed": client.is_closed if client else True,
+            }
+        return {"http2": HTTP2_AVAILABLE, "clients": result}
+
+    async def close(self):
+        for client in self._clients.values():
+            await client.aclose()
+        self._clients.clear()
+
+
+@lru_cache
+def get_http_clients() -> HttpClients:
+    return HttpClients()
+
+
+def get_http_client(name: str = "default") -> httpx.AsyncClient:
+    return get_http_clients().get(name)
+
+
+@asynccontextmanager
+async def shared_client(name: str = "default"):
+    """Drop-in for `async with httpx.AsyncClient() as client` that reuses the pooled client."""
+    yield get_http_client(name)
@@ -1,15 +1,33 @@
-import google.generativeai as genai
-from app.config import get_settings
+from app.services.ai.llm import get_llm_client
+from app.services.video.boundaries import load_boundary_index, snap_range
+from .highlights import local_highlights
 import json
+import asyncio
 
-settings = get_settings()
-genai.configure(api_key=settings.gemini_api_key)
+HYBRID_CANDIDATES = 10
+ANALYSIS_MODES = ("ai", "local", "hybrid")
 
 
-async def analyze_for_shorts(transcript: list, duration: int, min_duration: int = 15, max_duration: int = 90) -> list:
+async def analyze_for_shorts(transcript: list, duration: int, min_duration: int = 15, max_duration: int = 90, use_cache: bool = True, mode: str = "ai", source_path: str = None) -> list:
+    """Suggest short-form segments.
+    
+    mode "ai" asks the model over the whole transcript, "local" ranks windows with the
+    heuristic scorer only, and "hybrid" lets the model choose among the local top
+    candidates. When `source_path` exists its media features are used and segment
+    edges are snapped to scene cuts and pauses.
+    """
     if not transcript:
         return generate_default_segments(duration, min_duration, max_duration)
     
+    if mode in ("local", "hybrid"):
+        # The scorer reads scene cuts from the full index, so build it once for both
+        boundaries = await asyncio.to_thread(load_boundary_index, source_path)
+        count = 5 if mode == "local" else HYBRID_CANDIDATES
+        candidates = await asyncio.to_thread(local_highlights, transcript, duration, min_duration, max_duration, count, source_path)
+        if mode == "local" or not candidates:
+            return validate_segments(candidates, duration, min_duration, max_duration, boundaries) or generate_default_segments(duration, min_duration, max_duration)
+        return await _pick_from_candidates(candidates, duration, min_duration, max_duration, use_cache, boundaries)
+    
     transcript_text = format_transcript(transcript)
     
     prompt = f"""Analyze this video transcript and identify the BEST segments for short-form content (YouTube Shorts, Reels, TikTok).
@@ -36,20 +54,79 @@ Return JSON array:
 Only return the JSON array, no other text."""
 
     try:
-        model = genai.GenerativeModel("gemini-1.5-flash")
-        response = model.generate_content(prompt)
-        text = response.text.strip()
+        text = (await get_llm_client().generate(prompt, model="gemini-1.5-flash", label="analyze_for_shorts", use_cache=use_cache)).strip()
         
         if text.startswith("```"):
             text = text.split("```")[1]
             if text.startswith("json"):
                 text = text[4:]
         
-        segments = json.loads(text)
+        segments = await snap_segments(json.loads(text)[:5], duration, source_path)
         return validate_segments(segments, duration, min_duration, max_duration)
     except Exception as e:
         print(f"AI analysis failed: {e}")
-        return generate_default_segments(duration, min_duration, max_duration)
+        return await _local_fallback(transcript, duration, min_duration, max_duration, source_path)
+
+
+async def snap_segments(segments: list, duration: float, source_path: str = None) -> list:
+    """Segments with edges snapped via snap_range: an existing boundary index when the
+    source was already analysed, otherwise a short decode window around each cut."""
+    if not source_path:
+        return segments
+    
+    async def snap(seg: dict) -> dict:
+        start = max(0, float(seg.get("start", 0)))
+        end = min(duration, float(seg.get("end", start + 60)))
+        start, end = await asyncio.to_thread(snap_range, source_path, start, end)
+        return {**seg, "start": max(0, start), "end": min(duration, end)}
+    
+    return list(await asyncio.gather(*(snap(seg) for seg in segments)))
+
+
+async def _pick_from_candidates(candidates: list, duration: int, min_duration: int, max_duration: int, use_cache: bool, boundaries=None) -> list:
+    listing = "\n\n".join(
+        f"Candidate {i + 1} [{c['start']:.0f}s - {c['end']:.0f}s] (local score {c['score']}, {c['reason']}):\n{c['transcript'][:600]}"
+        for i, c in enumerate(candidates)
+    )
+    prompt = f"""These are pre-selected candidate segments from a video for short-form content (YouTube Shorts, Reels, TikTok).
+
+Video Duration: {duration} seconds
+Target Segment Length: {min_duration}-{max_duration} seconds
+
+{listing}
+
+Pick the 3-5 most viral-worthy candidates. You may move a start or end by up to 10 seconds to land on a strong hook or a clean ending.
+
+Return JSON array:
+[
+  {{"start": 0, "end": 45, "score": 95, "reason": "Hook with surprising fact", "transcript": "First 10 words..."}},
+  ...
+]
+
+Only return the JSON array, no other text."""
+
+    try:
+        text = (await get_llm_client().generate(prompt, model="gemini-1.5-flash", label="analyze_for_shorts hybrid", use_cache=use_cache)).strip()
+        
+        if text.startswith("```"):
+            text = text.split("```")[1]
+            if text.startswith("json"):
+                text = text[4:]
+        
+        return validate_segments(json.loads(text), duration, min_duration, max_duration, boundaries)
+    except Exception as e:
+        print(f"Hybrid analysis failed, using local ranking: {e}")
+        return validate_segments(candidates[:5], duration, min_duration, max_duration, boundaries)
+
+
+async def _local_fallback(transcript: list, duration: int, min_duration: int, max_duration: int, source_path: str = None) -> list:
+    try:
+        segments = await asyncio.to_thread(local_highlights, transcript, duration, min_duration, max_duration, 5, source_path)
+    except Exception as e:
+        print(f"Local analysis failed: {e}")
+        segments = []
+    segments = await snap_segments(segments, duration, source_path)
+    return validate_segments(segments, duration, min_duration, max_duration) or generate_default_segments(duration, min_duration, max_duration)
 
 
 def format_transcript(transcript: list) -> str:
@@ -63,11 +140,14 @@ def format_transcript(transcript: list) -> str:
     return "\n".join(lines)
 
 
-def validate_segments(segments: list, duration: int, min_dur: int, max_dur: int) -> list:
+def validate_segments(segments: list, duration: int, min_dur: int, max_dur: int, boundaries=None) -> list:
     valid = []
     for seg in segments:
         start = max(0, float(seg.get("start", 0)))
         end = min(duration, float(seg.get("end", start + 60)))
+        if boundaries:
+            start, end = boundaries.snap(start, end)
+            start, end = max(0, start), min(duration, end)
         seg_duration = end - start
         
         if seg_duration < min_dur:
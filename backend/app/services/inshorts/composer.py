@@ -1,9 +1,16 @@
 import subprocess
 import os
 from pathlib import Path
+from app.services.source_cache import get_source_cache
+from app.services.transcript import TranscriptService
+from app.services.video.boundaries import snap_range, EXTRACT_SNAP_SHIFT
 from .processor import extract_segment, apply_effects, ASPECT_RATIOS
 
 STORAGE_PATH = Path("./storage")
+SOURCE_FORMAT = "bestvideo[height<=720][ext=mp4]+bestaudio[ext=m4a]/best[height<=720][ext=mp4]/best"
+SECTION_PADDING = 5.0  # Seconds fetched either side of a range so later trims still fit
+PARTIAL_BATCH_LIMIT = 3  # Beyond this many shorts one full download is cheaper than many sections
+SECTION_SIDECARS = (".boundaries.json", ".keyframes.json", ".highlights.json")
 
 
 def generate_inshort(project_id: str, youtube_url: str, start: float, end: float, 
@@ -11,21 +18,18 @@ def generate_inshort(project_id: str, youtube_url: str, start: float, end: float
     project_dir = STORAGE_PATH / project_id
     project_dir.mkdir(parents=True, exist_ok=True)
     
-    source_video = project_dir / "source.mp4"
     segment_video = project_dir / "segment.mp4"
     effects_video = project_dir / "effects.mp4"
     final_video = project_dir / "short.mp4"
     
+    source = None
     try:
         print(f"[INSHORTS] Starting generation for {project_id}")
-        if not source_video.exists():
-            print(f"[INSHORTS] Downloading video from {youtube_url}")
-            download_video(youtube_url, str(source_video))
-        else:
-            print(f"[INSHORTS] Using existing source video")
+        source, offset = prepare_source(project_dir, youtube_url, start, end, options.get("partialDownload", True))
+        start, end = snap_to_boundaries(source, start, end, offset)
         
         print(f"[INSHORTS] Extracting segment {start}-{end}s")
-        extract_segment(str(source_video), str(segment_video), start, end, options.get("keepAudio", True))
+        extract_segment(str(source), str(segment_video), start - offset, end - offset, options.get("keepAudio", True), options.get("smartCut", False))
         
         print(f"[INSHORTS] Applying effects: {effects}")
         apply_effects(str(segment_video), str(effects_video), effects, options.get("aspectRatio", "9:16"), options.get("antiCopyright", True))
@@ -51,18 +55,93 @@ def generate_inshort(project_id: str, youtube_url: str, start: float, end: float
         import traceback
         traceback.print_exc()
         update_project_status_sync(project_id, "failed")
+    finally:
+        remove_section(source)
+
+
+def remove_section(source: Path):
+    """Delete a downloaded section and its analysis sidecars; full source.mp4 files are kept."""
+    if not source or not source.name.startswith("section_"):
+        return
+    root = source.with_suffix("")
+    for path in [source] + [Path(f"{root}{suffix}") for suffix in SECTION_SIDECARS]:
+        if path.exists():
+            try:
+                os.remove(path)
+            except OSError as e:
+                print(f"[INSHORTS] Could not remove {path}: {e}")
+
+
+def snap_to_boundaries(source: Path, start: float, end: float, offset: float) -> tuple[float, float]:
+    """Move start/end (source time) onto nearby scene cuts or pauses in the local file."""
+    snapped_start, snapped_end = snap_range(str(source), start - offset, end - offset, EXTRACT_SNAP_SHIFT)
+    if (snapped_start, snapped_end) != (start - offset, end - offset):
+        print(f"[INSHORTS] Snapped {start:.1f}-{end:.1f}s to {snapped_start + offset:.1f}-{snapped_end + offset:.1f}s")
+    return snapped_start + offset, snapped_end + offset
+
+
+def prepare_source(project_dir: Path, youtube_url: str, start: float, end: float, partial: bool = True) -> tuple[Path, float]:
+    """Return a local file covering start..end and the source time its timeline starts at."""
+    source_video = project_dir / "source.mp4"
+    if source_video.exists():
+        print(f"[INSHORTS] Using existing source video")
+        return source_video, 0.0
+    
+    if partial:
+        section_start = max(0.0, start - SECTION_PADDING)
+        section_end = end + SECTION_PADDING
+        section_video = project_dir / f"section_{int(section_start * 1000)}_{int(section_end * 1000)}.mp4"
+        if section_video.exists():
+            return section_video, section_start
+        try:
+            print(f"[INSHORTS] Downloading section {section_start:.1f}-{section_end:.1f}s from {youtube_url}")
+            download_section(youtube_url, str(section_video), section_start, section_end)
+            return section_video, section_start
+        except Exception as e:
+            print(f"[INSHORTS] Section download failed, falling back to full video: {e}")
+    
+    print(f"[INSHORTS] Downloading video from {youtube_url}")
+    download_video(youtube_url, str(source_video))
+    return source_video, 0.0
+
+
+def download_section(url: str, output_path: str, start: float, end: float):
+    # Forcing keyframes at the cuts keeps the file's t=0 exactly at `start`
+    cmd = [
+        "yt-dlp",
+        "--cookies", "www.youtube.com_cookies.txt",
+        "-f", SOURCE_FORMAT,
+        "--merge-output-format", "mp4",
+        "--download-sections", f"*{start:.2f}-{end:.2f}",
+        "--force-keyframes-at-cuts",
+        "-o", output_path,
+        url
+    ]
+    result = subprocess.run(cmd, capture_output=True, text=True)
+    if result.returncode != 0 or not os.path.exists(output_path):
+        if os.path.exists(output_path):
+            os.remove(output_path)
+        raise Exception(f"Section download failed: {result.stderr[:500]}")
 
 
 def download_video(url: str, output_path: str):
+    try:
+        video_id = TranscriptService().extract_video_id(url)
+    except ValueError:
+        return _download_video(url, output_path)
+    get_source_cache().fetch(video_id, SOURCE_FORMAT, output_path, lambda path: _download_video(url, path))
+
+
+def _download_video(url: str, output_path: str):
     cmd = [
         "yt-dlp",
         "--cookies", "www.youtube.com_cookies.txt",
-        "-f", "bestvideo[height<=720][ext=mp4]+bestaudio[ext=m4a]/best[height<=720][ext=mp4]/best",
+        "-f", SOURCE_FORMAT,
         "--merge-output-format", "mp4",
         "-o", output_path,
         url
     ]
-    result = subprocess.run(cmd, capture_output=True, text=True, cwd="/Users/alomgir/workspace/goinsights/backend")
+    result = subprocess.run(cmd, capture_output=True, text=True)
     if result.returncode != 0:
         raise Exception(f"Download failed: {result.stderr[:500]}")
 
@@ -248,9 +327,10 @@ def generate_batch(project_id: str, youtube_url: str, shorts: list, default_effe
     project_dir.mkdir(parents=True, exist_ok=True)
     
     source_path = project_dir / "source.mp4"
+    partial = options.get("partialDownload", True) and len(shorts) <= PARTIAL_BATCH_LIMIT
     
     try:
-        if not source_path.exists():
+        if not partial and not source_path.exists():
             download_video(youtube_url, str(source_path))
         
         for short in shorts:
@@ -258,12 +338,15 @@ def generate_batch(project_id: str, youtube_url: str, shorts: list, default_effe
             print(f"[BATCH] Processing short {short_id}")
             update_batch_status(project_id, short_id, "processing")
             
+            source = None
             try:
                 segment_path = project_dir / f"segment_{short_id}.mp4"
                 effects_path = project_dir / f"effects_{short_id}.mp4"
                 final_path = project_dir / f"short_{short_id}.mp4"
                 
-                extract_segment(str(source_path), str(segment_path), short["start"], short["end"], options.get("keepAudio", True))
+                source, offset = prepare_source(project_dir, youtube_url, short["start"], short["end"], partial)
+                start, end = snap_to_boundaries(source, short["start"], short["end"], offset)
+                extract_segment(str(source), str(segment_path), start - offset, end - offset, options.get("keepAudio", True), options.get("smartCut", False))
                 
                 effects = {**default_effects, **short.get("effects", {})}
                 apply_effects(str(segment_path), str(effects_path), effects, options.get("aspectRatio", "9:16"), options.get("antiCopyright", True))
@@ -279,6 +362,8 @@ def generate_batch(project_id: str, youtube_url: str, shorts: list, default_effe
             except Exception as e:
                 print(f"[BATCH] Short {short_id} failed: {e}")
                 update_batch_status(project_id, short_id, "failed")
+            finally:
+                remove_section(source)
         
         update_project_status_sync(project_id, "completed")
         print(f"[BATCH] Batch generation completed for {project_id}")
@@ -0,0 +1,234 @@
+"""Local highlight scoring: rank candidate short windows without an LLM.
+
+Per-second features from the transcript (speech rate, topic keywords,
+question/exclamation marks) and, when the source video is on disk, from the
+media itself (momentary loudness via ebur128, scene cuts from the boundary
+index) are z-scored and combined into one score curve. Every window between
+min and max duration that starts on a transcript line is ranked with a
+cumulative sum, and overlapping windows are suppressed.
+"""
+
+import os
+import re
+import json
+import math
+import subprocess
+import threading
+from collections import Counter
+from typing import Optional
+import numpy as np
+from app.services.video.boundaries import get_boundary_index
+
+FEATURE_WEIGHTS = {"speech_rate": 1.0, "keywords": 1.2, "punctuation": 0.8, "loudness": 1.0, "scene_cuts": 0.6}
+FEATURE_REASONS = {
+    "speech_rate": "Fast-paced, dense speech",
+    "keywords": "Covers the video's key topics",
+    "punctuation": "Questions and exclamations",
+    "loudness": "Loud, energetic moment",
+    "scene_cuts": "Fast visual cuts",
+}
+SILENCE_PENALTY = 1.0
+SMOOTH_SECONDS = 5
+LENGTH_STEP = 5  # Candidate window lengths are tried in steps of this many seconds
+LENGTH_BONUS = 0.15  # Mild preference for longer windows at equal density
+MAX_OVERLAP = 0.3  # Fraction of the shorter window two picks may share
+KEYWORD_COUNT = 20
+HOOK_WORDS = {
+    "secret", "never", "always", "best", "worst", "why", "how", "mistake", "truth", "amazing",
+    "shocking", "incredible", "important", "actually", "finally", "first", "biggest", "crazy",
+}
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+_features_cache = {}
+_features_lock = threading.Lock()
+
+
+def _features_path(video_path: str) -> str:
+    root, _ = os.path.splitext(video_path)
+    return f"{root}.highlights.json"
+
+
+def _file_signature(video_path: str) -> list:
+    stat = os.stat(video_path)
+    return [stat.st_size, int(stat.st_mtime)]
+
+
+def _probe_loudness(video_path: str) -> list:
+    """Momentary loudness (LUFS) per second from ffmpeg's ebur128 filter."""
+    result = subprocess.run(
+        ["ffmpeg", "-hide_banner", "-nostats", "-i", video_path, "-vn", "-af", "ebur128", "-f", "null", "-"],
+        capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise Exception(f"Loudness analysis failed: {result.stderr[-300:]}")
+
+    per_second = {}
+    for match in re.finditer(r"t:\s*([\d.]+)\s+TARGET:.*?M:\s*(-?[\d.]+|-inf|nan)", result.stderr):
+        second = int(float(match.group(1)))
+        value = float(match.group(2)) if match.group(2) not in ("-inf", "nan") else -70.0
+        per_second[second] = max(per_second.get(second, -70.0), value)
+    if not per_second:
+        return []
+    return [per_second.get(s, -70.0) for s in range(max(per_second) + 1)]
+
+
+def get_media_features(video_path: str) -> dict:
+    """Loudness curve (cached in memory and in a sidecar JSON) and scene cuts of a video."""
+    scene_cuts = get_boundary_index(video_path).scene_cuts
+    signature = _file_signature(video_path)
+    with _features_lock:
+        cached = _features_cache.get(video_path)
+        if cached and cached["signature"] == signature:
+            return {**cached, "scene_cuts": scene_cuts}
+
+    features_path = _features_path(video_path)
+    features = None
+    if os.path.exists(features_path):
+        try:
+            with open(features_path) as f:
+                data = json.load(f)
+            if data.get("signature") == signature:
+                features = data
+        except Exception:
+            features = None
+
+    if features is None:
+        features = {"signature": signature, "loudness": _probe_loudness(video_path)}
+        try:
+            with open(features_path, "w") as f:
+                json.dump(features, f)
+        except OSError as e:
+            print(f"[HIGHLIGHTS] Could not write feature index: {e}")
+
+    with _features_lock:
+        _features_cache[video_path] = features
+    return {**features, "scene_cuts": scene_cuts}
+
+
+def _spread(starts: np.ndarray, ends: np.ndarray, amounts: np.ndarray, n: int) -> np.ndarray:
+    """Distribute each amount evenly over its [start, end) seconds (difference array)."""
+    a = np.clip(np.floor(starts).astype(int), 0, n - 1)
+    b = np.clip(np.ceil(ends).astype(int), a + 1, n)
+    diff = np.zeros(n + 1)
+    np.add.at(diff, a, amounts / (b - a))
+    np.add.at(diff, b, -amounts / (b - a))
+    return np.cumsum(diff)[:n]
+
+
+def _zscore(x: np.ndarray) -> np.ndarray:
+    std = x.std()
+    if std < 1e-9:
+        return np.zeros_like(x)
+    return np.clip((x - x.mean()) / std, -2.0, 3.0)
+
+
+def _smooth(x: np.ndarray, seconds: int = SMOOTH_SECONDS) -> np.ndarray:
+    if seconds <= 1 or len(x) < seconds:
+        return x
+    return np.convolve(x, np.ones(seconds) / seconds, mode="same")
+
+
+def _keywords(token_lists: list) -> set:
+    counts = Counter(t for tokens in token_lists for t in tokens if len(t) > 3)
+    line_freq = Counter(t for tokens in token_lists for t in set(tokens))
+    max_lines = max(2, len(token_lists) // 5)  # Words on most lines are filler, not topics
+    topical = [t for t, c in counts.most_common() if c >= 3 and line_freq[t] <= max_lines]
+    return set(topical[:KEYWORD_COUNT]) | HOOK_WORDS
+
+
+def score_curve(transcript: list, duration: float, media: Optional[dict] = None) -> tuple[np.ndarray, dict]:
+    """Combined per-second score and the weighted feature curves behind it."""
+    n = max(1, int(math.ceil(duration)))
+    starts = np.array([float(t.get("start", 0)) for t in transcript])
+    ends = np.array([float(t.get("end", t.get("start", 0) + (t.get("duration") or 1))) for t in transcript])
+    texts = [t.get("text", "") for t in transcript]
+    token_lists = [_TOKEN_RE.findall(text.lower()) for text in texts]
+    keywords = _keywords(token_lists)
+
+    raw = {
+        "speech_rate": _spread(starts, ends, np.array([len(tokens) for tokens in token_lists], dtype=float), n),
+        "keywords": _spread(starts, ends, np.array([sum(t in keywords for t in tokens) for tokens in token_lists], dtype=float), n),
+        "punctuation": _spread(starts, ends, np.array([text.count("?") + text.count("!") for text in texts], dtype=float), n),
+    }
+    speech = _spread(starts, ends, np.maximum(ends - starts, 0.0), n) > 1e-6
+
+    if media:
+        loudness = np.full(n, -70.0)
+        values = np.array(media.get("loudness", [])[:n], dtype=float)
+        loudness[:len(values)] = values
+        raw["loudness"] = loudness
+        cuts = np.array(media.get("scene_cuts", []), dtype=float)
+        raw["scene_cuts"] = np.bincount(np.clip(cuts.astype(int), 0, n - 1), minlength=n).astype(float) if len(cuts) else np.zeros(n)
+
+    weighted = {name: FEATURE_WEIGHTS[name] * _smooth(_zscore(values)) for name, values in raw.items()}
+    score = np.sum(list(weighted.values()), axis=0) - SILENCE_PENALTY * ~speech
+    return score, weighted
+
+
+def _suppress(starts: np.ndarray, ends: np.ndarray, values: np.ndarray, count: int) -> list:
+    """Greedy non-maximum suppression over candidate windows; returns picked indices."""
+    order = np.argsort(-values)
+    starts, ends = starts[order], ends[order]
+    alive = np.ones(len(order), dtype=bool)
+    picked = []
+    while len(picked) < count and alive.any():
+        i = int(np.argmax(alive))  # First alive in descending score order
+        picked.append(int(order[i]))
+        overlap = np.minimum(ends, ends[i]) - np.maximum(starts, starts[i])
+        shorter = np.minimum(ends - starts, ends[i] - starts[i])
+        alive &= overlap <= MAX_OVERLAP * shorter
+    return picked
+
+
+def find_highlights(transcript: list, duration: float, min_duration: int = 15, max_duration: int = 90, count: int = 5, media: Optional[dict] = None) -> list:
+    """Top `count` non-overlapping windows, shaped like analyze_for_shorts results."""
+    if not transcript or duration <= 0:
+        return []
+    score, weighted = score_curve(transcript, duration, media)
+    n = len(score)
+    cumulative = np.concatenate([[0.0], np.cumsum(score)])
+
+    line_starts = np.unique(np.clip(np.array([int(t.get("start", 0)) for t in transcript]), 0, n - 1))
+    cand_starts, cand_lengths, cand_values = [], [], []
+    for length in range(min_duration, min(max_duration, n) + 1, LENGTH_STEP):
+        starts = line_starts[line_starts + length <= n]
+        if not len(starts):
+            continue
+        means = (cumulative[starts + length] - cumulative[starts]) / length
+        bonus = LENGTH_BONUS * (length - min_duration) / max(1, max_duration - min_duration)
+        cand_starts.append(starts)
+        cand_lengths.append(np.full(len(starts), length))
+        cand_values.append(means + bonus)
+
+    if not cand_starts:
+        return []
+    starts = np.concatenate(cand_starts)
+    ends = starts + np.concatenate(cand_lengths)
+    values = np.concatenate(cand_values)
+    picked = _suppress(starts, ends, values, count)
+
+    low, high = values.min(), values.max()
+    highlights = []
+    for i in picked:
+        start, end = int(starts[i]), int(ends[i])
+        contributions = {name: curve[start:end].mean() for name, curve in weighted.items()}
+        text = " ".join(t.get("text", "") for t in transcript if start <= t.get("start", 0) < end)
+        highlights.append({
+            "start": float(start),
+            "end": float(end),
+            "score": int(60 + 39 * (values[i] - low) / (high - low)) if high > low else 80,
+            "reason": FEATURE_REASONS[max(contributions, key=contributions.get)],
+            "transcript": text,
+        })
+    return sorted(highlights, key=lambda h: -h["score"])
+
+
+def local_highlights(transcript: list, duration: float, min_duration: int, max_duration: int, count: int = 5, source_path: Optional[str] = None) -> list:
+    """find_highlights with media features when the source video is available."""
+    media = None
+    if source_path and os.path.exists(source_path):
+        try:
+            media = get_media_features(source_path)
+        except Exception as e:
+            print(f"[HIGHLIGHTS] Media features unavailable, using transcript only: {e}")
+    return find_highlights(transcript, duration, min_duration, max_duration, count, media)
@@ -1,4 +1,5 @@
 import subprocess
+from app.services.video.smartcut import smart_cut as smart_cut_clip
 
 ASPECT_RATIOS = {"9:16": (1080, 1920), "1:1": (1080, 1080)}
 
@@ -170,7 +171,14 @@ def run_cmd(cmd: list, label: str):
     print(f"[EFFECTS] {label} done")
 
 
-def extract_segment(input_path: str, output_path: str, start: float, end: float, keep_audio: bool = True) -> str:
+def extract_segment(input_path: str, output_path: str, start: float, end: float, keep_audio: bool = True, smart_cut: bool = False) -> str:
+    if smart_cut:
+        try:
+            if smart_cut_clip(input_path, start, end, output_path, keep_audio):
+                return output_path
+        except Exception as e:
+            print(f"[EFFECTS] Smart cut failed, re-encoding: {e}")
+    
     duration = end - start
     cmd = ["ffmpeg", "-y", "-ss", str(start), "-i", input_path, "-t", str(duration), "-c:v", "libx264", "-preset", "fast", "-crf", "23"]
     cmd.extend(["-c:a", "aac", "-b:a", "128k"] if keep_audio else ["-an"])
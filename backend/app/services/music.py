@@ -5,26 +5,26 @@ import json
 import shutil
 import subprocess
 from typing import Optional
+from app.services.ytdlp_pool import get_ytdlp_pool
 
 
 def search_youtube_music(query: str, limit: int = 5) -> list:
     """Search YouTube for music tracks."""
-    search_cmd = ["yt-dlp", "--dump-json", "--flat-playlist", f"ytsearch{limit}:{query} no copyright background music"]
-    result = subprocess.run(search_cmd, capture_output=True, text=True)
-    if result.returncode != 0:
+    try:
+        entries = get_ytdlp_pool().extract_entries_sync(f"ytsearch{limit}:{query} no copyright background music", limit=limit)
+    except Exception as e:
+        print(f"Music search error: {e}")
         return []
     
     results = []
-    for line in result.stdout.strip().split('\n'):
-        if line:
-            info = json.loads(line)
-            results.append({
-                "id": info.get("id", ""),
-                "title": info.get("title", ""),
-                "artist": info.get("uploader", info.get("channel", "Unknown")),
-                "duration": info.get("duration", 0),
-                "url": info.get("url") or f"https://youtube.com/watch?v={info.get('id', '')}"
-            })
+    for info in entries:
+        results.append({
+            "id": info.get("id", ""),
+            "title": info.get("title", ""),
+            "artist": info.get("uploader", info.get("channel", "Unknown")),
+            "duration": info.get("duration", 0),
+            "url": info.get("url") or f"https://youtube.com/watch?v={info.get('id', '')}"
+        })
     return results
 
 
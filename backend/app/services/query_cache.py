@@ -0,0 +1,173 @@
+"""Query-result cache: in-process LRU backed by Redis, with stale-while-revalidate."""
+
+import json
+import time
+import asyncio
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Optional
+from app.config import get_settings
+
+MAX_MEMORY_ENTRIES = 512
+REDIS_PREFIX = "goinsights:qc:"
+REDIS_RETRY_AFTER = 60  # Seconds to skip Redis after a connection failure
+
+
+class QueryCache:
+    """Caches JSON-serialisable query results.
+
+    Each entry is fresh for `ttl` seconds and may then be served stale for up to
+    `stale_ttl` more while a single background task refreshes it. Concurrent
+    misses for the same key share one upstream call.
+    """
+
+    def __init__(self, redis_url: str = "", max_entries: int = MAX_MEMORY_ENTRIES):
+        self._memory: OrderedDict = OrderedDict()
+        self._max_entries = max_entries
+        self._inflight: dict = {}
+        self._redis_url = redis_url
+        self._redis = None
+        self._redis_down_until = 0.0
+
+    def _redis_client(self):
+        if not self._redis_url or time.time() < self._redis_down_until:
+            return None
+        if self._redis is None:
+            try:
+                import redis.asyncio as aioredis
+                self._redis = aioredis.from_url(self._redis_url, socket_timeout=1, socket_connect_timeout=1)
+            except ImportError:
+                self._redis_url = ""
+                return None
+        return self._redis
+
+    def _redis_failed(self, e: Exception):
+        print(f"[QUERY CACHE] Redis unavailable, using memory only: {e}")
+        self._redis_down_until = time.time() + REDIS_RETRY_AFTER
+
+    def _remember(self, key: str, entry: dict):
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self._max_entries:
+            self._memory.popitem(last=False)
+
+    async def _load(self, key: str) -> Optional[dict]:
+        entry = self._memory.get(key)
+        if entry:
+            self._memory.move_to_end(key)
+            return entry
+
+        client = self._redis_client()
+        if client is None:
+            return None
+        try:
+            raw = await client.get(REDIS_PREFIX + key)
+        except Exception as e:
+            self._redis_failed(e)
+            return None
+        if not raw:
+            return None
+        entry = json.loads(raw)
+        self._remember(key, entry)
+        return entry
+
+    async def _store(self, key: str, value: Any, ttl: float, stale_ttl: float):
+        now = time.time()
+        entry = {"value": value, "fresh_until": now + ttl, "stale_until": now + ttl + stale_ttl}
+        self._remember(key, entry)
+
+        client = self._redis_client()
+        if client is None:
+            return
+        try:
+            await client.set(REDIS_PREFIX + key, json.dumps(entry, default=str), ex=int(ttl + stale_ttl) + 1)
+        except Exception as e:
+            self._redis_failed(e)
+
+    def _fetch_shared(self, key: str, fetch: Callable[[], Awaitable[Any]], ttl: float, stale_ttl: float, cache_empty: bool) -> asyncio.Task:
+        task = self._inflight.get(key)
+        if task is not None:
+            return task
+
+        async def run():
+            try:
+                value = await fetch()
+                if value or cache_empty:
+                    await self._store(key, value, ttl, stale_ttl)
+                return value
+            finally:
+                self._inflight.pop(key, None)
+
+        task = asyncio.create_task(run())
+        self._inflight[key] = task
+        return task
+
+    async def get_or_fetch(
+        self,
+        namespace: str,
+        key: str,
+        fetch: Callable[[], Awaitable[Any]],
+        ttl: float,
+        stale_ttl: float = 0,
+        cache_empty: bool = False,
+    ) -> Any:
+        """Return the cached value for (namespace, key), calling `fetch` on a miss."""
+        full_key = f"{namespace}:{key}"
+        entry = await self._load(full_key)
+        now = time.time()
+
+        if entry and now < entry["fresh_until"]:
+            return entry["value"]
+
+        if entry and now < entry["stale_until"]:
+            task = self._fetch_shared(full_key, fetch, ttl, stale_ttl, cache_empty)
+            task.add_done_callback(_log_refresh_error)
+            return entry["value"]
+
+        # shield() so a cancelled caller doesn't cancel the fetch other waiters share
+        return await asyncio.shield(self._fetch_shared(full_key, fetch, ttl, stale_ttl, cache_empty))
+
+    async def get_raw(self, namespace: str, key: str) -> Optional[dict]:
+        """Entry stored with `set_raw`, for callers that manage freshness themselves."""
+        return await self._load(f"{namespace}:{key}")
+
+    async def set_raw(self, namespace: str, key: str, entry: dict, expire: float):
+        full_key = f"{namespace}:{key}"
+        self._remember(full_key, entry)
+
+        client = self._redis_client()
+        if client is None:
+            return
+        try:
+            await client.set(REDIS_PREFIX + full_key, json.dumps(entry, default=str), ex=int(expire))
+        except Exception as e:
+            self._redis_failed(e)
+
+    async def invalidate(self, namespace: str, key: str):
+        full_key = f"{namespace}:{key}"
+        self._memory.pop(full_key, None)
+        client = self._redis_client()
+        if client is None:
+            return
+        try:
+            await client.delete(REDIS_PREFIX + full_key)
+        except Exception as e:
+            self._redis_failed(e)
+
+    async def close(self):
+        if self._redis is not None:
+            try:
+                await self._redis.aclose()
+            except Exception:
+                pass
+            self._redis = None
+
+
+def _log_refresh_error(task: asyncio.Task):
+    if not task.cancelled() and task.exception():
+        print(f"[QUERY CACHE] Background refresh failed: {task.exception()}")
+
+
+@lru_cache
+def get_query_cache() -> QueryCache:
+    return QueryCache(get_settings().redis_url)
@@ -0,0 +1,146 @@
+"""Shared cache of downloaded YouTube sources, linked into project directories."""
+
+import os
+import json
+import time
+import shutil
+import hashlib
+import threading
+from pathlib import Path
+from functools import lru_cache
+from typing import Callable
+from app.config import get_settings
+
+try:
+    import fcntl
+except ImportError:  # Windows: fall back to in-process locking only
+    fcntl = None
+
+
+class SourceCache:
+    """Downloads each (video_id, format) once and hard-links it into projects.
+
+    Entries track the project paths linked to them; only entries with no live
+    links are evicted when the cache grows past its disk budget (LRU order).
+    """
+
+    def __init__(self, root: str, max_bytes: int):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.index_path = self.root / "index.json"
+        self._index_lock = threading.Lock()
+        self._key_locks = {}
+        self._key_locks_guard = threading.Lock()
+
+    def _key(self, video_id: str, fmt: str) -> str:
+        return f"{video_id}-{hashlib.sha1(fmt.encode()).hexdigest()[:10]}"
+
+    def _key_lock(self, key: str) -> threading.Lock:
+        with self._key_locks_guard:
+            return self._key_locks.setdefault(key, threading.Lock())
+
+    def _load_index(self) -> dict:
+        try:
+            with open(self.index_path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_index(self, index: dict):
+        tmp = self.index_path.with_suffix(".tmp")
+        with open(tmp, "w") as f:
+            json.dump(index, f)
+        os.replace(tmp, self.index_path)
+
+    def fetch(self, video_id: str, fmt: str, dest: str, download: Callable[[str], None]) -> str:
+        """Ensure dest holds the source; concurrent callers for one key share a single download."""
+        key = self._key(video_id, fmt)
+        cached = self.root / f"{key}.mp4"
+
+        with self._key_lock(key):
+            lock_file = open(self.root / f"{key}.lock", "w")
+            try:
+                if fcntl:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX)  # Single-flight across worker processes too
+                if not cached.exists():
+                    tmp = self.root / f".{key}.downloading.mp4"
+                    if tmp.exists():
+                        tmp.unlink()
+                    print(f"[SOURCE-CACHE] Miss {key}, downloading")
+                    download(str(tmp))
+                    os.replace(tmp, cached)
+                else:
+                    print(f"[SOURCE-CACHE] Hit {key}")
+                self._link(cached, Path(dest))
+            finally:
+                if fcntl:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+                lock_file.close()
+
+        self._record(key, video_id, fmt, cached, dest)
+        return dest
+
+    def _link(self, cached: Path, dest: Path):
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        if dest.exists() or dest.is_symlink():
+            if dest.exists() and os.path.samefile(cached, dest):
+                return
+            dest.unlink()
+        try:
+            os.link(cached, dest)
+        except OSError:
+            try:
+                os.symlink(cached.resolve(), dest)
+            except OSError:
+                shutil.copy2(cached, dest)
+
+    def _live_refs(self, cached: Path, refs: list) -> list:
+        live = []
+        for ref in refs:
+            try:
+                if os.path.samefile(cached, ref):
+                    live.append(ref)
+            except OSError:
+                continue
+        return live
+
+    def _record(self, key: str, video_id: str, fmt: str, cached: Path, dest: str):
+        with self._index_lock:
+            index = self._load_index()
+            entry = index.get(key, {"video_id": video_id, "format": fmt, "refs": []})
+            refs = set(entry.get("refs", []))
+            refs.add(os.path.abspath(dest))
+            entry["refs"] = sorted(refs)
+            entry["size"] = cached.stat().st_size if cached.exists() else 0
+            entry["last_access"] = time.time()
+            index[key] = entry
+            self._evict(index, keep=key)
+            self._save_index(index)
+
+    def _evict(self, index: dict, keep: str):
+        for key, entry in index.items():
+            entry["refs"] = self._live_refs(self.root / f"{key}.mp4", entry.get("refs", []))
+
+        total = sum(e.get("size", 0) for e in index.values())
+        if total <= self.max_bytes:
+            return
+
+        for key, entry in sorted(index.items(), key=lambda kv: kv[1].get("last_access", 0)):
+            if total <= self.max_bytes:
+                break
+            if key == keep or entry["refs"] or self._key_lock(key).locked():
+                continue
+            try:
+                (self.root / f"{key}.mp4").unlink()
+            except FileNotFoundError:
+                pass
+            total -= entry.get("size", 0)
+            del index[key]
+            print(f"[SOURCE-CACHE] Evicted {key}")
+
+
+@lru_cache
+def get_source_cache() -> SourceCache:
+    settings = get_settings()
+    return SourceCache(f"{settings.storage_path}/source_cache", int(settings.source_cache_max_gb * 1024 ** 3))
@@ -0,0 +1,187 @@
+"""Async subtitle track fetching with a shared connection pool and adaptive rate limiting."""
+
+import re
+import time
+import asyncio
+from functools import lru_cache
+from typing import Optional
+import httpx
+from app.services.http import get_http_client
+
+MAX_RETRIES = 2
+DEFAULT_BACKOFF = 2.0
+FORMAT_PRIORITY = ["json3", "vtt"]
+HEDGE_DELAY = 0.75  # Seconds a track may run before the next candidate is started alongside it
+
+
+class AdaptiveTokenBucket:
+    """Token bucket whose refill rate halves on 429 and creeps back up on success."""
+
+    def __init__(self, rate: float = 4.0, capacity: float = 4.0, min_rate: float = 0.5, max_rate: float = 8.0):
+        self.rate = rate
+        self.capacity = capacity
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._blocked_until:
+                    await asyncio.sleep(self._blocked_until - now)
+                    continue
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+    def on_success(self):
+        self.rate = min(self.max_rate, self.rate + 0.1)
+
+    def on_throttled(self, retry_after: Optional[float] = None):
+        self.rate = max(self.min_rate, self.rate / 2)
+        self._tokens = 0
+        self._blocked_until = max(self._blocked_until, time.monotonic() + (retry_after or DEFAULT_BACKOFF))
+        print(f"[SUBTITLES] Rate limited, rate now {self.rate:.2f}/s")
+
+
+def _retry_after(resp: httpx.Response) -> Optional[float]:
+    value = resp.headers.get("Retry-After")
+    if value and value.isdigit():
+        return float(value)
+    return None
+
+
+def parse_json3(data: dict) -> list[dict]:
+    result = []
+    for event in data.get("events", []):
+        if "segs" in event:
+            text = "".join(s.get("utf8", "") for s in event["segs"]).strip()
+            if text:
+                result.append({
+                    "start": event.get("tStartMs", 0) / 1000,
+                    "duration": event.get("dDurationMs", 2000) / 1000,
+                    "text": text
+                })
+    return result
+
+
+def _vtt_seconds(stamp: str) -> float:
+    parts = stamp.replace(",", ".").split(":")
+    seconds = 0.0
+    for part in parts:
+        seconds = seconds * 60 + float(part)
+    return seconds
+
+
+def parse_vtt(text: str) -> list[dict]:
+    result = []
+    lines = text.splitlines()
+    previous_line = ""
+    i = 0
+    while i < len(lines):
+        line = lines[i]
+        if "-->" not in line:
+            i += 1
+            continue
+        start, end = [p.strip().split(" ")[0] for p in line.split("-->")]
+        i += 1
+        cue = []
+        while i < len(lines) and lines[i].strip():
+            cue_line = re.sub(r"<[^>]+>", "", lines[i]).strip()
+            if cue_line:
+                cue.append(cue_line)
+            i += 1
+        # Auto captions repeat the previous cue's last line as a rolling window, keep only new text
+        cue_text = " ".join(c for c in cue if c != previous_line).strip()
+        if cue:
+            previous_line = cue[-1]
+        if cue_text:
+            begin = _vtt_seconds(start)
+            result.append({"start": begin, "duration": max(0.0, _vtt_seconds(end) - begin), "text": cue_text})
+    return result
+
+
+class SubtitleFetcher:
+    def __init__(self):
+        self.bucket = AdaptiveTokenBucket()
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        return get_http_client("youtube_subtitles")
+
+    async def _get(self, url: str) -> Optional[httpx.Response]:
+        for _ in range(MAX_RETRIES + 1):
+            await self.bucket.acquire()
+            resp = await self.client.get(url)
+            if resp.status_code == 429:
+                self.bucket.on_throttled(_retry_after(resp))
+                continue
+            self.bucket.on_success()
+            return resp
+        return None
+
+    async def fetch_track(self, track: dict) -> list[dict]:
+        """Download and parse one subtitle track (a yt-dlp subtitle format dict)."""
+        url = track.get("url", "")
+        if not url:
+            return []
+        try:
+            resp = await self._get(url)
+            if resp is None or resp.status_code != 200:
+                return []
+            if track.get("ext") == "json3":
+                return parse_json3(resp.json())
+            return parse_vtt(resp.text)
+        except Exception as e:
+            print(f"Parse error: {e}")
+            return []
+
+    async def fetch_first(self, candidates: list[tuple[str, dict]]) -> tuple[Optional[str], list[dict]]:
+        """Hedged fallback: return the highest-priority non-empty track.
+
+        `candidates` is a list of (label, track) in priority order. The next
+        candidate starts when a running one fails or is still pending after
+        HEDGE_DELAY; all requests go through the token bucket, and fetches
+        still running once a winner is known are cancelled.
+        """
+        tasks = []
+        launch = True
+        try:
+            while True:
+                if launch and len(tasks) < len(candidates):
+                    tasks.append(asyncio.create_task(self.fetch_track(candidates[len(tasks)][1])))
+                for (label, _), task in zip(candidates, tasks):
+                    if not task.done():
+                        break
+                    if task.result():
+                        return label, task.result()
+                else:
+                    if len(tasks) == len(candidates):
+                        return None, []
+                    launch = True  # Everything started so far came back empty
+                    continue
+                hedge = HEDGE_DELAY if len(tasks) < len(candidates) else None
+                done, _ = await asyncio.wait([t for t in tasks if not t.done()], timeout=hedge, return_when=asyncio.FIRST_COMPLETED)
+                launch = not done or any(not task.result() for task in done)
+        finally:
+            for task in tasks:
+                task.cancel()
+
+
+def order_tracks(sub_formats: list) -> list[dict]:
+    tracks = []
+    for ext in FORMAT_PRIORITY:
+        tracks.extend(f for f in sub_formats if f.get("ext") == ext and f.get("url"))
+    return tracks
+
+
+@lru_cache
+def get_subtitle_fetcher() -> SubtitleFetcher:
+    return SubtitleFetcher()
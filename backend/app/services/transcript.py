@@ -1,6 +1,13 @@
+import os
 import re
-import time
+import json
+import asyncio
 import yt_dlp
+from typing import Optional
+from app.config import get_settings
+from app.services.subtitle_fetcher import get_subtitle_fetcher, order_tracks
+
+TRANSCRIPT_LANG = "en"  # Cache key for the English-priority track selection below
 
 class TranscriptService:
     def extract_video_id(self, url: str) -> str:
@@ -14,83 +21,78 @@ class TranscriptService:
                 return match.group(1)
         raise ValueError("Invalid YouTube URL")
     
-    def get_transcript(self, video_id: str) -> list[dict]:
+    def _cache_path(self, video_id: str, lang: str) -> str:
+        return os.path.join(get_settings().storage_path, "transcripts", f"{video_id}.{lang}.json")
+    
+    def get_cached_transcript(self, video_id: str, lang: str = TRANSCRIPT_LANG) -> Optional[list[dict]]:
+        path = self._cache_path(video_id, lang)
+        if not os.path.exists(path):
+            return None
         try:
-            url = f"https://youtube.com/watch?v={video_id}"
-            opts = {
-                "quiet": True,
-                "no_warnings": True,
-                "writesubtitles": True,
-                "writeautomaticsub": True,
-                "subtitleslangs": ["en", "en-US", "en-GB"],
-                "skip_download": True,
-                "cookiefile": "./www.youtube.com_cookies.txt",
-            }
-            with yt_dlp.YoutubeDL(opts) as ydl:
-                info = ydl.extract_info(url, download=False)
-                
-                # Priority: manual English subs > auto English > any translated to English
-                subs = info.get("subtitles", {})
-                auto_subs = info.get("automatic_captions", {})
-                
-                # Try manual English first
-                for lang in ["en", "en-US", "en-GB"]:
-                    if lang in subs:
-                        result = self._try_parse_subs(subs[lang])
-                        if result:
-                            print(f"Found manual {lang} subtitles")
-                            return result
-                
-                # Try auto English
-                for lang in ["en", "en-US", "en-GB"]:
-                    if lang in auto_subs:
-                        result = self._try_parse_subs(auto_subs[lang])
-                        if result:
-                            print(f"Found auto {lang} subtitles")
-                            return result
-                
-                print(f"No English subtitles found. Available: manual={list(subs.keys())}, auto={list(auto_subs.keys())}")
-                return []
+            with open(path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+    
+    def _save_transcript(self, video_id: str, transcript: list[dict], lang: str = TRANSCRIPT_LANG):
+        path = self._cache_path(video_id, lang)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(transcript, f)
+        os.replace(tmp_path, path)
+    
+    async def get_transcript(self, video_id: str, info: Optional[dict] = None) -> list[dict]:
+        """English transcript for a video, from the on-disk cache or parsed from `info`.
+        
+        Pass an already extracted yt-dlp info dict to avoid a second extraction.
+        """
+        cached = self.get_cached_transcript(video_id)
+        if cached is not None:
+            return cached
+        
+        try:
+            if info is None:
+                url = f"https://youtube.com/watch?v={video_id}"
+                opts = {
+                    "quiet": True,
+                    "no_warnings": True,
+                    "skip_download": True,
+                    "cookiefile": "./www.youtube.com_cookies.txt",
+                }
+                info = await asyncio.to_thread(self._extract_info, url, opts)
+            
+            transcript = await self.get_transcript_from_info(info)
+            if transcript:
+                self._save_transcript(video_id, transcript)
+            return transcript
                 
         except Exception as e:
             print(f"Transcript error: {e}")
             return []
     
-    def _try_parse_subs(self, sub_formats: list) -> list[dict]:
-        import httpx
+    def _extract_info(self, url: str, opts: dict) -> dict:
+        with yt_dlp.YoutubeDL(opts) as ydl:
+            return ydl.extract_info(url, download=False)
+    
+    async def get_transcript_from_info(self, info: dict) -> list[dict]:
+        # Priority: manual English subs > auto English, json3 before vtt within a language
+        subs = info.get("subtitles") or {}
+        auto_subs = info.get("automatic_captions") or {}
+        
+        candidates = []
+        for kind, tracks in (("manual", subs), ("auto", auto_subs)):
+            for lang in ["en", "en-US", "en-GB"]:
+                for track in order_tracks(tracks.get(lang, [])):
+                    candidates.append((f"{kind} {lang}", track))
+        
+        if candidates:
+            label, result = await get_subtitle_fetcher().fetch_first(candidates)
+            if result:
+                print(f"Found {label} subtitles")
+                return result
         
-        for fmt in sub_formats:
-            if fmt.get("ext") == "json3":
-                url = fmt.get("url", "")
-                if not url:
-                    continue
-                try:
-                    time.sleep(0.5)  # Rate limit protection
-                    resp = httpx.get(url, timeout=30)
-                    if resp.status_code == 429:
-                        print("Rate limited, waiting...")
-                        time.sleep(2)
-                        resp = httpx.get(url, timeout=30)
-                    
-                    if resp.status_code != 200:
-                        continue
-                        
-                    data = resp.json()
-                    result = []
-                    for event in data.get("events", []):
-                        if "segs" in event:
-                            text = "".join(s.get("utf8", "") for s in event["segs"]).strip()
-                            if text:
-                                result.append({
-                                    "start": event.get("tStartMs", 0) / 1000,
-                                    "duration": event.get("dDurationMs", 2000) / 1000,
-                                    "text": text
-                                })
-                    if result:
-                        return result
-                except Exception as e:
-                    print(f"Parse error: {e}")
-                    continue
+        print(f"No English subtitles found. Available: manual={list(subs.keys())}, auto={list(auto_subs.keys())}")
         return []
     
     def get_full_text(self, transcript: list[dict]) -> str:
@@ -0,0 +1,163 @@
+"""Per-project transcript index: fixed time windows with a BM25 lexical index.
+
+Built once per transcript and stored next to the other project data, so long
+sources can be queried (ask) or summarised section by section without sending
+the whole transcript to the model.
+"""
+
+import os
+import re
+import json
+import math
+import hashlib
+import threading
+from collections import Counter
+from typing import Optional
+from app.config import get_settings
+
+WINDOW_SECONDS = 90
+BM25_K1 = 1.5
+BM25_B = 0.75
+INDEX_VERSION = 1
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def tokenize(text: str) -> list[str]:
+    return [t for t in _TOKEN_RE.findall(text.lower()) if len(t) > 1 or not t.isascii()]
+
+
+def fingerprint(transcript: list) -> str:
+    payload = json.dumps([(t.get("start", 0), t.get("text", "")) for t in transcript], ensure_ascii=False)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def format_timestamp(seconds: float) -> str:
+    seconds = int(seconds)
+    if seconds >= 3600:
+        return f"{seconds // 3600}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+    return f"{seconds // 60}:{seconds % 60:02d}"
+
+
+class TranscriptIndex:
+    def __init__(self, windows: list[dict], doc_freq: dict, avg_length: float, source: str):
+        self.windows = windows  # {"start", "end", "text", "terms": {term: count}, "length"}
+        self.doc_freq = doc_freq
+        self.avg_length = avg_length
+        self.source = source
+
+    @classmethod
+    def build(cls, transcript: list, window_seconds: int = WINDOW_SECONDS) -> "TranscriptIndex":
+        windows = []
+        current = None
+        for item in transcript:
+            text = (item.get("text") or "").strip()
+            if not text:
+                continue
+            start = item.get("start", 0)
+            end = item.get("end", start + item.get("duration", 0))
+            if current is None or start - current["start"] >= window_seconds:
+                current = {"start": start, "end": end, "parts": []}
+                windows.append(current)
+            current["parts"].append(text)
+            current["end"] = max(current["end"], end)
+
+        doc_freq = Counter()
+        for window in windows:
+            window["text"] = " ".join(window.pop("parts"))
+            terms = Counter(tokenize(window["text"]))
+            window["terms"] = dict(terms)
+            window["length"] = sum(terms.values())
+            doc_freq.update(terms.keys())
+
+        avg_length = sum(w["length"] for w in windows) / len(windows) if windows else 0
+        return cls(windows, dict(doc_freq), avg_length, fingerprint(transcript))
+
+    def search(self, query: str, limit: int = 6) -> list[dict]:
+        """Top windows for the query by BM25, returned in transcript order."""
+        terms = set(tokenize(query))
+        if not terms or not self.windows:
+            return self._spread(limit)
+
+        total = len(self.windows)
+        scored = []
+        for i, window in enumerate(self.windows):
+            score = 0.0
+            norm = BM25_K1 * (1 - BM25_B + BM25_B * window["length"] / (self.avg_length or 1))
+            for term in terms:
+                tf = window["terms"].get(term)
+                if not tf:
+                    continue
+                df = self.doc_freq[term]
+                idf = math.log(1 + (total - df + 0.5) / (df + 0.5))
+                score += idf * tf * (BM25_K1 + 1) / (tf + norm)
+            if score > 0:
+                scored.append((score, i))
+
+        if not scored:  # Nothing matches lexically; give the model an overview instead
+            return self._spread(limit)
+        top = sorted(scored, reverse=True)[:limit]
+        return [self.windows[i] for i in sorted(i for _, i in top)]
+
+    def _spread(self, limit: int) -> list[dict]:
+        step = max(1, len(self.windows) // max(limit, 1))
+        return self.windows[::step][:limit]
+
+    def sections(self, max_chars: int) -> list[str]:
+        """Consecutive windows grouped into timestamped sections of at most ~max_chars."""
+        sections, current, size = [], [], 0
+        for window in self.windows:
+            line = f"[{format_timestamp(window['start'])}] {window['text']}"
+            if current and size + len(line) > max_chars:
+                sections.append("\n".join(current))
+                current, size = [], 0
+            current.append(line)
+            size += len(line)
+        if current:
+            sections.append("\n".join(current))
+        return sections
+
+    def to_dict(self) -> dict:
+        return {"version": INDEX_VERSION, "source": self.source, "avg_length": self.avg_length, "doc_freq": self.doc_freq, "windows": self.windows}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "TranscriptIndex":
+        return cls(data["windows"], data["doc_freq"], data["avg_length"], data["source"])
+
+
+def _index_path(project_id: str) -> str:
+    return os.path.join(get_settings().storage_path, "transcript_index", f"{project_id}.json")
+
+
+def _load(project_id: str) -> Optional[dict]:
+    path = _index_path(project_id)
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def get_transcript_index(project_id: str, transcript: list) -> TranscriptIndex:
+    """Stored index for the project, rebuilt when the transcript has changed."""
+    data = _load(project_id)
+    if data and data.get("version") == INDEX_VERSION and data.get("source") == fingerprint(transcript):
+        return TranscriptIndex.from_dict(data)
+
+    index = TranscriptIndex.build(transcript)
+    path = _index_path(project_id)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(index.to_dict(), f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+    print(f"[TRANSCRIPT INDEX] Built {len(index.windows)} windows for project {project_id}")
+    return index
+
+
+def remove_transcript_index(project_id: str):
+    path = _index_path(project_id)
+    if os.path.exists(path):
+        os.remove(path)
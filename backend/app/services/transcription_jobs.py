@@ -0,0 +1,137 @@
+"""Background AssemblyAI transcription jobs, completed by webhook or a shared poller."""
+
+import time
+import asyncio
+from functools import lru_cache
+from typing import Optional
+from sqlalchemy import select
+from app.config import get_settings
+from app.database import async_session
+from app.models.project import Project
+from app.services.assemblyai import AssemblyAIService
+from app.services.youtube import YouTubeService
+
+INITIAL_POLL_DELAY = 5.0
+MAX_POLL_DELAY = 120.0
+BACKOFF_FACTOR = 1.5
+WEBHOOK_PATH = "/api/youtube/transcription-webhook"
+
+
+class TranscriptionJobs:
+    """Tracks pending jobs; a single poller task serves all of them.
+
+    With webhooks enabled the poller still runs as a slow safety net, since
+    deliveries can be lost while the server is down.
+    """
+
+    def __init__(self):
+        self.assemblyai = AssemblyAIService()
+        self._pending: dict[str, dict] = {}  # job_id -> {project_id, delay, next_poll}
+        self._wakeup = asyncio.Event()
+        self._poller: Optional[asyncio.Task] = None
+
+    def _webhook_url(self) -> Optional[str]:
+        base_url = get_settings().public_base_url
+        return f"{base_url.rstrip('/')}{WEBHOOK_PATH}" if base_url else None
+
+    async def submit(self, project_id: str, youtube_url: str) -> str:
+        """Start transcribing a project's video and persist the job id; returns immediately."""
+        settings = get_settings()
+        video_info = await YouTubeService().get_video_info(youtube_url, fresh=True)
+        audio_url = video_info.get("audio_url")
+        if not audio_url:
+            raise Exception("Could not extract audio URL from video")
+
+        job_id = await self.assemblyai.submit_transcription(
+            audio_url,
+            speaker_labels=True,
+            webhook_url=self._webhook_url(),
+            webhook_secret=settings.assemblyai_webhook_secret or None,
+        )
+
+        async with async_session() as db:
+            project = await db.get(Project, project_id)
+            project.transcription_job_id = job_id
+            project.transcription_error = None
+            project.status = "transcribing"
+            await db.commit()
+
+        self.track(job_id, project_id)
+        print(f"[TRANSCRIBE] Submitted job {job_id} for project {project_id}")
+        return job_id
+
+    def track(self, job_id: str, project_id: str):
+        # Webhook deliveries make frequent polling unnecessary
+        delay = MAX_POLL_DELAY if self._webhook_url() else INITIAL_POLL_DELAY
+        self._pending[job_id] = {"project_id": project_id, "delay": delay, "next_poll": time.monotonic() + delay}
+        if self._poller is None or self._poller.done():
+            self._poller = asyncio.create_task(self._poll_loop())
+        self._wakeup.set()
+
+    async def complete(self, job_id: str) -> Optional[str]:
+        """Fetch a job's state and store the result if finished. Returns the job status."""
+        result = await self.assemblyai.get_transcription(job_id)
+        status = result["status"]
+        if status not in ("completed", "error"):
+            return status
+
+        async with async_session() as db:
+            project = (await db.execute(select(Project).where(Project.transcription_job_id == job_id))).scalar_one_or_none()
+            if project:
+                if status == "completed":
+                    project.detailed_transcription = result["transcription"]
+                    project.status = "transcribed"
+                else:
+                    project.transcription_error = result["error"]
+                    project.status = "transcription_failed"
+                project.transcription_job_id = None
+                await db.commit()
+
+        self._pending.pop(job_id, None)
+        print(f"[TRANSCRIBE] Job {job_id} {status}")
+        return status
+
+    async def _poll_loop(self):
+        while self._pending:
+            now = time.monotonic()
+            for job_id, job in list(self._pending.items()):
+                if job["next_poll"] > now:
+                    continue
+                try:
+                    status = await self.complete(job_id)
+                except Exception as e:
+                    print(f"[TRANSCRIBE] Poll failed for {job_id}: {e}")
+                    status = None
+                if status not in ("completed", "error") and job_id in self._pending:
+                    job["delay"] = min(MAX_POLL_DELAY, job["delay"] * BACKOFF_FACTOR)
+                    job["next_poll"] = time.monotonic() + job["delay"]
+
+            if not self._pending:
+                break
+            wait = max(0.0, min(job["next_poll"] for job in self._pending.values()) - time.monotonic())
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), wait)
+            except asyncio.TimeoutError:
+                pass
+
+    async def resume_pending(self):
+        """Pick up jobs that were still running when the server last stopped."""
+        async with async_session() as db:
+            rows = (await db.execute(
+                select(Project.id, Project.transcription_job_id).where(Project.transcription_job_id.is_not(None))
+            )).all()
+        for project_id, job_id in rows:
+            self.track(job_id, project_id)
+        if rows:
+            print(f"[TRANSCRIBE] Resumed {len(rows)} pending job(s)")
+
+    async def shutdown(self):
+        if self._poller is not None:
+            self._poller.cancel()
+            self._poller = None
+
+
+@lru_cache
+def get_transcription_jobs() -> TranscriptionJobs:
+    return TranscriptionJobs()
@@ -0,0 +1,181 @@
+"""Scene-cut and silence index of a source video, for snapping cut points.
+
+One ffmpeg pass per file finds scene changes (on a downscaled low-fps copy)
+and silent stretches; the result is cached in memory and in a sidecar JSON
+next to the video, like the keyframe index. Snapping a single range reuses
+that index when the analyzer already built it and otherwise only decodes a
+short window around each cut point.
+"""
+
+import os
+import re
+import json
+import bisect
+import subprocess
+import threading
+from typing import Optional
+
+SCENE_THRESHOLD = 0.3
+SILENCE_NOISE = "-35dB"
+SILENCE_MIN_DURATION = 0.3
+SPEECH_PAD = 0.1  # Keep this much of a silence next to speech so words aren't clipped
+DEFAULT_MAX_SHIFT = 2.0
+EXTRACT_SNAP_SHIFT = 1.0  # Max seconds a requested cut moves when extracting (within the inshorts SECTION_PADDING)
+WINDOW_MARGIN = 1.0  # Extra seconds decoded either side of a window so edge silences are measured
+
+_index_cache = {}
+_index_lock = threading.Lock()
+
+
+def _index_path(video_path: str) -> str:
+    root, _ = os.path.splitext(video_path)
+    return f"{root}.boundaries.json"
+
+
+def _file_signature(video_path: str) -> list:
+    stat = os.stat(video_path)
+    return [stat.st_size, int(stat.st_mtime)]
+
+
+def _probe_boundaries(video_path: str, start: float = 0.0, duration: Optional[float] = None) -> dict:
+    """Scene cuts and silences of the file, or of start..start+duration only (times stay absolute)."""
+    window = ["-ss", f"{start:.3f}", "-t", f"{duration:.3f}"] if duration is not None else []
+    result = subprocess.run(
+        [
+            "ffmpeg", "-hide_banner", "-nostats", *window, "-i", video_path,
+            "-vf", f"fps=5,scale=320:-2,select='gt(scene,{SCENE_THRESHOLD})',showinfo",
+            "-af", f"silencedetect=noise={SILENCE_NOISE}:d={SILENCE_MIN_DURATION}",
+            "-f", "null", "-"
+        ],
+        capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise Exception(f"Boundary analysis failed: {result.stderr[-300:]}")
+
+    scene_cuts = sorted(start + float(t) for t in re.findall(r"pts_time:([\d.]+)", result.stderr))
+    silences = []
+    silence_start = None
+    for kind, value in re.findall(r"silence_(start|end): (-?[\d.]+)", result.stderr):
+        if kind == "start":
+            silence_start = start + max(0.0, float(value))
+        elif silence_start is not None:
+            silences.append([silence_start, start + float(value)])
+            silence_start = None
+    return {"scene_cuts": scene_cuts, "silences": silences}
+
+
+class BoundaryIndex:
+    """Sorted cut points: starts snap to where speech or a shot begins, ends to where
+    speech stops or a shot ends."""
+
+    def __init__(self, scene_cuts: list, silences: list):
+        self.scene_cuts = scene_cuts
+        self.silences = silences
+        self.start_points = sorted(scene_cuts + [max(s, e - SPEECH_PAD) for s, e in silences])
+        self.end_points = sorted(scene_cuts + [min(e, s + SPEECH_PAD) for s, e in silences])
+
+    @staticmethod
+    def _nearest(points: list, t: float, max_shift: float) -> float:
+        i = bisect.bisect_left(points, t)
+        best = t
+        best_shift = max_shift
+        for j in (i - 1, i):
+            if 0 <= j < len(points) and abs(points[j] - t) <= best_shift:
+                best, best_shift = points[j], abs(points[j] - t)
+        return best
+
+    def snap_start(self, t: float, max_shift: float = DEFAULT_MAX_SHIFT) -> float:
+        return self._nearest(self.start_points, t, max_shift)
+
+    def snap_end(self, t: float, max_shift: float = DEFAULT_MAX_SHIFT) -> float:
+        return self._nearest(self.end_points, t, max_shift)
+
+    def snap(self, start: float, end: float, max_shift: float = DEFAULT_MAX_SHIFT) -> tuple[float, float]:
+        """Snapped (start, end); either side stays put if snapping would invert the range."""
+        new_start, new_end = self.snap_start(start, max_shift), self.snap_end(end, max_shift)
+        if new_end - new_start < (end - start) / 2:
+            return start, end
+        return new_start, new_end
+
+
+def _cached_index(video_path: str, signature: list) -> Optional[BoundaryIndex]:
+    with _index_lock:
+        cached = _index_cache.get(video_path)
+        if cached and cached[0] == signature:
+            return cached[1]
+
+    index_path = _index_path(video_path)
+    if not os.path.exists(index_path):
+        return None
+    try:
+        with open(index_path) as f:
+            data = json.load(f)
+    except Exception:
+        return None
+    if data.get("signature") != signature:
+        return None
+
+    index = BoundaryIndex(data["scene_cuts"], data["silences"])
+    with _index_lock:
+        _index_cache[video_path] = (signature, index)
+    return index
+
+
+def get_boundary_index(video_path: str) -> BoundaryIndex:
+    """Boundary index of a video, cached in memory and in a sidecar JSON next to the file."""
+    signature = _file_signature(video_path)
+    index = _cached_index(video_path, signature)
+    if index:
+        return index
+
+    data = {"signature": signature, **_probe_boundaries(video_path)}
+    try:
+        with open(_index_path(video_path), "w") as f:
+            json.dump(data, f)
+    except OSError as e:
+        print(f"[BOUNDARIES] Could not write boundary index: {e}")
+
+    index = BoundaryIndex(data["scene_cuts"], data["silences"])
+    with _index_lock:
+        _index_cache[video_path] = (signature, index)
+    return index
+
+
+def window_boundary_index(video_path: str, points: list, max_shift: float = DEFAULT_MAX_SHIFT) -> BoundaryIndex:
+    """Boundaries within max_shift of the given times, decoding only those windows (not cached)."""
+    scene_cuts, silences = [], []
+    for t in points:
+        start = max(0.0, t - max_shift - WINDOW_MARGIN)
+        found = _probe_boundaries(video_path, start, t + max_shift + WINDOW_MARGIN - start)
+        scene_cuts += found["scene_cuts"]
+        silences += found["silences"]
+    return BoundaryIndex(sorted(set(scene_cuts)), sorted(silences))
+
+
+def snap_range(video_path: Optional[str], start: float, end: float, max_shift: float = DEFAULT_MAX_SHIFT) -> tuple[float, float]:
+    """Snap start/end to nearby scene cuts or pauses.
+
+    Uses the full index if the analyzer already built it, otherwise probes a
+    window around each cut point; leaves the range unchanged on any failure.
+    """
+    if not video_path or not os.path.exists(video_path):
+        return start, end
+    try:
+        index = _cached_index(video_path, _file_signature(video_path))
+        if index is None:
+            index = window_boundary_index(video_path, [start, end], max_shift)
+    except Exception as e:
+        print(f"[BOUNDARIES] Snapping skipped for {video_path}: {e}")
+        return start, end
+    return index.snap(start, end, max_shift)
+
+
+def load_boundary_index(video_path: Optional[str]) -> Optional[BoundaryIndex]:
+    """get_boundary_index, or None when the video is missing or can't be analysed."""
+    if not video_path or not os.path.exists(video_path):
+        return None
+    try:
+        return get_boundary_index(video_path)
+    except Exception as e:
+        print(f"[BOUNDARIES] Analysis failed for {video_path}: {e}")
+        return None
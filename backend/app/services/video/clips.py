@@ -1,10 +1,20 @@
 import os
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from .base import BaseVideoService
+from .effects import get_video_duration
+from .smartcut import smart_cut as smart_cut_clip
 
 
 class ClipService(BaseVideoService):
-    def extract_clip(self, video_path: str, start: float, end: float, output_path: str) -> str:
+    def extract_clip(self, video_path: str, start: float, end: float, output_path: str, smart_cut: bool = False) -> str:
+        if smart_cut:
+            try:
+                if smart_cut_clip(video_path, start, end, output_path):
+                    return output_path
+            except Exception as e:
+                print(f"[SMARTCUT] Falling back to re-encode: {e}")
+        
         duration = end - start
         cmd = [
             "ffmpeg", "-y",
@@ -21,17 +31,28 @@ class ClipService(BaseVideoService):
         subprocess.run(cmd, check=True, capture_output=True)
         return output_path
     
-    def extract_clips(self, project_id: str, video_path: str, clips: list[dict]) -> list[str]:
+    def extract_clips(self, project_id: str, video_path: str, clips: list[dict], smart_cut: bool = False, max_workers: int = None) -> list[str]:
         project_dir = self.storage / project_id / "clips"
         project_dir.mkdir(parents=True, exist_ok=True)
         
-        clip_paths = []
-        for i, clip in enumerate(clips):
-            output = str(project_dir / f"clip_{i:03d}.mp4")
-            self.extract_clip(video_path, clip["start"], clip["end"], output)
-            clip_paths.append(output)
+        clip_paths = [str(project_dir / f"clip_{i:03d}.mp4") for i in range(len(clips))]
+        if not clips:
+            return clip_paths
+        
+        # Each ffmpeg already uses several threads, so cap the pool at half the cores
+        workers = max_workers or max(1, (os.cpu_count() or 2) // 2)
+        with ThreadPoolExecutor(max_workers=min(workers, len(clips))) as pool:
+            futures = [
+                pool.submit(self.extract_clip, video_path, clip["start"], clip["end"], output, smart_cut)
+                for clip, output in zip(clips, clip_paths)
+            ]
+            for future in futures:
+                future.result()
         return clip_paths
     
+    def is_valid_video(self, video_path: str) -> bool:
+        return os.path.exists(video_path) and os.path.getsize(video_path) > 0 and get_video_duration(video_path) > 0
+    
     def merge_clips_with_audio(self, project_id: str, clip_paths: list[str], audio_path: str, subtitle_path: str = None) -> str:
         project_dir = self.storage / project_id
         concat_file = project_dir / "concat.txt"
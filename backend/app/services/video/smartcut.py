@@ -0,0 +1,201 @@
+"""Keyframe-aware smart cutting: stream-copy whole GOPs, re-encode only the edges."""
+
+import os
+import json
+import bisect
+import subprocess
+import tempfile
+import threading
+
+MIN_COPY_SPAN = 1.0  # Below this the copied interior isn't worth the extra passes
+EDGE_EPSILON = 0.02
+SPLICE_CHECK_SECONDS = 2.0  # Copied interior decoded past each join when checking the output
+
+_index_cache = {}
+_index_lock = threading.Lock()
+
+
+def _index_path(video_path: str) -> str:
+    root, _ = os.path.splitext(video_path)
+    return f"{root}.keyframes.json"
+
+
+def _file_signature(video_path: str) -> list:
+    stat = os.stat(video_path)
+    return [stat.st_size, int(stat.st_mtime)]
+
+
+def _probe_keyframes(video_path: str) -> list:
+    """Read keyframe timestamps from packet flags (demux only, no decoding)."""
+    result = subprocess.run(
+        ["ffprobe", "-v", "error", "-select_streams", "v:0", "-show_entries", "packet=pts_time,flags", "-of", "csv=p=0", video_path],
+        capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise Exception(f"Keyframe probe failed: {result.stderr[-300:]}")
+
+    keyframes = []
+    for line in result.stdout.splitlines():
+        parts = line.strip().split(",")
+        if len(parts) >= 2 and "K" in parts[1] and parts[0] not in ("", "N/A"):
+            keyframes.append(float(parts[0]))
+    return sorted(set(keyframes))
+
+
+def get_keyframes(video_path: str) -> list:
+    """Keyframe times of a video, cached in memory and in a sidecar JSON next to the file."""
+    signature = _file_signature(video_path)
+    with _index_lock:
+        cached = _index_cache.get(video_path)
+        if cached and cached["signature"] == signature:
+            return cached["keyframes"]
+
+    index_path = _index_path(video_path)
+    keyframes = None
+    if os.path.exists(index_path):
+        try:
+            with open(index_path) as f:
+                data = json.load(f)
+            if data.get("signature") == signature:
+                keyframes = data["keyframes"]
+        except Exception:
+            keyframes = None
+
+    if keyframes is None:
+        keyframes = _probe_keyframes(video_path)
+        try:
+            with open(index_path, "w") as f:
+                json.dump({"signature": signature, "keyframes": keyframes}, f)
+        except OSError as e:
+            print(f"[SMARTCUT] Could not write keyframe index: {e}")
+
+    with _index_lock:
+        _index_cache[video_path] = {"signature": signature, "keyframes": keyframes}
+    return keyframes
+
+
+def _probe_video_stream(video_path: str) -> dict:
+    result = subprocess.run(
+        ["ffprobe", "-v", "error", "-select_streams", "v:0", "-show_entries", "stream=codec_name,profile,level,pix_fmt,time_base", "-of", "json", video_path],
+        capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        return {}
+    streams = json.loads(result.stdout or "{}").get("streams", [])
+    return streams[0] if streams else {}
+
+
+def _run(cmd: list, label: str):
+    result = subprocess.run(cmd, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise Exception(f"{label} failed: {result.stderr[-300:]}")
+
+
+X264_PROFILES = {"Constrained Baseline": "baseline", "Baseline": "baseline", "Main": "main", "High": "high"}
+
+
+def _encode_edge(video_path: str, start: float, duration: float, output_path: str, stream: dict):
+    """Re-encode an edge as MPEG-TS, matching the source's profile and level.
+
+    The parameter sets still differ from the source's, so they travel in-band
+    (Annex-B) and the decoder picks up the switch at each part boundary.
+    """
+    cmd = [
+        "ffmpeg", "-y", "-ss", f"{start:.6f}", "-i", video_path, "-t", f"{duration:.6f}", "-an",
+        "-c:v", "libx264", "-preset", "fast", "-crf", "18", "-pix_fmt", stream.get("pix_fmt") or "yuv420p",
+    ]
+    profile = X264_PROFILES.get(stream.get("profile"))
+    if profile:
+        cmd.extend(["-profile:v", profile])
+    level = stream.get("level")
+    if isinstance(level, int) and level > 0:
+        cmd.extend(["-level", f"{level / 10:.1f}"])
+    cmd.extend(["-f", "mpegts", output_path])
+    _run(cmd, "Edge encode")
+
+
+def _decodes_cleanly(video_path: str, windows: list) -> bool:
+    """Test-decode only the given (start, end) output ranges, i.e. the re-encoded
+    edges plus a little of the copied interior on the other side of each join."""
+    for window_start, window_end in windows:
+        result = subprocess.run(
+            ["ffmpeg", "-v", "error", "-ss", f"{window_start:.6f}", "-i", video_path, "-t", f"{window_end - window_start:.6f}", "-map", "0:v", "-f", "null", "-"],
+            capture_output=True, text=True
+        )
+        if result.returncode != 0 or result.stderr.strip():
+            print(f"[SMARTCUT] Output failed decode check at {window_start:.2f}-{window_end:.2f}s: {result.stderr[-300:]}")
+            return False
+    return True
+
+
+def plan_cut(keyframes: list, start: float, end: float):
+    """Return (first_kf, last_kf) bounding the GOP-aligned interior of [start, end], or None."""
+    i = bisect.bisect_left(keyframes, start - EDGE_EPSILON)
+    j = bisect.bisect_right(keyframes, end + EDGE_EPSILON) - 1
+    if i >= len(keyframes) or j < 0 or j <= i:
+        return None
+    first_kf, last_kf = keyframes[i], keyframes[j]
+    if last_kf - first_kf < MIN_COPY_SPAN:
+        return None
+    return first_kf, last_kf
+
+
+def smart_cut(video_path: str, start: float, end: float, output_path: str, keep_audio: bool = True) -> bool:
+    """Frame-accurate cut that stream-copies the keyframe-aligned interior.
+
+    Parts are joined as MPEG-TS so each carries its own SPS/PPS in-band, then
+    remuxed to MP4 and test-decoded around the joins. Returns False when the source isn't suitable
+    (non-H.264, no full GOP in range) or the result doesn't decode cleanly, so
+    callers can fall back to a plain re-encode.
+    """
+    stream = _probe_video_stream(video_path)
+    if stream.get("codec_name") != "h264":
+        return False
+
+    plan = plan_cut(get_keyframes(video_path), start, end)
+    if not plan:
+        return False
+    first_kf, last_kf = plan
+
+    out_dir = os.path.dirname(os.path.abspath(output_path))
+    check_windows = []
+    with tempfile.TemporaryDirectory(dir=out_dir, prefix=".smartcut_") as tmp:
+        parts = []
+
+        if first_kf - start > EDGE_EPSILON:
+            head = os.path.join(tmp, "head.ts")
+            _encode_edge(video_path, start, first_kf - start, head, stream)
+            parts.append(head)
+            check_windows.append((0.0, first_kf - start + SPLICE_CHECK_SECONDS))
+
+        middle = os.path.join(tmp, "middle.ts")
+        _run([
+            "ffmpeg", "-y", "-ss", f"{first_kf + 0.001:.6f}", "-i", video_path, "-t", f"{last_kf - first_kf:.6f}",
+            "-an", "-c:v", "copy", "-bsf:v", "h264_mp4toannexb", "-avoid_negative_ts", "make_zero", "-f", "mpegts", middle
+        ], "Interior copy")
+        parts.append(middle)
+
+        if end - last_kf > EDGE_EPSILON:
+            tail = os.path.join(tmp, "tail.ts")
+            _encode_edge(video_path, last_kf, end - last_kf, tail, stream)
+            parts.append(tail)
+            check_windows.append((max(0.0, last_kf - start - SPLICE_CHECK_SECONDS), end - start))
+
+        concat_file = os.path.join(tmp, "concat.txt")
+        with open(concat_file, "w") as f:
+            for path in parts:
+                f.write(f"file '{path}'\n")
+
+        # Audio is cheap to re-encode, so it is cut sample-accurately straight from the source
+        cmd = ["ffmpeg", "-y", "-f", "concat", "-safe", "0", "-i", concat_file]
+        if keep_audio:
+            cmd.extend(["-ss", f"{start:.6f}", "-t", f"{end - start:.6f}", "-i", video_path, "-map", "0:v", "-map", "1:a?", "-c:a", "aac", "-b:a", "128k"])
+        else:
+            cmd.append("-an")
+        cmd.extend(["-c:v", "copy", "-movflags", "+faststart", "-shortest", output_path])
+        _run(cmd, "Smart cut concat")
+
+    if not _decodes_cleanly(output_path, check_windows):
+        return False
+    print(f"[SMARTCUT] {start:.2f}-{end:.2f}s copied {first_kf:.2f}-{last_kf:.2f}s")
+    return True
@@ -1,14 +1,88 @@
+import time
+import json
+import asyncio
+import hashlib
 import httpx
 from datetime import datetime
+from urllib.parse import urlparse
 from typing import Optional
+from app.services.http import shared_client
+from app.services.query_cache import get_query_cache
 
 DEFAULT_TIMEOUT = 60.0
+PER_HOST_CONCURRENCY = 6
+CACHE_NAMESPACE = "wikipedia"
+CACHE_RETENTION = 7 * 24 * 3600  # Kept past their TTL so they can be revalidated with ETag/Last-Modified
+
+# Freshness per call type, in seconds
+CACHE_TTLS = {
+    "on_this_day": 24 * 3600,
+    "search": 3600,
+    "media_counts": 6 * 3600,
+    "summary": 3600,
+    "article_media": 6 * 3600,
+    "media_urls": 24 * 3600,
+    "sections": 6 * 3600,
+    "commons_search": 6 * 3600,
+    "section_content": 6 * 3600,
+}
+
+_host_semaphores: dict[str, asyncio.Semaphore] = {}
+
+
+def _host_semaphore(url: str) -> asyncio.Semaphore:
+    host = urlparse(url).netloc
+    if host not in _host_semaphores:
+        _host_semaphores[host] = asyncio.Semaphore(PER_HOST_CONCURRENCY)
+    return _host_semaphores[host]
+
 
 class WikipediaService:
     
     def __init__(self, timeout: float = DEFAULT_TIMEOUT):
         self.timeout = timeout
     
+    async def _get_json(self, client: httpx.AsyncClient, url: str, kind: str, params: Optional[dict] = None, timeout: Optional[float] = None) -> Optional[dict]:
+        """GET a JSON document through the shared cache; None on a non-200 response.
+        
+        Fresh entries are returned without a request; expired ones are revalidated
+        with If-None-Match/If-Modified-Since so an unchanged page costs a 304.
+        """
+        params = {k: v for k, v in (params or {}).items() if v is not None}
+        key = hashlib.sha1(f"{url}?{json.dumps(params, sort_keys=True, default=str)}".encode()).hexdigest()
+        cache = get_query_cache()
+        now = time.time()
+        
+        entry = await cache.get_raw(CACHE_NAMESPACE, key)
+        if entry and now > entry.get("expires_at", 0):
+            entry = None
+        if entry and now < entry["fresh_until"]:
+            return entry["data"]
+        
+        headers = {}
+        if entry and entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry and entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        
+        async with _host_semaphore(url):
+            response = await client.get(url, params=params, headers=headers, timeout=timeout or self.timeout)
+        if response.status_code == 304 and entry:
+            data = entry["data"]
+        elif response.status_code == 200:
+            data = response.json()
+        else:
+            return None
+        
+        await cache.set_raw(CACHE_NAMESPACE, key, {
+            "data": data,
+            "etag": response.headers.get("ETag") or (entry or {}).get("etag"),
+            "last_modified": response.headers.get("Last-Modified") or (entry or {}).get("last_modified"),
+            "fresh_until": now + CACHE_TTLS[kind],
+            "expires_at": now + CACHE_RETENTION,
+        }, CACHE_RETENTION)
+        return data
+    
     def _get_urls(self, lang: str = "en"):
         return {
             "base": f"https://{lang}.wikipedia.org/api/rest_v1",
@@ -21,16 +95,11 @@ class WikipediaService:
         day = day or today.day
         urls = self._get_urls("en")  # On This Day only available in English Wikipedia
         
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{urls['base']}/feed/onthisday/events/{month}/{day}",
-                headers={"User-Agent": "GoInsights/1.0"},
-                timeout=self.timeout
-            )
-            if response.status_code != 200:
+        async with shared_client("wikipedia") as client:
+            data = await self._get_json(client, f"{urls['base']}/feed/onthisday/events/{month}/{day}", "on_this_day")
+            if data is None:
                 return []
             
-            data = response.json()
             events = []
             for event in data.get("events", [])[:20]:
                 pages = event.get("pages", [])
@@ -58,22 +127,16 @@ class WikipediaService:
         if not titles:
             return events
             
-        response = await client.get(
-            api_url,
-            params={
-                "action": "query",
-                "titles": "|".join(titles[:20]),
-                "prop": "images",
-                "imlimit": "max",
-                "format": "json"
-            },
-            headers={"User-Agent": "GoInsights/1.0"},
-            timeout=15.0
-        )
-        if response.status_code != 200:
+        data = await self._get_json(client, api_url, "media_counts", params={
+            "action": "query",
+            "titles": "|".join(titles[:20]),
+            "prop": "images",
+            "imlimit": "max",
+            "format": "json"
+        }, timeout=15.0)
+        if data is None:
             return events
         
-        data = response.json()
         title_counts = {}
         
         for page in data.get("query", {}).get("pages", {}).values():
@@ -93,24 +156,18 @@ class WikipediaService:
 
     async def search(self, query: str, limit: int = 20, lang: str = "en", with_media_count: bool = True) -> list:
         urls = self._get_urls(lang)
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                urls["api"],
-                params={
-                    "action": "query",
-                    "list": "search",
-                    "srsearch": query,
-                    "srlimit": limit,
-                    "format": "json",
-                    "srprop": "snippet|titlesnippet"
-                },
-                headers={"User-Agent": "GoInsights/1.0"},
-                timeout=self.timeout
-            )
-            if response.status_code != 200:
+        async with shared_client("wikipedia") as client:
+            data = await self._get_json(client, urls["api"], "search", params={
+                "action": "query",
+                "list": "search",
+                "srsearch": query,
+                "srlimit": limit,
+                "format": "json",
+                "srprop": "snippet|titlesnippet"
+            })
+            if data is None:
                 return []
             
-            data = response.json()
             results = []
             for item in data.get("query", {}).get("search", []):
                 result = {
@@ -128,22 +185,16 @@ class WikipediaService:
     
     async def _add_media_counts(self, client: httpx.AsyncClient, results: list, api_url: str) -> list:
         titles = [r["title"] for r in results]
-        response = await client.get(
-            api_url,
-            params={
-                "action": "query",
-                "titles": "|".join(titles[:20]),
-                "prop": "images",
-                "imlimit": "max",
-                "format": "json"
-            },
-            headers={"User-Agent": "GoInsights/1.0"},
-            timeout=15.0
-        )
-        if response.status_code != 200:
+        data = await self._get_json(client, api_url, "media_counts", params={
+            "action": "query",
+            "titles": "|".join(titles[:20]),
+            "prop": "images",
+            "imlimit": "max",
+            "format": "json"
+        }, timeout=15.0)
+        if data is None:
             return results
         
-        data = response.json()
         title_counts = {}
         
         for page in data.get("query", {}).get("pages", {}).values():
@@ -210,28 +261,29 @@ class WikipediaService:
 
     async def get_article(self, title: str, lang: str = "en") -> dict:
         urls = self._get_urls(lang)
-        async with httpx.AsyncClient() as client:
-            summary_resp = await client.get(
-                f"{urls['base']}/page/summary/{title.replace(' ', '_')}",
-                headers={"User-Agent": "GoInsights/1.0"},
-                timeout=self.timeout
-            )
-            
-            if summary_resp.status_code != 200:
-                return {"error": "Article not found"}
-            
-            summary = summary_resp.json()
-            
-            media = await self._get_article_media(client, title, urls["api"])
-            
-            if len(media) < 8:
-                commons_media = await self._search_commons(client, title)
-                existing_urls = {m["url"] for m in media}
-                for cm in commons_media:
-                    if cm["url"] not in existing_urls:
-                        media.append(cm)
-            
-            sections = await self._get_article_sections(client, title, urls["api"])
+        async with shared_client("wikipedia") as client:
+            # Independent lookups run together; Commons is fetched speculatively
+            # and only used when the article itself has few media files
+            commons_task = asyncio.create_task(self._search_commons(client, title))
+            try:
+                summary, media, sections = await asyncio.gather(
+                    self._get_json(client, f"{urls['base']}/page/summary/{title.replace(' ', '_')}", "summary"),
+                    self._get_article_media(client, title, urls["api"]),
+                    self._get_article_sections(client, title, urls["api"]),
+                )
+                
+                if summary is None:
+                    return {"error": "Article not found"}
+                
+                if len(media) < 8:
+                    commons_media = await commons_task
+                    existing_urls = {m["url"] for m in media}
+                    for cm in commons_media:
+                        if cm["url"] not in existing_urls:
+                            media.append(cm)
+            finally:
+                if not commons_task.done():
+                    commons_task.cancel()
             
             images = [m for m in media if m["type"] == "image"]
             videos = [m for m in media if m["type"] == "video"]
@@ -263,27 +315,21 @@ class WikipediaService:
 
     async def _search_commons(self, client: httpx.AsyncClient, query: str, limit: int = 50, offset: int = 0, media_filter: str = "all") -> list:
         filetype = "filetype:bitmap" if media_filter == "images" else "filetype:video" if media_filter == "videos" else ""
-        response = await client.get(
-            "https://commons.wikimedia.org/w/api.php",
-            params={
-                "action": "query",
-                "generator": "search",
-                "gsrsearch": f"{filetype} {query}".strip(),
-                "gsrlimit": limit,
-                "gsroffset": offset,
-                "prop": "imageinfo",
-                "iiprop": "url|extmetadata|mime|size",
-                "iiurlwidth": 800,
-                "format": "json"
-            },
-            headers={"User-Agent": "GoInsights/1.0"},
-            timeout=30.0
-        )
-        
-        if response.status_code != 200:
+        data = await self._get_json(client, "https://commons.wikimedia.org/w/api.php", "commons_search", params={
+            "action": "query",
+            "generator": "search",
+            "gsrsearch": f"{filetype} {query}".strip(),
+            "gsrlimit": limit,
+            "gsroffset": offset,
+            "prop": "imageinfo",
+            "iiprop": "url|extmetadata|mime|size",
+            "iiurlwidth": 800,
+            "format": "json"
+        }, timeout=30.0)
+        
+        if data is None:
             return []
         
-        data = response.json()
         media = []
         skip_keywords = [
             "icon", "logo", "flag", "commons-logo", "symbol", "button", 
@@ -344,28 +390,22 @@ class WikipediaService:
         return media
     
     async def search_commons_media(self, query: str, limit: int = 50, offset: int = 0, media_filter: str = "all") -> dict:
-        async with httpx.AsyncClient() as client:
+        async with shared_client("wikipedia") as client:
             media = await self._search_commons(client, query, limit, offset, media_filter)
             return {"media": media, "has_more": len(media) >= limit}
 
     async def _get_article_media(self, client: httpx.AsyncClient, title: str, api_url: str) -> list:
-        response = await client.get(
-            api_url,
-            params={
-                "action": "query",
-                "titles": title,
-                "prop": "images",
-                "imlimit": "max",
-                "format": "json"
-            },
-            headers={"User-Agent": "GoInsights/1.0"},
-            timeout=30.0
-        )
-        
-        if response.status_code != 200:
+        data = await self._get_json(client, api_url, "article_media", params={
+            "action": "query",
+            "titles": title,
+            "prop": "images",
+            "imlimit": "max",
+            "format": "json"
+        }, timeout=30.0)
+        
+        if data is None:
             return []
         
-        data = response.json()
         pages = data.get("query", {}).get("pages", {})
         
         image_titles = []
@@ -401,9 +441,12 @@ class WikipediaService:
                     audio_titles.append(item_title)
         
         media = []
-        media.extend(await self._get_media_urls(client, image_titles, "image", api_url))
-        media.extend(await self._get_media_urls(client, video_titles, "video", api_url))
-        media.extend(await self._get_media_urls(client, audio_titles, "audio", api_url))
+        for batch in await asyncio.gather(
+            self._get_media_urls(client, image_titles, "image", api_url),
+            self._get_media_urls(client, video_titles, "video", api_url),
+            self._get_media_urls(client, audio_titles, "audio", api_url),
+        ):
+            media.extend(batch)
         
         return media
 
@@ -449,26 +492,23 @@ class WikipediaService:
         media = []
         batch_size = 50
         
-        for i in range(0, len(titles), batch_size):
-            batch = titles[i:i + batch_size]
-            response = await client.get(
-                api_url,
-                params={
-                    "action": "query",
-                    "titles": "|".join(batch),
-                    "prop": "imageinfo",
-                    "iiprop": "url|extmetadata|mime|size|dimensions",
-                    "iiurlwidth": 800 if media_type == "image" else None,
-                    "format": "json"
-                },
-                headers={"User-Agent": "GoInsights/1.0"},
-                timeout=self.timeout
-            )
-            
-            if response.status_code != 200:
+        # Batches of 50 titles (the API limit) are requested concurrently, results keep batch order
+        pages = await asyncio.gather(*[
+            self._get_json(client, api_url, "media_urls", params={
+                "action": "query",
+                "titles": "|".join(titles[i:i + batch_size]),
+                "prop": "imageinfo",
+                "iiprop": "url|extmetadata|mime|size|dimensions",
+                "iiurlwidth": 800 if media_type == "image" else None,
+                "format": "json"
+            })
+            for i in range(0, len(titles), batch_size)
+        ])
+        
+        for data in pages:
+            if data is None:
                 continue
             
-            data = response.json()
             for page in data.get("query", {}).get("pages", {}).values():
                 info = page.get("imageinfo", [{}])[0]
                 # For video/audio use original URL, for images use thumbnail
@@ -501,22 +541,16 @@ class WikipediaService:
         return media
 
     async def _get_article_sections(self, client: httpx.AsyncClient, title: str, api_url: str) -> list:
-        response = await client.get(
-            api_url,
-            params={
-                "action": "parse",
-                "page": title,
-                "prop": "sections|text",
-                "format": "json"
-            },
-            headers={"User-Agent": "GoInsights/1.0"},
-            timeout=30.0
-        )
-        
-        if response.status_code != 200:
+        data = await self._get_json(client, api_url, "sections", params={
+            "action": "parse",
+            "page": title,
+            "prop": "sections",
+            "format": "json"
+        }, timeout=30.0)
+        
+        if data is None:
             return []
         
-        data = response.json()
         sections = []
         
         for sec in data.get("parse", {}).get("sections", [])[:10]:
@@ -531,26 +565,20 @@ class WikipediaService:
 
     async def get_section_content(self, title: str, section_index: str, lang: str = "en") -> str:
         urls = self._get_urls(lang)
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                urls["api"],
-                params={
-                    "action": "query",
-                    "titles": title,
-                    "prop": "extracts",
-                    "exsectionformat": "plain",
-                    "explaintext": True,
-                    "exlimit": 1,
-                    "format": "json"
-                },
-                headers={"User-Agent": "GoInsights/1.0"},
-                timeout=self.timeout
-            )
+        async with shared_client("wikipedia") as client:
+            data = await self._get_json(client, urls["api"], "section_content", params={
+                "action": "query",
+                "titles": title,
+                "prop": "extracts",
+                "exsectionformat": "plain",
+                "explaintext": True,
+                "exlimit": 1,
+                "format": "json"
+            })
             
-            if response.status_code != 200:
+            if data is None:
                 return ""
             
-            data = response.json()
             pages = data.get("query", {}).get("pages", {})
             for page in pages.values():
                 return page.get("extract", "")[:3000]
@@ -1,28 +1,68 @@
+import os
+import json
+import time
 import yt_dlp
 import asyncio
 from typing import Optional
 from app.services.transcript import TranscriptService
-from app.services.assemblyai import AssemblyAIService
+from app.services.source_cache import get_source_cache
 from app.config import get_settings
 
+INFO_CACHE_TTL = 24 * 3600  # View/like counts drift, so metadata is refreshed daily
+
 class YouTubeService:
     def __init__(self):
         self.transcript_service = TranscriptService()
-        self.assemblyai = AssemblyAIService()
         self.cookies_file = "./www.youtube.com_cookies.txt"
         self.ydl_opts = {"quiet": True, "no_warnings": True, "extract_flat": False, "cookiefile": self.cookies_file}
     
-    def get_video_info(self, url: str) -> dict:
-        """Get basic video info from YouTube"""
+    def _info_cache_path(self, video_id: str) -> str:
+        return os.path.join(get_settings().storage_path, "video_info", f"{video_id}.json")
+    
+    def _load_cached_info(self, video_id: str) -> Optional[dict]:
+        path = self._info_cache_path(video_id)
+        try:
+            if time.time() - os.path.getmtime(path) > INFO_CACHE_TTL:
+                return None
+            with open(path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+    
+    def _save_cached_info(self, video_id: str, metadata: dict):
+        path = self._info_cache_path(video_id)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(metadata, f)
+        os.replace(tmp_path, path)
+    
+    async def get_video_info(self, url: str, fresh: bool = False) -> dict:
+        """Get basic video info from YouTube
+        
+        A single extraction feeds metadata, transcript and audio URL. Known videos are
+        served from the metadata/transcript caches without touching YouTube; pass
+        fresh=True when a (short-lived) audio URL is needed.
+        """
         video_id = self.transcript_service.extract_video_id(url)
         
-        with yt_dlp.YoutubeDL(self.ydl_opts) as ydl:
-            info = ydl.extract_info(url, download=False)
+        if not fresh:
+            metadata = self._load_cached_info(video_id)
+            transcript = self.transcript_service.get_cached_transcript(video_id)
+            if metadata is not None and transcript is not None:
+                return {
+                    **metadata,
+                    "transcript": transcript,
+                    "full_text": self.transcript_service.get_full_text(transcript),
+                    "audio_url": None,
+                }
         
-        # Try to get basic transcript from YouTube first
-        transcript = self.transcript_service.get_transcript(video_id)
+        info = await asyncio.to_thread(self._extract_info, url)
         
-        return {
+        # Subtitle tracks come from the same info dict, no second extraction
+        transcript = await self.transcript_service.get_transcript(video_id, info=info)
+        
+        metadata = {
             "video_id": video_id,
             "title": info.get("title", ""),
             "description": info.get("description", ""),
@@ -35,11 +75,23 @@ class YouTubeService:
             "upload_date": info.get("upload_date", ""),
             "categories": info.get("categories", []),
             "tags": info.get("tags", []),
+        }
+        try:
+            self._save_cached_info(video_id, metadata)
+        except OSError as e:
+            print(f"Could not cache video info: {e}")
+        
+        return {
+            **metadata,
             "transcript": transcript,
             "full_text": self.transcript_service.get_full_text(transcript),
             "audio_url": self._get_audio_url(info)
         }
     
+    def _extract_info(self, url: str) -> dict:
+        with yt_dlp.YoutubeDL(self.ydl_opts) as ydl:
+            return ydl.extract_info(url, download=False)
+    
     def _get_audio_url(self, info: dict) -> Optional[str]:
         """Extract best audio URL from video info"""
         formats = info.get("formats", [])
@@ -52,29 +104,17 @@ class YouTubeService:
                 return f.get("url")
         return None
     
-    async def get_detailed_transcription(self, url: str) -> dict:
-        """Get detailed transcription using AssemblyAI with speaker diarization"""
-        # First get basic video info
-        video_info = self.get_video_info(url)
-        audio_url = video_info.get("audio_url")
-        
-        if not audio_url:
-            raise Exception("Could not extract audio URL from video")
-        
-        # Get detailed transcription from AssemblyAI
-        transcription = await self.assemblyai.transcribe_from_url(
-            audio_url=audio_url,
-            speaker_labels=True
-        )
-        
-        return {
-            **video_info,
-            "transcription": transcription
-        }
-    
     def download_video(self, url: str, output_path: str) -> str:
+        fmt = "best[height<=720]"
+        try:
+            video_id = self.transcript_service.extract_video_id(url)
+        except ValueError:
+            return self._download_video(url, output_path, fmt)
+        return get_source_cache().fetch(video_id, fmt, output_path, lambda path: self._download_video(url, path, fmt))
+    
+    def _download_video(self, url: str, output_path: str, fmt: str) -> str:
         opts = {
-            "format": "best[height<=720]",
+            "format": fmt,
             "outtmpl": output_path,
             "quiet": True,
             "cookiefile": self.cookies_file,
@@ -0,0 +1,99 @@
+"""Long-lived yt-dlp extractors shared across requests (no process spawn per search)."""
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+import yt_dlp
+from app.services.query_cache import get_query_cache
+
+COOKIES_FILE = "./www.youtube.com_cookies.txt"
+MAX_WORKERS = 4
+# wait_for can't stop a worker thread, so yt-dlp itself must give up in about the
+# caller's timeout: (RETRIES + 1) attempts of at most SOCKET_TIMEOUT per request
+SOCKET_TIMEOUT = 10
+RETRIES = 1
+EXTRACTOR_RETRIES = 1
+
+# (fresh, stale) seconds per kind of listing
+CACHE_TTLS = {
+    "search": (600, 3600),
+    "suggestions": (1800, 6 * 3600),
+    "trending": (1800, 6 * 3600),
+    "channel_videos": (900, 6 * 3600),
+    "channel_search": (3600, 24 * 3600),
+}
+
+
+class YtDlpPool:
+    """Thread pool where each worker keeps its own initialised YoutubeDL instances.
+
+    YoutubeDL objects are not thread-safe, so instances are thread-local and keyed
+    by their option set; the pool size doubles as the concurrency limit.
+    """
+
+    def __init__(self, max_workers: int = MAX_WORKERS):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ytdlp")
+        self._local = threading.local()
+
+    def _get_ydl(self, lang: str = None) -> yt_dlp.YoutubeDL:
+        instances = getattr(self._local, "instances", None)
+        if instances is None:
+            instances = self._local.instances = {}
+
+        key = lang or ""
+        if key not in instances:
+            opts = {
+                "quiet": True,
+                "no_warnings": True,
+                "skip_download": True,
+                "extract_flat": "in_playlist",
+                "ignoreerrors": True,
+                "socket_timeout": SOCKET_TIMEOUT,
+                "retries": RETRIES,
+                "extractor_retries": EXTRACTOR_RETRIES,
+                "cookiefile": COOKIES_FILE,
+            }
+            if lang:
+                opts["extractor_args"] = {"youtube": {"lang": [lang]}}
+            instances[key] = yt_dlp.YoutubeDL(opts)
+        return instances[key]
+
+    def _extract(self, url: str, limit: int = None, lang: str = None) -> list[dict]:
+        ydl = self._get_ydl(lang)
+        if limit:
+            ydl.params["playlistend"] = limit
+        else:
+            ydl.params.pop("playlistend", None)
+
+        info = ydl.extract_info(url, download=False) or {}
+        entries = [e for e in (info.get("entries") or []) if e]
+        return entries[:limit] if limit else entries
+
+    async def extract_entries(self, url: str, limit: int = None, lang: str = None, timeout: float = 30) -> list[dict]:
+        """Flat playlist/search entries, equivalent to `yt-dlp -j --flat-playlist`."""
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self._executor, self._extract, url, limit, lang)
+        return await asyncio.wait_for(future, timeout)
+
+    def extract_entries_sync(self, url: str, limit: int = None, lang: str = None, timeout: float = 30) -> list[dict]:
+        return self._executor.submit(self._extract, url, limit, lang).result(timeout)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+@lru_cache
+def get_ytdlp_pool() -> YtDlpPool:
+    return YtDlpPool()
+
+
+async def cached_entries(kind: str, url: str, limit: int = None, lang: str = None, timeout: float = 30) -> list[dict]:
+    """`extract_entries` through the query cache, using the TTLs configured for `kind`."""
+    ttl, stale_ttl = CACHE_TTLS[kind]
+    key = f"{lang or ''}:{limit or ''}:{url}"
+    return await get_query_cache().get_or_fetch(
+        f"ytdlp:{kind}", key,
+        lambda: get_ytdlp_pool().extract_entries(url, limit=limit, lang=lang, timeout=timeout),
+        ttl=ttl, stale_ttl=stale_ttl,
+    )
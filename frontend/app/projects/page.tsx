@@ -19,20 +19,36 @@ interface ProjectItem {
 export default function ProjectsPage(): React.ReactElement {
   const [list, setList] = useState<ProjectItem[]>([]);
   const [loading, setLoading] = useState(true);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [loadingMore, setLoadingMore] = useState(false);
 
   useEffect(() => { loadProjects(); }, []);
 
   const loadProjects = async (): Promise<void> => {
     setLoading(true);
     try {
-      const { data } = await projects.list();
+      const { data, headers } = await projects.list();
       setList(data);
+      setNextCursor(headers["x-next-cursor"] || null);
     } catch {
       console.error("Failed to load projects");
     }
     setLoading(false);
   };
 
+  const loadMore = async (): Promise<void> => {
+    if (!nextCursor) return;
+    setLoadingMore(true);
+    try {
+      const { data, headers } = await projects.list(nextCursor);
+      setList((prev) => [...prev, ...data]);
+      setNextCursor(headers["x-next-cursor"] || null);
+    } catch {
+      console.error("Failed to load more projects");
+    }
+    setLoadingMore(false);
+  };
+
   const handleDelete = async (id: string): Promise<void> => {
     if (!confirm("Delete this project?")) return;
     await projects.delete(id);
@@ -127,6 +143,14 @@ export default function ProjectsPage(): React.ReactElement {
             ))}
           </div>
         )}
+
+        {!loading && nextCursor && (
+          <div className="text-center mt-8">
+            <button onClick={loadMore} disabled={loadingMore} className="btn-secondary">
+              {loadingMore ? "Loading..." : "Load more"}
+            </button>
+          </div>
+        )}
       </div>
     </div>
   );
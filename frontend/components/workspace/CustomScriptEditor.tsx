@@ -42,6 +42,9 @@ export default function CustomScriptEditor({
   const [numSegments, setNumSegments] = useState(0);
   const [videoStyle, setVideoStyle] = useState(initialVideoStyle || "dialogue");
   const [generating, setGenerating] = useState(false);
+  // Segments kept from a stream that failed part-way, so they can still be continued with
+  const [partialSegments, setPartialSegments] = useState<any[] | null>(null);
+  const [streamError, setStreamError] = useState("");
   
   const isAdsStyle = ADS_STYLES.some(s => s.id === videoStyle);
   const availableStyles = isAdsStyle || ADS_STYLES.some(s => s.id === initialVideoStyle) ? ADS_STYLES : CONTENT_STYLES;
@@ -49,17 +52,42 @@ export default function CustomScriptEditor({
   const handleGenerate = async () => {
     if (!prompt.trim()) return;
     setGenerating(true);
+    setPartialSegments(null);
+    setStreamError("");
+    setScriptText("");
+    const received: any[] = [];
+    let finished = false;
+    let failure = "";
     try {
-      const { data } = await scriptApi.generate(projectId, prompt, duration, language, numSegments, videoStyle);
-      setScriptText(data.script);
-      onScriptGenerated(data.script, data.segments || []);
+      await scriptApi.generateStream(projectId, prompt, duration, language, numSegments, videoStyle, (event) => {
+        if (event.event === "segment") {
+          received.push(event.segment);
+          setScriptText(received.map(s => s.display_text).join("\n"));
+        } else if (event.event === "done") {
+          finished = true;
+          setScriptText(event.script);
+          onScriptGenerated(event.script, event.segments || []);
+        } else if (event.event === "error") {
+          failure = event.error || "Script generation failed";
+        }
+      });
+      if (!finished && !failure) failure = "Script stream ended early";
     } catch (err) {
       console.error("Script generation failed:", err);
+      failure = err instanceof Error ? err.message : "Script generation failed";
+    }
+    if (!finished && failure) {
+      setStreamError(received.length ? `${failure} — kept the first ${received.length} segments` : failure);
+      if (received.length) setPartialSegments(received);
     }
     setGenerating(false);
   };
 
   const handleContinue = () => {
+    if (partialSegments && scriptText === partialSegments.map(s => s.display_text).join("\n")) {
+      onScriptGenerated(scriptText, partialSegments);
+      return;
+    }
     if (scriptText.trim()) {
       // Split by speaker lines (Name: text) to preserve dialogue integrity
       const lines = scriptText.split(/\n/).filter(s => s.trim());
@@ -217,14 +245,17 @@ export default function CustomScriptEditor({
               <textarea
                 value={scriptText}
                 onChange={(e) => setScriptText(e.target.value)}
+                readOnly={generating}
                 className="w-full p-3 border border-slate-200 rounded-lg text-xs resize-none focus:border-purple-400 focus:outline-none bg-slate-50"
                 rows={6}
               />
+              {streamError && <p className="text-[10px] text-amber-600 mt-1">{streamError}</p>}
             </div>
 
             <button
               onClick={handleContinue}
-              className="w-full py-2.5 bg-slate-900 text-white rounded-lg font-medium hover:bg-slate-800 flex items-center justify-center gap-2"
+              disabled={generating}
+              className="w-full py-2.5 bg-slate-900 text-white rounded-lg font-medium hover:bg-slate-800 disabled:opacity-50 flex items-center justify-center gap-2"
             >
               Continue to Segments →
             </button>
@@ -405,7 +405,7 @@ export default function FinalVideoSection({
                   onClick={() => setSelectedMediaId(m.id)}
                   className="aspect-video rounded overflow-hidden border-2 border-transparent hover:border-purple-500 transition-all"
                 >
-                  <img src={mediaApi.getUrl(m.id)} alt="" className="w-full h-full object-cover" />
+                  <img src={mediaApi.getUrl(m.id, "thumb")} alt="" className="w-full h-full object-cover" />
                 </button>
               ))}
             </div>
@@ -414,7 +414,7 @@ export default function FinalVideoSection({
           {selectedMediaId && (
             <div className="p-3 bg-gradient-to-br from-purple-50 to-blue-50 rounded-lg border border-purple-200 space-y-3">
               <div className="flex items-center gap-2">
-                <img src={mediaApi.getUrl(selectedMediaId)} alt="" className="w-20 h-12 object-cover rounded" />
+                <img src={mediaApi.getUrl(selectedMediaId, "thumb")} alt="" className="w-20 h-12 object-cover rounded" />
                 <div className="flex-1">
                   <p className="text-xs font-medium text-slate-700">Add Title (Optional)</p>
                   <p className="text-[10px] text-slate-500">Customize text overlay on thumbnail</p>
@@ -100,7 +100,7 @@ export default function WikipediaStep({
                   <span className="text-white text-[8px] font-medium">VIDEO</span>
                 </div>
               ) : (
-                <img key={asset.id} src={media.getUrl(asset.id)} alt=""
+                <img key={asset.id} src={media.getUrl(asset.id, "thumb")} alt=""
                   className="w-14 h-14 rounded object-cover shrink-0 border border-slate-200" />
               )
             ))}
@@ -26,12 +26,13 @@ export default function MediaGrid({ mediaAssets, regeneratingId, onMove, onFulls
             </div>
           )}
           {asset.type === "image" ? (
-            <img src={`${media.getUrl(asset.id)}?t=${Date.now()}`} alt="" className="w-full h-full object-cover" />
+            <img src={media.getUrl(asset.id, "medium", asset.version)} alt="" className="w-full h-full object-cover" />
           ) : (
             <video 
               src={media.getUrl(asset.id)} 
+              poster={media.getUrl(asset.id, "medium")}
               className="w-full h-full object-cover"
-              preload="metadata"
+              preload="none"
               muted
               playsInline
               onMouseEnter={(e) => e.currentTarget.play()}
@@ -43,7 +44,7 @@ export default function MediaGrid({ mediaAssets, regeneratingId, onMove, onFulls
               <button onClick={() => onMove(i, "left")} disabled={i === 0} className="p-1.5 bg-white/90 rounded-full text-slate-700 hover:bg-white disabled:opacity-30" title="Move left">
                 <svg className="w-3 h-3" fill="none" stroke="currentColor" viewBox="0 0 24 24"><path strokeLinecap="round" strokeLinejoin="round" strokeWidth={2} d="M15 19l-7-7 7-7" /></svg>
               </button>
-              <button onClick={() => onFullscreen(media.getUrl(asset.id), asset.type)} className="p-1.5 bg-white/90 rounded-full text-slate-700 hover:bg-white" title="View fullscreen">
+              <button onClick={() => onFullscreen(media.getUrl(asset.id, undefined, asset.version), asset.type)} className="p-1.5 bg-white/90 rounded-full text-slate-700 hover:bg-white" title="View fullscreen">
                 <Maximize2 className="w-3 h-3" />
               </button>
               {asset.source === "ai_generated" && asset.prompt && (
@@ -111,7 +111,7 @@ export default function MediaManager({ projectId, mediaAssets, onMediaChange, sc
     setRegeneratingId(asset.id);
     try {
       const { data } = await media.regenerateImage(asset.id, { model: selectedModel, imageStyle, aspectRatio });
-      onMediaChange(mediaAssets.map(m => m.id === asset.id ? { ...m, ...data } : m));
+      onMediaChange(mediaAssets.map(m => m.id === asset.id ? { ...m, ...data, version: Date.now() } : m));
     } catch {}
     setRegeneratingId(null);
   };
@@ -156,6 +156,41 @@ export default function MediaManager({ projectId, mediaAssets, onMediaChange, sc
     setGeneratingPrompts(false);
   };
 
+  // Appends a generated image, timed to the first segment that has no media yet
+  const addGeneratedAsset = (asset: any) => {
+    const currentAssets = mediaAssetsRef.current;
+    const assignedSet = new Set(currentAssets.flatMap(m => m.assignedSegments || []));
+    let segIdx = 0;
+    for (let i = 0; i < (segments?.length || 0); i++) { if (!assignedSet.has(i)) { segIdx = i; break; } }
+    const seg = segments?.[segIdx];
+    const startTime = seg?.start || 0, endTime = seg?.end || startTime + 5;
+    // Updated eagerly so images streaming in before the next render get distinct segments
+    mediaAssetsRef.current = [...currentAssets, { ...asset, startTime, endTime, duration: endTime - startTime, assignedSegments: [segIdx] }];
+    onMediaChange(mediaAssetsRef.current);
+  };
+
+  const handleGenerateAllImages = async () => {
+    const indices = generatedPrompts.map((p, i) => (!p.generated && !p.generating ? i : -1)).filter(i => i >= 0);
+    if (indices.length === 0) return;
+    const prompts = indices.map(i => generatedPrompts[i].text);
+    const settle = (batchIndex: number, generated: boolean) =>
+      setGeneratedPrompts(prev => prev.map((p, i) => i === indices[batchIndex] ? { ...p, generating: false, queued: false, generated: p.generated || generated } : p));
+    setGeneratedPrompts(prev => prev.map((p, i) => indices.includes(i) ? { ...p, generating: true, queued: false } : p));
+    try {
+      await media.generateBatchStream(projectId, segments || [], prompts, { model: selectedModel, language, imageStyle, aspectRatio, promptLanguage }, (event) => {
+        if (event.event === "image") {
+          addGeneratedAsset({ ...event.image, prompt: prompts[event.index] });
+          settle(event.index, true);
+        } else if (event.event === "failed") {
+          settle(event.index, false);
+        }
+      });
+    } catch (err) {
+      console.error("Batch image generation failed:", err);
+    }
+    setGeneratedPrompts(prev => prev.map((p, i) => indices.includes(i) && p.generating ? { ...p, generating: false } : p));
+  };
+
   const handleGenerateSingleImage = async (index: number) => {
     const promptData = generatedPrompts[index];
     if (!promptData || promptData.generating) return;
@@ -169,14 +204,7 @@ export default function MediaManager({ projectId, mediaAssets, onMediaChange, sc
         enhancedPrompt = `[STYLE MATCH REQUIRED - use exact same visual style, characters, colors as: ${contextSamples}]\n\n${promptData.text}`;
       }
       const { data } = await media.generateImage(projectId, enhancedPrompt, { model: selectedModel, imageStyle, aspectRatio });
-      const currentAssets = mediaAssetsRef.current;
-      const assignedSet = new Set(currentAssets.flatMap(m => m.assignedSegments || []));
-      let segIdx = 0;
-      for (let i = 0; i < (segments?.length || 0); i++) { if (!assignedSet.has(i)) { segIdx = i; break; } }
-      const seg = segments?.[segIdx];
-      const startTime = seg?.start || 0, endTime = seg?.end || startTime + 5;
-      const newAsset = { ...data, type: "image", source: "ai_generated", order: currentAssets.length, startTime, endTime, duration: endTime - startTime, assignedSegments: [segIdx], prompt: promptData.text };
-      onMediaChange([...currentAssets, newAsset]);
+      addGeneratedAsset({ ...data, type: "image", source: "ai_generated", order: mediaAssetsRef.current.length, prompt: promptData.text });
       setGeneratedPrompts(prev => prev.map((p, i) => i === index ? { ...p, generating: false, generated: true, queued: false } : p));
     } catch {
       setGeneratedPrompts(prev => prev.map((p, i) => i === index ? { ...p, generating: false, queued: false } : p));
@@ -193,7 +221,7 @@ export default function MediaManager({ projectId, mediaAssets, onMediaChange, sc
     setGeneratedPrompts(prev => prev.map((p, i) => i === index ? { ...p, generating: true } : p));
     try {
       const { data } = await media.regenerateImage(asset.id, { prompt: promptData.text, model: selectedModel, imageStyle, aspectRatio });
-      onMediaChange(mediaAssets.map(m => m.id === asset.id ? { ...m, ...data } : m));
+      onMediaChange(mediaAssets.map(m => m.id === asset.id ? { ...m, ...data, version: Date.now() } : m));
       setGeneratedPrompts(prev => prev.map((p, i) => i === index ? { ...p, generating: false } : p));
     } catch {
       setGeneratedPrompts(prev => prev.map((p, i) => i === index ? { ...p, generating: false } : p));
@@ -292,13 +320,7 @@ export default function MediaManager({ projectId, mediaAssets, onMediaChange, sc
           onRegenerateSingleImage={handleRegenerateSingleImage}
           onUpdatePrompt={(i, text) => setGeneratedPrompts(prev => prev.map((p, idx) => idx === i ? { ...p, text } : p))}
           onClearPrompts={() => setGeneratedPrompts([])}
-          onGenerateAllImages={async () => {
-            const pending = generatedPrompts.map((p, i) => ({ ...p, queued: !p.generated && !p.generating }));
-            setGeneratedPrompts(pending);
-            for (let i = 0; i < pending.length; i++) {
-              if (pending[i].queued) await handleGenerateSingleImage(i);
-            }
-          }}
+          onGenerateAllImages={handleGenerateAllImages}
           hasScript={!!(script || (segments && segments.length > 0))}
         />
       )}
@@ -7,6 +7,38 @@ const api = axios.create({
 
 interface ClipData { start: number; end: number; }
 
+export interface StreamEvent { event: string; [key: string]: any; }
+
+// POST a JSON body and call onEvent for every server-sent event in the response.
+// axios can't read a response body incrementally in the browser, so this uses fetch.
+export const postEventStream = async (path: string, body: unknown, onEvent: (event: StreamEvent) => void, signal?: AbortSignal) => {
+  const response = await fetch(`${api.defaults.baseURL}${path}`, {
+    method: "POST",
+    headers: { "Content-Type": "application/json", Accept: "text/event-stream" },
+    body: JSON.stringify(body),
+    signal
+  });
+  if (!response.ok || !response.body) throw new Error(`Stream request failed with status ${response.status}`);
+
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = "";
+  while (true) {
+    const { value, done } = await reader.read();
+    if (done) break;
+    buffer += decoder.decode(value, { stream: true });
+    let end: number;
+    while ((end = buffer.indexOf("\n\n")) >= 0) {
+      const data = buffer.slice(0, end).split("\n")
+        .filter(line => line.startsWith("data:"))
+        .map(line => line.slice(5).trimStart())
+        .join("\n");
+      buffer = buffer.slice(end + 2);
+      if (data) onEvent(JSON.parse(data));
+    }
+  }
+};
+
 export const youtube = {
   extract: (url: string) => api.post("/youtube/extract", { url }),
   getAuthUrl: () => api.get("/youtube/auth-url"),
@@ -28,8 +60,8 @@ export const ai = {
   ask: (projectId: string, question: string) => api.post("/ai/ask", { project_id: projectId, question }),
   script: (projectId: string, duration: number, language: string = "English") => 
     api.post("/ai/script", { project_id: projectId, duration_seconds: duration, language }),
-  generateYoutubeInfo: (projectId: string, script: string, language: string = "English") => 
-    api.post("/ai/youtube-info", { project_id: projectId, script, language }),
+  generateYoutubeInfo: (projectId: string, script: string, language: string = "English", regenerate: boolean = false) => 
+    api.post("/ai/youtube-info", { project_id: projectId, script, language, regenerate }),
   suggestProject: (videoStyle: string, language: string, duration: number, topic: string = "") =>
     api.post("/ai/suggest-project", { video_style: videoStyle, language, duration, topic })
 };
@@ -85,10 +117,25 @@ export const media = {
       aspect_ratio: options.aspectRatio || "16:9",
       prompt_language: options.promptLanguage || "en"
     }),
+  generateBatchStream: (projectId: string, segments: any[], prompts: string[], options: { model?: string; language?: string; imageStyle?: string; aspectRatio?: string; promptLanguage?: string }, onEvent: (event: StreamEvent) => void) =>
+    postEventStream("/media/generate-batch-stream", {
+      project_id: projectId, segments, prompts,
+      model: options.model || "gemini-2.5-flash",
+      language: options.language || "English",
+      image_style: options.imageStyle || "cartoon",
+      aspect_ratio: options.aspectRatio || "16:9",
+      prompt_language: options.promptLanguage || "en"
+    }, onEvent),
   imageToVideo: (projectId: string, mediaId: string, duration: number = 5, effect: string = "zoom_in") =>
     api.post("/media/image-to-video", { project_id: projectId, media_id: mediaId, duration, effect }),
   list: (projectId: string) => api.get(`/media/${projectId}`),
-  getUrl: (mediaId: string) => `${api.defaults.baseURL}/media/file/${mediaId}`,
+  getUrl: (mediaId: string, size?: "thumb" | "medium", version?: number) => {
+    const params = new URLSearchParams();
+    if (size) params.set("size", size);
+    if (version) params.set("v", String(version));
+    const query = params.toString();
+    return `${api.defaults.baseURL}/media/file/${mediaId}${query ? `?${query}` : ""}`;
+  },
   delete: (mediaId: string) => api.delete(`/media/${mediaId}`),
   updateOrder: (projectId: string, mediaOrder: string[]) => 
     api.post("/media/update-order", { project_id: projectId, media_order: mediaOrder }),
@@ -124,8 +171,8 @@ export const video = {
   previewClip: (projectId: string, index: number, t?: number) => `${api.defaults.baseURL}/video/preview-clip/${projectId}/${index}?t=${t || Date.now()}`,
   mergeWithOptions: (projectId: string, segments: any[], options: { subtitles: boolean; animatedSubtitles: boolean; subtitleStyle: string; resize: string; bgMusic: string; bgMusicVolume: number }) =>
     api.post("/video/merge", { project_id: projectId, segments, subtitles: options.subtitles, animated_subtitles: options.animatedSubtitles, subtitle_style: options.subtitleStyle, resize: options.resize, bg_music: options.bgMusic, bg_music_volume: options.bgMusicVolume }),
-  generateThumbnailPrompt: (projectId: string, script: string, language: string = "English", imageStyle: string = "cartoon", videoType: string = "tutorial") => 
-    api.post("/video/thumbnail-prompt", { project_id: projectId, script, language, image_style: imageStyle, video_type: videoType }),
+  generateThumbnailPrompt: (projectId: string, script: string, language: string = "English", imageStyle: string = "cartoon", videoType: string = "tutorial", regenerate: boolean = false) => 
+    api.post("/video/thumbnail-prompt", { project_id: projectId, script, language, image_style: imageStyle, video_type: videoType, regenerate }),
   generateThumbnailFromPrompt: (projectId: string, prompt: string, model: string = "gemini-3-pro", imageStyle: string = "cartoon", videoType: string = "tutorial", title: string = "", titlePosition: string = "") => 
     api.post("/video/thumbnail-from-prompt", { project_id: projectId, prompt, model, image_style: imageStyle, video_type: videoType, title, title_position: titlePosition }),
   uploadThumbnail: (projectId: string, file: File) => {
@@ -178,7 +225,7 @@ export const video = {
 };
 
 export const projects = {
-  list: () => api.get("/projects"),
+  list: (cursor?: string) => api.get("/projects", { params: cursor ? { cursor } : {} }),
   get: (id: string) => api.get(`/projects/${id}`),
   delete: (id: string) => api.delete(`/projects/${id}`),
   update: (id: string, data: { language?: string; video_style?: string }) => api.patch(`/projects/${id}`, data),
@@ -209,6 +256,8 @@ export const wikipedia = {
 export const script = {
   generate: (projectId: string, prompt: string, duration: number, language: string, numSegments: number, videoStyle: string) =>
     api.post("/script/generate", { project_id: projectId, prompt, duration_seconds: duration, language, num_segments: numSegments, video_style: videoStyle }),
+  generateStream: (projectId: string, prompt: string, duration: number, language: string, numSegments: number, videoStyle: string, onEvent: (event: StreamEvent) => void) =>
+    postEventStream("/script/generate-stream", { project_id: projectId, prompt, duration_seconds: duration, language, num_segments: numSegments, video_style: videoStyle }, onEvent),
   generateWiki: (projectId: string, duration: number, language: string) =>
     api.post("/script/generate-wiki", { project_id: projectId, duration_seconds: duration, language }),
   reassignMedia: (projectId: string) =>
@@ -22,12 +22,13 @@ export function useThumbnail({ projectId, projectScript, projectTitle, setProces
     if (!projectId) return;
     setProcessing("Generating thumbnail prompt...");
     try {
-      const { data } = await video.generateThumbnailPrompt(projectId, projectScript || "", language, imageStyle, videoType);
+      // A prompt is already shown, so the user is asking for a different one
+      const { data } = await video.generateThumbnailPrompt(projectId, projectScript || "", language, imageStyle, videoType, !!thumbnailPrompt);
       setThumbnailPrompt(data.prompt || "");
       setThumbnailTitle(data.title || "");
     } catch {}
     setProcessing("");
-  }, [projectId, projectScript, setProcessing]);
+  }, [projectId, projectScript, thumbnailPrompt, setProcessing]);
 
   const handleGenerateThumbnailFromPrompt = useCallback(async (prompt: string, model: string, imageStyle: string = "cartoon", videoType: string = "tutorial", title: string = "", titlePosition: string = "") => {
     if (!projectId) return;
@@ -63,13 +64,13 @@ export function useThumbnail({ projectId, projectScript, projectTitle, setProces
     if (!projectId) return;
     setProcessing(`Generating YouTube info in ${language}...`);
     try {
-      const { data } = await ai.generateYoutubeInfo(projectId, projectScript || "", language);
+      const { data } = await ai.generateYoutubeInfo(projectId, projectScript || "", language, !!youtubeInfo.description);
       setYoutubeInfo({ title: data.title || projectTitle || "", description: data.description || "", tags: data.tags || "" });
     } catch {
       setYoutubeInfo({ title: projectTitle || "", description: (projectScript || "").slice(0, 200) + "...", tags: "shorts,viral,trending" });
     }
     setProcessing("");
-  }, [projectId, projectScript, projectTitle, setProcessing]);
+  }, [projectId, projectScript, projectTitle, youtubeInfo.description, setProcessing]);
 
   return {
     youtubeInfo, setYoutubeInfo, thumbnailPrompt, setThumbnailPrompt,
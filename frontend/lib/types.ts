@@ -42,6 +42,7 @@ export interface MediaAsset {
   startTime: number;
   endTime: number;
   assignedSegments: number[];
+  version?: number;
 }
 
 export interface WatermarkConfig {